@@ -0,0 +1,70 @@
+"""
+Per-article CPU time of NewsAnalyzer.analyze_article.
+
+Runs the bundled sample articles and a synthetic long article, and
+compares the cost of building one shared AnalysisDocument with the four
+separate tokenization passes the stages used to make.
+
+    python -m benchmarks.analyzer_cpu --words 10000 --repeat 3
+"""
+import argparse
+import time
+from typing import Callable, Dict, Any, List
+from nltk.tokenize import word_tokenize, sent_tokenize
+from services.analyzer import NewsAnalyzer
+from services.scraper import NewsScraper
+
+def long_article(sample_articles: List[Dict[str, Any]], words: int) -> Dict[str, Any]:
+    """Repeat the sample articles until the text has at least `words` words."""
+    paragraphs = [article['content'] for article in sample_articles]
+    text = []
+    count = 0
+    while count < words:
+        paragraph = paragraphs[len(text) % len(paragraphs)]
+        text.append(paragraph)
+        count += len(paragraph.split())
+    return {'title': f'Long article ({count} words)', 'content': '\n\n'.join(text), 'url': ''}
+
+def cpu_time(func: Callable[[], Any], repeat: int) -> float:
+    """Best-of-`repeat` process CPU time of func in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        best = min(best, time.process_time() - start)
+    return best
+
+def repeated_tokenization(analyzer: NewsAnalyzer, text: str) -> None:
+    """The tokenization work analyze_article did before AnalysisDocument."""
+    word_tokenize(text.lower())
+    for sentence in sent_tokenize(text):
+        word_tokenize(sentence)
+    for sentence in sent_tokenize(text):
+        analyzer.tagger.tag(word_tokenize(sentence))
+    word_tokenize(text.lower())
+
+def shared_tokenization(analyzer: NewsAnalyzer, text: str) -> None:
+    doc = analyzer.document(text)
+    doc.content_words
+    doc.tagged_sentences
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--words', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = NewsAnalyzer()
+    analyzer.warm_up()
+    articles = NewsScraper().sample_articles
+    articles = articles + [long_article(articles, args.words)]
+
+    print(f"{'article':<40} {'analyze':>10} {'4x tokenize':>12} {'document':>10}")
+    for article in articles:
+        analyze = cpu_time(lambda: analyzer.analyze_article(article), args.repeat)
+        legacy = cpu_time(lambda: repeated_tokenization(analyzer, article['content']), args.repeat)
+        shared = cpu_time(lambda: shared_tokenization(analyzer, article['content']), args.repeat)
+        print(f"{article['title'][:40]:<40} {analyze * 1000:8.1f}ms {legacy * 1000:10.1f}ms {shared * 1000:8.1f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Batch analysis scaling across process-pool sizes.
+
+Analyzes a batch of articles with NewsAnalyzer.analyze_many through
+AnalysisPools of increasing size and prints throughput and speedup over a
+single worker. Pool start-up and worker warm-up are excluded.
+
+    python -m benchmarks.batch_scaling --articles 300 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+from services.analyzer import NewsAnalyzer
+from services.batch import AnalysisPool
+from services.scraper import NewsScraper
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=300)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    samples = NewsScraper().sample_articles
+    articles = [samples[i % len(samples)] for i in range(args.articles)]
+    analyzer = NewsAnalyzer()
+
+    baseline = None
+    for workers in args.workers:
+        with AnalysisPool(workers) as pool:
+            # Spawn and warm every worker before timing
+            list(analyzer.analyze_many(samples * workers, pool))
+            start = time.perf_counter()
+            results = list(analyzer.analyze_many(articles, pool))
+            elapsed = time.perf_counter() - start
+        rate = len(results) / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>3} workers  {elapsed:7.2f}s  {rate:7.1f} articles/s  speedup {rate / baseline:4.2f}x")
+
+if __name__ == '__main__':
+    main()
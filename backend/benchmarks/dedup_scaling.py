@@ -0,0 +1,71 @@
+"""
+Near-duplicate detection cost as the indexed corpus grows.
+
+Indexes a synthetic corpus of random articles into a NearDuplicateIndex and,
+at each checkpoint size, measures the time to check a probe set of fresh
+articles, of lightly edited copies of indexed ones (which should all be
+detected, i.e. their analyses skipped) and of indexed articles re-scraped
+with new content (which leave their cluster and are matched again).
+
+    python -m benchmarks.dedup_scaling --sizes 1000 10000 100000 --probes 200
+"""
+import argparse
+import random
+import time
+from services.dedup import NearDuplicateIndex
+
+def make_article(generator: random.Random, vocabulary, words: int) -> str:
+    return ' '.join(generator.choice(vocabulary) for _ in range(words))
+
+def edit(generator: random.Random, text: str, changes: int) -> str:
+    """Swap a few words, as outlets do when rewriting a wire story."""
+    words = text.split()
+    for _ in range(changes):
+        words[generator.randrange(len(words))] = 'edited'
+    return ' '.join(words)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--probes', type=int, default=200)
+    parser.add_argument('--words', type=int, default=400)
+    args = parser.parse_args()
+
+    generator = random.Random(7)
+    vocabulary = [f"w{i}" for i in range(20000)]
+    index = NearDuplicateIndex()
+    corpus = []
+
+    print(f"{'corpus':>8} {'index time':>11} {'new ms/art':>11} {'dup ms/art':>11} {'dups found':>11} "
+          f"{'changed ms/art':>15}")
+    for size in sorted(args.sizes):
+        start = time.perf_counter()
+        while len(corpus) < size:
+            text = make_article(generator, vocabulary, args.words)
+            index.add(f"doc{len(corpus)}", text)
+            corpus.append(text)
+        index_time = time.perf_counter() - start
+
+        fresh = [make_article(generator, vocabulary, args.words) for _ in range(args.probes)]
+        start = time.perf_counter()
+        for i, text in enumerate(fresh):
+            index.add(f"fresh{size}-{i}", text)
+        fresh_ms = (time.perf_counter() - start) * 1000 / args.probes
+
+        copies = [edit(generator, generator.choice(corpus), 3) for _ in range(args.probes)]
+        start = time.perf_counter()
+        found = sum(index.add(f"copy{size}-{i}", text) is not None for i, text in enumerate(copies))
+        dup_ms = (time.perf_counter() - start) * 1000 / args.probes
+
+        changed = [(f"doc{generator.randrange(size)}", make_article(generator, vocabulary, args.words))
+                   for _ in range(args.probes)]
+        start = time.perf_counter()
+        for doc_id, text in changed:
+            index.add(doc_id, text)
+        changed_ms = (time.perf_counter() - start) * 1000 / args.probes
+
+        print(f"{size:>8} {index_time:>10.1f}s {fresh_ms:>11.3f} {dup_ms:>11.3f} {found:>5}/{args.probes} "
+              f"{changed_ms:>15.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Entity extraction time and agreement of the 'accurate' and 'fast' modes.
+
+Times NewsAnalyzer._extract_entities in both modes on the sample articles
+and a synthetic long article, and reports how far the gazetteer matches
+agree with the NLTK chunker (precision/recall of fast against accurate).
+Requires the NLTK data.
+
+    python -m benchmarks.entity_modes --words 10000 --repeat 3
+"""
+import argparse
+from typing import Dict, List, Set, Tuple
+from benchmarks.analyzer_cpu import cpu_time, long_article
+from services.analyzer import NewsAnalyzer
+from services.scraper import NewsScraper
+
+def flatten(entities: Dict[str, List[str]]) -> Set[Tuple[str, str]]:
+    return {(category, name) for category, names in entities.items() for name in names}
+
+def agreement(accurate: Set[Tuple[str, str]], fast: Set[Tuple[str, str]]) -> Tuple[float, float]:
+    """Precision and recall of the fast entities, taking accurate as reference."""
+    common = len(accurate & fast)
+    precision = common / len(fast) if fast else 1.0
+    recall = common / len(accurate) if accurate else 1.0
+    return precision, recall
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--words', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = NewsAnalyzer()
+    analyzer.warm_up()
+    articles = NewsScraper().sample_articles
+    articles = articles + [long_article(articles, args.words)]
+
+    print(f"{'article':<40} {'accurate':>10} {'fast':>10} {'speedup':>8} {'precision':>10} {'recall':>7}")
+    for article in articles:
+        doc = analyzer.document(article['content'])
+        doc.tagged_sentences  # Tokenize and tag up front; only extraction is timed
+        accurate = cpu_time(lambda: analyzer._extract_entities(doc, 'accurate'), args.repeat)
+        fast = cpu_time(lambda: analyzer._extract_entities(doc, 'fast'), args.repeat)
+        precision, recall = agreement(flatten(analyzer._extract_entities(doc, 'accurate')),
+                                      flatten(analyzer._extract_entities(doc, 'fast')))
+        print(f"{article['title'][:40]:<40} {accurate * 1000:8.1f}ms {fast * 1000:8.2f}ms "
+              f"{accurate / max(fast, 1e-9):7.0f}x {precision:10.2f} {recall:7.2f}")
+
+if __name__ == '__main__':
+    main()
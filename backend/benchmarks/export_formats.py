@@ -0,0 +1,93 @@
+"""
+Size and speed of bulk article exports: JSON vs Parquet vs Arrow.
+
+Fills an in-memory ArticleStore with synthetic analyzed articles, then
+for each format times the export, reports the file size, and times a
+full read back: json.load for JSON, and for the columnar files a
+memory-mapped scan of the sentiment column and a batch-by-batch
+conversion to article dicts. Peak Python heap during the read is
+measured with tracemalloc in a separate run. Requires pyarrow.
+
+    python -m benchmarks.export_formats --articles 100000 --batch-size 10000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+from services.export import export_store, iter_articles, iter_batches
+from services.store import ArticleStore
+
+WORDS = ('market government minister election court police team match rupee bank policy growth '
+         'farmers monsoon budget cricket company shares state report').split()
+PEOPLE = ['Narendra Modi', 'Virat Kohli', 'Nirmala Sitharaman', 'Rahul Gandhi', 'Mamata Banerjee']
+PLACES = ['Delhi', 'Mumbai', 'Kolkata', 'Chennai', 'Bengaluru', 'India']
+
+def fill_store(count: int, content_words: int, seed: int = 0) -> ArticleStore:
+    rng = random.Random(seed)
+    store = ArticleStore()
+    for i in range(count):
+        content = ' '.join(rng.choice(WORDS) for _ in range(content_words)) + '.'
+        article = {'url': f'https://example.com/news/{i}', 'title': f'Story {i}', 'content': content}
+        analysis = {'title': article['title'], 'topic': rng.choice(['business', 'politics', 'sports', 'general']),
+                    'summary': content[:300], 'sentiment': round(rng.uniform(-1, 1), 4),
+                    'entities': {'people': rng.sample(PEOPLE, 2), 'locations': rng.sample(PLACES, 2)}}
+        store.upsert(f'source{i % 6}', article, analysis)
+    return store
+
+def measure(func: Callable[[], object]) -> Tuple[float, int]:
+    """Wall time and peak traced Python allocation of func, from separate runs since tracing slows it down."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--content-words', type=int, default=300)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--content', action='store_true', help='include the article text column')
+    args = parser.parse_args()
+
+    store = fill_store(args.articles, args.content_words)
+    directory = tempfile.mkdtemp()
+    print(f"{args.articles} articles, content {'included' if args.content else 'excluded'}")
+    print(f"{'format':>8} {'write':>9} {'size':>10} {'scan':>9} {'to dicts':>9} {'peak heap':>10}")
+
+    path = os.path.join(directory, 'articles.json')
+    start = time.perf_counter()
+    with open(path, 'w') as f:
+        json.dump([row for rows in store.iter_rows(args.batch_size, content=args.content) for row in rows], f)
+    write = time.perf_counter() - start
+
+    def load_json():
+        with open(path) as f:
+            return json.load(f)
+    read, peak = measure(load_json)
+    print(f"{'json':>8} {write:8.2f}s {os.path.getsize(path) / 1e6:8.1f}MB {'-':>9} {read:8.2f}s "
+          f"{peak / 1e6:8.1f}MB")
+
+    for format in ('parquet', 'arrow'):
+        path = os.path.join(directory, f'articles.{format}')
+        start = time.perf_counter()
+        export_store(store, path, format, args.batch_size, args.content)
+        write = time.perf_counter() - start
+        start = time.perf_counter()
+        for batch in iter_batches(path, columns=['sentiment']):
+            batch.column(0).to_numpy().mean()
+        scan = time.perf_counter() - start
+        # Only one batch of dicts is alive at a time, as in a bulk re-analysis
+        read, peak = measure(lambda: sum(len(rows) for rows in iter_articles(path, args.batch_size)))
+        print(f"{format:>8} {write:8.2f}s {os.path.getsize(path) / 1e6:8.1f}MB {scan:8.3f}s {read:8.2f}s "
+              f"{peak / 1e6:8.1f}MB")
+
+if __name__ == '__main__':
+    main()
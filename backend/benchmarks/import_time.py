@@ -0,0 +1,70 @@
+"""
+Cold-start cost of the API process.
+
+Imports `main` in a fresh interpreter with `-X importtime`, reports the
+total and the slowest modules by cumulative import time, then (with
+--boot) times ServiceContainer.warm_up() in another fresh interpreter for
+each ANALYZER_WARMUP mode.
+
+    python -m benchmarks.import_time --top 15 --boot
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+_BOOT = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "from services.container import ServiceContainer\n"
+    "container = ServiceContainer(store_factory=lambda: None)\n"
+    "container.warm_up()\n"
+    "print(time.perf_counter() - start, container.ready, container.error)\n"
+)
+
+def _run(code: str, env: Dict[str, str] = None, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    return subprocess.run(command, capture_output=True, text=True, check=True,
+                          cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          env={**os.environ, **(env or {})})
+
+def import_times(module: str = 'main') -> List[Tuple[str, float, float]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        List[Tuple[str, float, float]]: (module, self seconds, cumulative seconds) per imported module
+    """
+    stderr = _run(f"import {module}", importtime=True).stderr
+    times = []
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|', 2)
+        times.append((name.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+    return times
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='main')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--boot', action='store_true', help='also time container warm-up per ANALYZER_WARMUP mode')
+    args = parser.parse_args()
+
+    times = import_times(args.module)
+    total = next(cumulative for name, _, cumulative in times if name == args.module)
+    print(f"import {args.module}: {total * 1000:.0f}ms")
+    print(f"{'module':<40} {'self':>10} {'cumulative':>12}")
+    for name, own, cumulative in sorted(times, key=lambda t: -t[2])[:args.top]:
+        print(f"{name:<40} {own * 1000:8.1f}ms {cumulative * 1000:10.1f}ms")
+
+    if args.boot:
+        for mode in ('lazy', 'eager'):
+            seconds, ready, error = _run(_BOOT, env={'ANALYZER_WARMUP': mode}).stdout.splitlines()[-1].split(' ', 2)
+            status = 'ready' if ready == 'True' else f"not ready: {error.strip()}"
+            print(f"boot with ANALYZER_WARMUP={mode}: {float(seconds) * 1000:.0f}ms ({status})")
+
+if __name__ == '__main__':
+    main()
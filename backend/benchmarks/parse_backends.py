@@ -0,0 +1,94 @@
+"""
+Parse time and peak memory of each HTML parser backend.
+
+Parses every *.html file in a corpus directory with each backend from
+services.parsers and reports the median time per page and the peak RSS
+growth of a fresh process that parsed the whole corpus. Save real news
+pages (e.g. with `curl -o`) into the corpus directory; without any, a
+synthetic corpus of large stub article pages is used, with navigation
+filler split before and after the article body in a different proportion
+on each page (so partial parsers stop early on some pages and not others).
+
+    python -m benchmarks.parse_backends --corpus benchmarks/corpus --repeat 5
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import resource
+import statistics
+import time
+from typing import Dict, Any, List
+from benchmarks.stub_server import StubNewsServer
+from services.parsers import available_parsers, detect_encoding, get_parser
+
+CONFIG = {
+    'url': '',
+    'article_selector': 'article, .article',
+    'title_selector': 'h1',
+    'content_selector': '.article-body, .content, article'
+}
+
+def load_corpus(directory: str, synthetic_pages: int) -> List[bytes]:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    if pages:
+        return pages
+    stub = StubNewsServer(paragraphs=400)
+    items = [f'<li><a href="/nav/{i}">Section {i}</a><p>Teaser {i}</p></li>' for i in range(2000)]
+    pages = []
+    for page in range(synthetic_pages):
+        split = len(items) * page // max(1, synthetic_pages - 1)
+        body = stub.render(f'/alpha/article/{page}')['body']
+        body = body.replace('<body>', '<body><ul>' + ''.join(items[:split]) + '</ul>')
+        body = body.replace('<footer>', '<ul>' + ''.join(items[split:]) + '</ul><footer>')
+        pages.append(body.encode('utf-8'))
+    return pages
+
+def measure(name: str, pages: List[bytes], repeat: int, results: Dict[str, Any]) -> None:
+    """Runs in a fresh process so ru_maxrss reflects this backend only."""
+    parser = get_parser(name)
+    encodings = [detect_encoding(page) for page in pages]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for page, encoding in zip(pages, encodings):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parser.article(page, encoding, CONFIG)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best)
+    results[name] = {
+        'median_ms': statistics.median(timings) * 1000,
+        'total_ms': sum(timings) * 1000,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=os.path.join(os.path.dirname(__file__), 'corpus'))
+    parser.add_argument('--synthetic-pages', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--backends', nargs='+', default=available_parsers())
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.synthetic_pages)
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / 1024:.0f} KB")
+    context = multiprocessing.get_context('spawn')
+    with context.Manager() as manager:
+        results = manager.dict()
+        for name in args.backends:
+            process = context.Process(target=measure, args=(name, pages, args.repeat, results))
+            process.start()
+            process.join()
+        baseline = results.get('html.parser')
+        for name in args.backends:
+            result = results[name]
+            speedup = baseline['median_ms'] / result['median_ms'] if baseline else 0.0
+            print(f"{name:<20} median {result['median_ms']:8.2f}ms  total {result['total_ms']:9.1f}ms  "
+                  f"peak RSS +{result['peak_rss_kb'] / 1024:6.1f}MB  speedup {speedup:5.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Offline scraping throughput benchmark.
+
+Scrapes a local StubNewsServer with the sequential scrape_source loop and
+with the asynchronous engine, and prints articles/sec plus fetch latency
+percentiles for each.
+
+    python -m benchmarks.scrape_throughput --sources 6 --articles 10 --latency 0.05
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, Any, List
+from benchmarks.stub_server import StubNewsServer
+from services.fetcher import AsyncFetcher
+from services.scraper import NewsScraper
+
+class TimedFetcher(AsyncFetcher):
+    """AsyncFetcher that records the duration of every fetch."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.durations: List[float] = []
+
+    async def fetch(self, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().fetch(url, **kwargs)
+        finally:
+            self.durations.append(time.perf_counter() - start)
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def run_sequential(scraper: NewsScraper) -> Dict[str, Any]:
+    durations = []
+    session_get = scraper.session.get
+
+    def timed_get(url, **kwargs):
+        fetch_start = time.perf_counter()
+        try:
+            return session_get(url, **kwargs)
+        finally:
+            durations.append(time.perf_counter() - fetch_start)
+
+    scraper.session.get = timed_get
+    articles = []
+    start = time.perf_counter()
+    try:
+        for source in scraper.news_sources:
+            articles.extend(scraper.scrape_source(source))
+    finally:
+        scraper.session.get = session_get
+    return {'elapsed': time.perf_counter() - start, 'articles': len(articles), 'durations': durations}
+
+def run_async(scraper: NewsScraper, per_host_limit: int) -> Dict[str, Any]:
+    async def main():
+        async with TimedFetcher(per_host_limit=per_host_limit, max_connections=100) as fetcher:
+            start = time.perf_counter()
+            articles = await scraper.scrape_sources_async(fetcher=fetcher)
+            return {'elapsed': time.perf_counter() - start, 'articles': len(articles),
+                    'durations': fetcher.durations}
+    return asyncio.run(main())
+
+def report(name: str, result: Dict[str, Any]) -> None:
+    rate = result['articles'] / result['elapsed'] if result['elapsed'] else 0.0
+    print(f"{name:<12} {result['articles']:>5} articles  {result['elapsed']:7.3f}s  "
+          f"{rate:8.1f} articles/s  p50 {percentile(result['durations'], 50) * 1000:7.1f}ms  "
+          f"p95 {percentile(result['durations'], 95) * 1000:7.1f}ms")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sources', type=int, default=3)
+    parser.add_argument('--articles', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--per-host-limit', type=int, default=8)
+    args = parser.parse_args()
+
+    sources = [f"source{i}" for i in range(args.sources)]
+    with StubNewsServer(sources, articles_per_source=args.articles, latency=args.latency) as server:
+        scraper = NewsScraper(max_articles_per_source=args.articles)
+        scraper.news_sources = server.news_sources()
+        report('sequential', run_sequential(scraper))
+        report('async', run_async(scraper, args.per_host_limit))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+VADER sentiment throughput: per-article polarity_scores vs BatchSentiment.
+
+Builds synthetic articles from random sentences of the bundled sample
+articles, then times the document compound scores with nltk's
+SentimentIntensityAnalyzer one article at a time and with BatchSentiment
+over the whole batch (cold, compiling the vocabulary, and warm), and the
+same for per-sentence scores. Reports the largest difference from the
+exact scores. Requires the VADER lexicon from the NLTK data.
+
+    python -m benchmarks.sentiment_batch --articles 10000 --sentences 30
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+import numpy as np
+from services.nltk_data import use_bundle
+from services.scraper import NewsScraper
+from services.sentiment import BatchSentiment
+
+def make_articles(count: int, sentences: int, seed: int = 0) -> List[List[str]]:
+    """`count` articles, each a list of `sentences` sentences drawn from the sample articles."""
+    rng = random.Random(seed)
+    pool = [sentence for article in NewsScraper().sample_articles
+            for sentence in re.split(r'(?<=[.!?])\s+', article['content']) if sentence]
+    return [[rng.choice(pool) for _ in range(sentences)] for _ in range(count)]
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=10000)
+    parser.add_argument('--sentences', type=int, default=30, help='sentences per article')
+    args = parser.parse_args()
+
+    use_bundle()
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    sia = SentimentIntensityAnalyzer()
+    sentences = make_articles(args.articles, args.sentences)
+    texts = [' '.join(article) for article in sentences]
+    flat = [sentence for article in sentences for sentence in article]
+    print(f"{args.articles} articles, {sum(len(text.split()) for text in texts)} words, {len(flat)} sentences")
+
+    exact, expected = timed(lambda: np.array([sia.polarity_scores(text)['compound'] for text in texts]))
+    scorer = BatchSentiment(sia.lexicon)
+    cold, scores = timed(lambda: scorer.compound(texts))
+    warm, _ = timed(lambda: scorer.compound(texts))
+    difference = np.abs(scores - expected)
+    print(f"{'documents':<10} exact {exact:7.2f}s  batch cold {cold:6.2f}s  warm {warm:6.2f}s  "
+          f"speedup {exact / warm:5.1f}x")
+    print(f"{'':<10} max |diff| {difference.max():.1e}  identical {np.mean(difference == 0):.2%}  "
+          f"vocabulary {len(scorer.tokens)} tokens")
+
+    exact, expected = timed(lambda: np.array([sia.polarity_scores(sentence)['compound'] for sentence in flat]))
+    batch, (_, per_sentence) = timed(lambda: scorer.score(texts, sentences))
+    difference = np.abs(np.concatenate(per_sentence) - expected)
+    print(f"{'sentences':<10} exact {exact:7.2f}s  batch (with documents) {batch:6.2f}s  "
+          f"speedup {exact / batch:5.1f}x  max |diff| {difference.max():.1e}")
+
+if __name__ == '__main__':
+    main()
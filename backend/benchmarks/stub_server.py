@@ -0,0 +1,142 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List
+
+FRONT_PAGE = """<html><head><title>{source}</title></head><body>
+<div class="main-content">{items}</div>
+</body></html>"""
+
+ARTICLE_ITEM = '<div class="article"><a href="/{source}/article/{index}">Story {index}</a></div>'
+
+ARTICLE_PAGE = """<html><head><title>{title}</title><script>var ads = [];</script></head><body>
+<nav><p>Home</p><p>Sports</p></nav>
+<h1>{title}</h1>
+<div class="article-body">{paragraphs}</div>
+<footer><p>Copyright</p></footer>
+</body></html>"""
+
+PARAGRAPH = ("<p>The government announced a new cricket tournament in Mumbai on Monday, "
+             "and market analysts expect strong investment in the sports economy. "
+             "Story {index} paragraph {paragraph}, revision {revision}.</p>")
+
+class StubNewsServer:
+    """
+    Local HTTP server serving canned news front pages and articles.
+
+    Each source lives under /<source>/ with a front page listing
+    articles_per_source links in the '.article' layout NewsScraper expects.
+    Every response is delayed by `latency` seconds so scraping throughput
+    and tail latency can be measured offline. With `validators` enabled,
+    responses carry ETag/Last-Modified headers and matching conditional
+    requests get a 304; bump `revision` to change every article body.
+    `peak_in_flight` records the most requests handled at the same time.
+    """
+
+    def __init__(self, sources: List[str] = None, articles_per_source: int = 5,
+                 paragraphs: int = 20, latency: float = 0.0, validators: bool = False):
+        self.sources = sources or ['alpha', 'beta', 'gamma']
+        self.articles_per_source = articles_per_source
+        self.paragraphs = paragraphs
+        self.latency = latency
+        self.validators = validators
+        self.revision = 0
+        self.requests: List[str] = []
+        # Path -> number of 503 responses to return before serving normally
+        self.failures: Dict[str, int] = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def news_sources(self) -> Dict[str, Dict[str, str]]:
+        """Return a NewsScraper.news_sources mapping pointing at this server."""
+        return {
+            source: {
+                'url': f"{self.base_url}/{source}/",
+                'article_selector': '.article',
+                'title_selector': 'h1',
+                'content_selector': '.article-body'
+            }
+            for source in self.sources
+        }
+
+    def render(self, path: str) -> Dict[str, Any]:
+        """Return the status, headers and body for a request path."""
+        if self.failures.get(path, 0) > 0:
+            self.failures[path] -= 1
+            return {'status': 503, 'headers': {}, 'body': 'Unavailable'}
+        parts = [part for part in path.split('?')[0].split('/') if part]
+        if len(parts) == 1 and parts[0] in self.sources:
+            items = ''.join(ARTICLE_ITEM.format(source=parts[0], index=i)
+                            for i in range(self.articles_per_source))
+            return {'status': 200, 'headers': {}, 'body': FRONT_PAGE.format(source=parts[0], items=items)}
+        if len(parts) == 3 and parts[0] in self.sources and parts[1] == 'article':
+            paragraphs = ''.join(PARAGRAPH.format(index=parts[2], paragraph=i, revision=self.revision)
+                                 for i in range(self.paragraphs))
+            title = f"{parts[0].title()} story {parts[2]}"
+            return {'status': 200, 'headers': {}, 'body': ARTICLE_PAGE.format(title=title, paragraphs=paragraphs)}
+        return {'status': 404, 'headers': {}, 'body': 'Not found'}
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stub.requests.append(self.path)
+                with stub._lock:
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    response = stub.render(self.path)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                body = response['body'].encode('utf-8')
+                if stub.validators and response['status'] == 200:
+                    etag = '"%s"' % hashlib.md5(body).hexdigest()
+                    response['headers'].update({'ETag': etag,
+                                                'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+                    if self.headers.get('If-None-Match') == etag:
+                        response['status'] = 304
+                        body = b''
+                self.send_response(response['status'])
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in response['headers'].items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'StubNewsServer':
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubNewsServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
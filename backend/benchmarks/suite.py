@@ -0,0 +1,342 @@
+"""
+Benchmark suite for the scrape -> analyze pipeline, with JSON baselines.
+
+Cases cover every NewsAnalyzer stage, NewsScraper parsing of the stored
+HTML fixtures in benchmarks/fixtures with each parser backend, and
+end-to-end /analyze-news requests through an in-process ASGI client.
+Cases whose dependencies are unavailable (e.g. NLTK data) are skipped
+and listed in the results.
+
+    python -m benchmarks.suite run --output benchmarks/baselines/main.json
+    python -m benchmarks.suite run --baseline benchmarks/baselines/main.json --threshold 0.1
+    python -m benchmarks.suite compare benchmarks/baselines/main.json current.json
+
+benchmarks/baselines/main.json is the committed reference. Timings depend
+on the machine, so refresh it with the first command on the machine that
+runs the gate, with the NLTK data bundle installed, and commit it.
+
+`compare`, and `run` with --baseline, exit with status 1 when a case's
+median time regressed by more than the threshold, or when a baseline case
+did not run (e.g. skipped for missing NLTK data) unless --allow-missing is
+given.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from contextlib import ExitStack, asynccontextmanager
+from typing import Callable, Dict, Any, AsyncIterator, List, Optional
+import httpx
+from benchmarks.analyzer_cpu import long_article
+from benchmarks.stub_server import StubNewsServer
+from services.cache import AnalysisCache
+from services.container import ServiceContainer
+from services.parsers import available_parsers, detect_encoding
+from services.scraper import NewsScraper
+from services.store import ArticleStore
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+BASELINES = os.path.join(os.path.dirname(__file__), 'baselines')
+_ANSI = re.compile(r'\x1b\[[0-9;]*m')
+
+# Selectors matching the fixture pages
+FIXTURE_CONFIG = {
+    'url': 'https://news.example/alpha/',
+    'article_selector': '.main-content .article',
+    'title_selector': 'h1',
+    'content_selector': '.article-body'
+}
+
+# Case name -> factory that sets a case up and returns the function to time
+CASES: Dict[str, Callable[[ExitStack], Callable[[], Any]]] = {}
+
+def case(name: str):
+    """Register a benchmark case factory under a name."""
+    def register(factory):
+        CASES[name] = factory
+        return factory
+    return register
+
+def fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+_analyzer = None
+
+def analyzer():
+    """One uncached NewsAnalyzer shared by the analyzer cases."""
+    global _analyzer
+    if _analyzer is None:
+        from services.analyzer import NewsAnalyzer
+        _analyzer = NewsAnalyzer(cache=AnalysisCache(max_entries=0))
+        _analyzer.warm_up()
+    return _analyzer
+
+def sample_text(words: int = 2000) -> str:
+    return long_article(NewsScraper().sample_articles, words)['content']
+
+# Analyzer stages, each timed on a document that is already tokenized
+
+@case('analyzer.document')
+def analyzer_document(stack: ExitStack) -> Callable[[], Any]:
+    news, text = analyzer(), sample_text()
+    return lambda: news.document(text).content_words
+
+def _stage(stage: Callable[[Any, Any], Any]) -> Callable[[ExitStack], Callable[[], Any]]:
+    def factory(stack: ExitStack) -> Callable[[], Any]:
+        news = analyzer()
+        doc = news.document(sample_text())
+        doc.content_words, doc.tagged_sentences
+        return lambda: stage(news, doc)
+    return factory
+
+case('analyzer.sentiment')(_stage(lambda news, doc: news.sia.polarity_scores(doc.text)))
+case('analyzer.topic')(_stage(lambda news, doc: news._classify_topic(doc)))
+case('analyzer.summary')(_stage(lambda news, doc: news._generate_summary(doc)))
+case('analyzer.entities.accurate')(_stage(lambda news, doc: news._extract_entities(doc, 'accurate')))
+case('analyzer.entities.fast')(_stage(lambda news, doc: news._extract_entities(doc, 'fast')))
+case('analyzer.keywords')(_stage(lambda news, doc: news._extract_keywords(doc)))
+
+@case('analyzer.analyze_article')
+def analyzer_article(stack: ExitStack) -> Callable[[], Any]:
+    news, text = analyzer(), sample_text()
+    return lambda: news._analyze({'title': 'Benchmark', 'content': text})
+
+# Scraper parsing of the stored fixtures, per parser backend
+
+def _parse_case(backend: str, page: str) -> Callable[[ExitStack], Callable[[], Any]]:
+    def factory(stack: ExitStack) -> Callable[[], Any]:
+        scraper = NewsScraper(parser=backend, fetch_cache=None)
+        body = fixture(page)
+        encoding = detect_encoding(body)
+        if page == 'front_page.html':
+            return lambda: scraper._extract_article_links(body, encoding, FIXTURE_CONFIG)
+        return lambda: scraper._parse_article(body, encoding, FIXTURE_CONFIG['url'], FIXTURE_CONFIG)
+    return factory
+
+for _backend in available_parsers():
+    for _page in ('front_page.html', 'article.html', 'long_article.html'):
+        case(f"parse.{_backend}.{_page[:-len('.html')]}")(_parse_case(_backend, _page))
+
+# End to end through the API
+
+@asynccontextmanager
+async def asgi_client(services: ServiceContainer) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    In-process client for the FastAPI app, no server or network needed.
+
+    The lifespan does not run under httpx's ASGI transport, so the given
+    container is warmed here and installed on the app.
+    """
+    import main
+    services.warm_up()
+    if not services.ready:
+        raise LookupError(services.error)
+    main.app.state.services = services
+    try:
+        async with httpx.AsyncClient(app=main.app, base_url='http://benchmark') as client:
+            yield client
+    finally:
+        services.shutdown()
+
+def _api_case(path: str, live: bool) -> Callable[[ExitStack], Callable[[], Any]]:
+    def factory(stack: ExitStack) -> Callable[[], Any]:
+        from services.analyzer import NewsAnalyzer
+        server = stack.enter_context(StubNewsServer()) if live else None
+
+        def scraper_factory():
+            scraper = NewsScraper(fetch_cache=None)
+            if server is not None:
+                scraper.news_sources = server.news_sources()
+            return scraper
+
+        services = ServiceContainer(scraper_factory=scraper_factory,
+                                    analyzer_factory=lambda: NewsAnalyzer(cache=AnalysisCache(max_entries=0)),
+                                    store_factory=ArticleStore, ingest_enabled=False)
+        loop = asyncio.new_event_loop()
+        stack.callback(loop.close)
+        context = asgi_client(services)
+        client = loop.run_until_complete(context.__aenter__())
+        stack.callback(lambda: loop.run_until_complete(context.__aexit__(None, None, None)))
+
+        def request():
+            response = loop.run_until_complete(client.get(path))
+            response.raise_for_status()
+            return response
+        return request
+    return factory
+
+case('api.analyze_news')(_api_case('/analyze-news', live=False))
+case('api.analyze_news.live')(_api_case('/analyze-news?live=true', live=True))
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    """Seconds per call: calls are batched until a batch takes min_time, best and median of `repeat` batches."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {'min': min(timings), 'median': statistics.median(timings), 'calls': number, 'repeat': repeat}
+
+def _reason(error: Exception) -> str:
+    """First meaningful line of an error, without NLTK's banner and colours."""
+    lines = [_ANSI.sub('', line).strip() for line in str(error).splitlines()]
+    lines = [line for line in lines if line and not line.startswith('*')]
+    return f"{type(error).__name__}: {lines[0] if lines else ''}"
+
+def run(names: List[str], repeat: int = 5, min_time: float = 0.05) -> Dict[str, Any]:
+    """
+    Run benchmark cases.
+
+    Returns:
+        Dict[str, Any]: Machine metadata, per-case timings in seconds and
+            the reason each skipped case was skipped
+    """
+    results, skipped = {}, {}
+    for name in names:
+        with ExitStack() as stack:
+            try:
+                func = CASES[name](stack)
+                func()
+            except (LookupError, ImportError, ValueError) as e:
+                skipped[name] = _reason(e)
+                continue
+            results[name] = measure(func, repeat, min_time)
+    return {
+        'meta': {'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                 'python': platform.python_version(), 'platform': platform.platform(),
+                 'cpus': os.cpu_count()},
+        'results': results,
+        'skipped': skipped
+    }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Compare median timings of two runs.
+
+    Args:
+        baseline (Dict[str, Any]): Output of run() to compare against
+        current (Dict[str, Any]): Output of run() under test
+        threshold (float): Relative slowdown that counts as a regression
+
+    Returns:
+        List[Dict[str, Any]]: One row per case with both medians, the
+            relative change and a status of 'regression', 'improvement',
+            'ok', 'new' or 'missing'; missing rows carry the reason the
+            case was skipped, if it was
+    """
+    rows = []
+    before, after = baseline['results'], current['results']
+    for name in sorted(set(before) | set(after)):
+        if name not in after:
+            rows.append({'name': name, 'baseline': before[name]['median'], 'current': None, 'change': None,
+                         'status': 'missing', 'reason': current.get('skipped', {}).get(name, 'not run')})
+            continue
+        if name not in before:
+            rows.append({'name': name, 'baseline': None, 'current': after[name]['median'], 'change': None,
+                         'status': 'new'})
+            continue
+        change = after[name]['median'] / before[name]['median'] - 1
+        status = 'regression' if change > threshold else 'improvement' if change < -threshold else 'ok'
+        rows.append({'name': name, 'baseline': before[name]['median'], 'current': after[name]['median'],
+                     'change': change, 'status': status})
+    return rows
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+def _save(path: str, results: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def machine_differences(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Machine metadata that differs between two runs, as 'key: baseline -> current'."""
+    before, after = baseline.get('meta', {}), current.get('meta', {})
+    return [f"{key}: {before.get(key)} -> {after.get(key)}" for key in ('python', 'platform', 'cpus')
+            if before.get(key) != after.get(key)]
+
+def _print_machine_differences(baseline: Dict[str, Any], current: Dict[str, Any]) -> None:
+    differences = machine_differences(baseline, current)
+    if differences:
+        print(f"Baseline was recorded on a different machine ({', '.join(differences)}); "
+              f"timings may not be comparable")
+
+def _print_comparison(rows: List[Dict[str, Any]], allow_missing: bool = False) -> bool:
+    """Print a comparison table and return True if anything regressed or, unless allowed, is missing."""
+    def ms(value: Optional[float]) -> str:
+        return f"{value * 1000:10.3f}ms" if value is not None else f"{'-':>12}"
+    print(f"{'case':<40} {'baseline':>12} {'current':>12} {'change':>8}  status")
+    for row in rows:
+        change = f"{row['change'] * 100:+7.1f}%" if row['change'] is not None else f"{'':>8}"
+        reason = f" ({row['reason']})" if 'reason' in row else ''
+        print(f"{row['name']:<40} {ms(row['baseline'])} {ms(row['current'])} {change}  {row['status']}{reason}")
+    failing = {'regression'} if allow_missing else {'regression', 'missing'}
+    return any(row['status'] in failing for row in rows)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the suite and save the results')
+    run_parser.add_argument('cases', nargs='*', help='case name prefixes, e.g. analyzer parse.lxml api')
+    run_parser.add_argument('--output', default=os.path.join(BASELINES, 'latest.json'))
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--min-time', type=float, default=0.05)
+    run_parser.add_argument('--baseline', help='compare against this results file after running')
+    run_parser.add_argument('--threshold', type=float, default=0.1)
+    run_parser.add_argument('--allow-missing', action='store_true',
+                            help='do not fail when a baseline case was skipped')
+    compare_parser = commands.add_parser('compare', help='compare two results files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+    compare_parser.add_argument('--allow-missing', action='store_true',
+                                help='do not fail when a baseline case is missing from the current run')
+    commands.add_parser('list', help='list the case names')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        print('\n'.join(CASES))
+        return
+
+    if args.command == 'compare':
+        baseline, current = _load(args.baseline), _load(args.current)
+        _print_machine_differences(baseline, current)
+        failed = _print_comparison(compare(baseline, current, args.threshold), args.allow_missing)
+        sys.exit(1 if failed else 0)
+
+    names = [name for name in CASES if not args.cases or any(name.startswith(prefix) for prefix in args.cases)]
+    results = run(names, args.repeat, args.min_time)
+    _save(args.output, results)
+    for name, timing in results['results'].items():
+        print(f"{name:<40} median {timing['median'] * 1000:10.3f}ms  min {timing['min'] * 1000:10.3f}ms")
+    for name, reason in results['skipped'].items():
+        print(f"{name:<40} skipped ({reason})")
+    print(f"Saved {args.output}")
+    if args.baseline:
+        baseline = _load(args.baseline)
+        # Cases left out by the prefixes were not meant to run
+        baseline['results'] = {name: timing for name, timing in baseline['results'].items() if name in names}
+        _print_machine_differences(baseline, results)
+        failed = _print_comparison(compare(baseline, results, args.threshold), args.allow_missing)
+        sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
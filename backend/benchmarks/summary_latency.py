@@ -0,0 +1,45 @@
+"""
+Extractive summary latency by article length.
+
+Builds articles of increasing length from the sample articles and times
+ExtractiveSummarizer.rank against the per-article budget, reporting
+whether the TextRank summary or the lead-sentence fallback would be used.
+Sentences are split on punctuation so no NLTK data is needed.
+
+    python -m benchmarks.summary_latency --words 1000 5000 20000 --budget-ms 50
+"""
+import argparse
+import re
+import time
+from benchmarks.analyzer_cpu import long_article
+from services.scraper import NewsScraper
+from services.summarizer import ExtractiveSummarizer
+
+_SENTENCE = re.compile(r'(?<=[.!?])\s+')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--words', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--budget-ms', type=float, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    summarizer = ExtractiveSummarizer()
+    samples = NewsScraper().sample_articles
+    print(f"{'words':>8} {'sentences':>10} {'rank':>10} {'summary':>10} {'result':>9}")
+    for words in args.words:
+        sentences = _SENTENCE.split(long_article(samples, words)['content'])
+        tokens = [re.findall(r'\w+|[^\w\s]', sentence) for sentence in sentences]
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            summarizer.rank(tokens)
+            best = min(best, time.perf_counter() - start)
+        start = time.perf_counter()
+        summarizer.summarize(sentences, tokens, budget=args.budget_ms / 1000)
+        summary = time.perf_counter() - start
+        result = 'textrank' if best * 1000 <= args.budget_ms else 'lead-N'
+        print(f"{words:>8} {len(sentences):>10} {best * 1000:8.1f}ms {summary * 1000:8.1f}ms {result:>9}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+import pytest
+from benchmarks.stub_server import StubNewsServer
+
+@pytest.fixture
+def stub_news_server():
+    """Local news site with canned front pages and articles."""
+    with StubNewsServer() as server:
+        yield server
+
+@pytest.fixture
+def slow_stub_news_server():
+    """Stub news site that delays every response by 50ms."""
+    with StubNewsServer(latency=0.05) as server:
+        yield server
@@ -1,14 +1,40 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from starlette.background import BackgroundTask
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 import uvicorn
-from services.scraper import NewsScraper
-from services.analyzer import NewsAnalyzer
+from services.container import ServiceContainer
+from services.dedup import analyze_deduplicated
+from services.export import HAS_PYARROW, MEDIA_TYPES, export_store
+from services.metrics import HTTP_REQUEST_SECONDS, REGISTRY
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load models and lexicons once per worker; tests may pre-install a container
+    services = getattr(app.state, 'services', None) or ServiceContainer()
+    services.warm_up()
+    app.state.services = services
+    if services.ready and services.ingest_enabled:
+        services.scheduler.start()
+    yield
+    if services.scheduler is not None:
+        await services.scheduler.stop()
+    services.shutdown()
 
 app = FastAPI(title="News Aggregator API",
              description="API for scraping and analyzing news articles",
-             version="1.0.0")
+             version="1.0.0",
+             lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -26,32 +52,283 @@ class ArticleAnalysis(BaseModel):
     summary: str
     sentiment: float
     entities: dict
+    keywords: List[str] = []
+    # Seconds per analysis stage, only with profile enabled
+    stages: Optional[Dict[str, float]] = None
+
+class StoredArticle(BaseModel):
+    url: str
+    source: str
+    title: str
+    topic: str
+    summary: str
+    sentiment: float
+    entities: dict
+    published: datetime
+
+class ArticlePage(BaseModel):
+    items: List[StoredArticle]
+    total: int
+    limit: int
+    offset: int
+
+class ArticleInput(BaseModel):
+    title: str
+    content: str
+    url: str = ''
+
+# 'accurate' runs the NLTK chunker, 'fast' matches against the gazetteer
+EntityMode = Literal["accurate", "fast"]
+
+class BatchRequest(BaseModel):
+    articles: List[ArticleInput]
+    entity_mode: Optional[EntityMode] = None
+    profile: bool = False
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    # Streaming responses are timed until their headers are sent
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                                 route=route.path if route is not None else "unmatched",
+                                 status=str(response.status_code))
+    return response
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to the News Aggregator API"}
 
-@app.get("/analyze-news", response_model=List[ArticleAnalysis])
-async def analyze_news():
+def get_services(request: Request) -> ServiceContainer:
+    """Return the warmed service container, or fail with 503 if it is not ready."""
+    services = request.app.state.services
+    if not services.ready:
+        raise HTTPException(status_code=503, detail=services.error or "Services are warming up")
+    return services
+
+@app.get("/metrics")
+async def metrics():
+    # Prometheus text exposition format; histograms of this worker process
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/ready")
+async def ready(request: Request):
+    services = request.app.state.services
+    return JSONResponse(status_code=200 if services.ready else 503, content=services.status())
+
+@app.get("/cache/stats")
+async def cache_stats(request: Request):
+    # Counters of this worker's analysis cache (batch pool workers keep their own)
+    cache = getattr(get_services(request).analyzer, 'cache', None)
+    return cache.stats() if cache is not None else {}
+
+@app.get("/dedup/stats")
+async def dedup_stats(request: Request):
+    # Near-duplicate detection counters and mean dedup time per article
+    return get_services(request).dedup.stats()
+
+def analyze_articles(analyzer, articles: List[dict], pool=None, services: ServiceContainer = None,
+                     entity_mode: Optional[str] = None, profile: bool = False) -> List[dict]:
+    """
+    Analyze each successfully scraped article and attach its URL.
+    
+    With the service container given, near-duplicates of articles already
+    seen are analyzed once per cluster. The per-stage timings are kept only
+    when profiling.
+    """
+    articles = [article for article in articles if article]  # Drop failed scrapes
+    if services is not None and services.dedup is not None:
+        analyses = analyze_deduplicated(analyzer, articles, services.dedup, pool, services.store.get,
+                                        entity_mode)
+    else:
+        analyses = analyzer.analyze_many(articles, pool, entity_mode)
+    analyzed_articles = []
+    for article, analysis in zip(articles, analyses):
+        analysis['url'] = article['url']  # Add URL to the analysis
+        if not profile:
+            analysis.pop('stages', None)
+        analyzed_articles.append(analysis)
+    return analyzed_articles
+
+@app.get("/analyze-news", response_model=List[ArticleAnalysis], response_model_exclude_none=True)
+async def analyze_news(request: Request, live: bool = False, entity_mode: Optional[EntityMode] = None,
+                       profile: bool = False):
+    services = get_services(request)
     try:
-        # Initialize services
-        scraper = NewsScraper()
-        analyzer = NewsAnalyzer()
+        scraper = services.scraper
+        analyzer = services.analyzer
         
-        # Scrape articles from all sources
-        articles = scraper.scrape_all_sources()
+        # Scrape articles from all sources (live sources are fetched concurrently)
+        if live:
+            articles = await scraper.scrape_sources_async()
+        else:
+            articles = scraper.scrape_all_sources()
         
-        # Analyze each article
-        analyzed_articles = []
-        for article in articles:
-            if article:  # Check if article was successfully scraped
-                analysis = analyzer.analyze_article(article)
-                analysis['url'] = article['url']  # Add URL to the analysis
-                analyzed_articles.append(analysis)
+        # Analysis is CPU-bound, keep it off the event loop
+        return await run_in_threadpool(analyze_articles, analyzer, articles, None, services, entity_mode,
+                                       profile)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Marks the end of a stream of analyses
+_STREAM_DONE = object()
+
+async def iter_article_analyses(services: ServiceContainer, live: bool, max_pending: int,
+                                entity_mode: Optional[str] = None, profile: bool = False) -> AsyncIterator[Any]:
+    """
+    Yield each article analysis as soon as it is ready.
+    
+    Scraping and analysis run in a producer task that feeds a bounded queue,
+    so at most `max_pending` finished analyses wait for a slow client before
+    the producer blocks. An exception is yielded as the last item on failure.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+    
+    async def articles() -> AsyncIterator[dict]:
+        if live:
+            async for article in services.scraper.iter_sources_async():
+                yield article
+        else:
+            for article in services.scraper.scrape_all_sources():
+                yield article
+    
+    async def produce() -> None:
+        try:
+            async for article in articles():
+                if not article:
+                    continue
+                analyses = await run_in_threadpool(analyze_articles, services.analyzer, [article],
+                                                   None, services, entity_mode, profile)
+                await queue.put(ArticleAnalysis(**analyses[0]).model_dump(exclude_none=True))
+        except Exception as e:
+            await queue.put(e)
+        # Not in a finally: once cancelled nobody reads the queue, so a put could block forever
+        await queue.put(_STREAM_DONE)
+    
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                break
+            yield item
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+def format_ndjson(item: Any) -> str:
+    if isinstance(item, Exception):
+        return json.dumps({"error": str(item)}) + "\n"
+    return json.dumps(item) + "\n"
+
+def format_sse(item: Any) -> str:
+    if isinstance(item, Exception):
+        return f"event: error\ndata: {json.dumps({'error': str(item)})}\n\n"
+    return f"data: {json.dumps(item)}\n\n"
+
+@app.get("/analyze-news/stream")
+async def analyze_news_stream(request: Request, live: bool = False, format: str = "ndjson",
+                              max_pending: int = Query(4, ge=1, le=64), entity_mode: Optional[EntityMode] = None,
+                              profile: bool = False):
+    services = get_services(request)
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+    formatter = format_sse if format == "sse" else format_ndjson
+    
+    async def body() -> AsyncIterator[str]:
+        async for item in iter_article_analyses(services, live, max_pending, entity_mode, profile):
+            yield formatter(item)
+        if format == "sse":
+            yield "event: done\ndata: {}\n\n"
+    
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+@app.post("/analyze/batch", response_model=List[ArticleAnalysis], response_model_exclude_none=True)
+async def analyze_batch(batch: BatchRequest, request: Request):
+    services = get_services(request)
+    try:
+        articles = [article.model_dump() for article in batch.articles]
         
-        return analyzed_articles
+        # Fan out across the process pool; results keep submission order
+        return await run_in_threadpool(analyze_articles, services.analyzer, articles,
+                                       services.analysis_pool, None, batch.entity_mode, batch.profile)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def get_store(request: Request):
+    """Return the article store; it is usable even before the analyzer is warm."""
+    store = request.app.state.services.store
+    if store is None:
+        raise HTTPException(status_code=503, detail="Article store is not available")
+    return store
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+@app.get("/articles", response_model=ArticlePage)
+async def list_articles(request: Request, topic: Optional[str] = None, source: Optional[str] = None,
+                        since: Optional[datetime] = None, until: Optional[datetime] = None,
+                        min_sentiment: Optional[float] = None, max_sentiment: Optional[float] = None,
+                        limit: int = Query(20, ge=1, le=100), offset: int = Query(0, ge=0)):
+    # Served from the ingested store only, never scrapes
+    page = get_store(request).query(topic=topic, source=source, since=_timestamp(since),
+                                    until=_timestamp(until), min_sentiment=min_sentiment,
+                                    max_sentiment=max_sentiment, limit=limit, offset=offset)
+    for item in page['items']:
+        item['published'] = datetime.fromtimestamp(item['published'], timezone.utc)
+    return page
+
+@app.get("/articles/export")
+async def export_articles(request: Request, format: Literal["parquet", "arrow"] = "parquet",
+                          topic: Optional[str] = None, source: Optional[str] = None,
+                          since: Optional[datetime] = None, until: Optional[datetime] = None,
+                          content: bool = False):
+    store = get_store(request)
+    if not HAS_PYARROW:
+        raise HTTPException(status_code=501, detail="Arrow/Parquet export needs pyarrow installed")
+    # Streamed from SQLite into a temporary file batch by batch, removed once sent
+    fd, path = tempfile.mkstemp(suffix=f".{format}")
+    os.close(fd)
+    try:
+        count = await run_in_threadpool(export_store, store, path, format, content=content, topic=topic,
+                                        source=source, since=_timestamp(since), until=_timestamp(until))
+    except Exception as e:
+        os.remove(path)
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+    return FileResponse(path, media_type=MEDIA_TYPES[format], filename=f"articles.{format}",
+                        headers={"X-Article-Count": str(count)}, background=BackgroundTask(os.remove, path))
+
+@app.get("/trends")
+async def trends(request: Request, topic: Optional[str] = None, windows: int = Query(1, ge=1),
+                 limit: int = Query(10, ge=1, le=50)):
+    # Read from the incrementally updated sketches, never from the store
+    return get_services(request).trends.trending(topic=topic, windows=windows, limit=limit)
+
+@app.get("/sources/health")
+async def sources_health(request: Request):
+    # Circuit state and adaptive limits of each source's host, shared by live scrapes and ingestion
+    return {"sources": get_services(request).scraper.source_health()}
+
+@app.get("/ingest/status")
+async def ingest_status(request: Request):
+    services = get_services(request)
+    return {"enabled": services.ingest_enabled, "sources": services.scheduler.status()}
+
+@app.post("/ingest/run")
+async def ingest_run(request: Request, source: Optional[str] = None):
+    services = get_services(request)
+    sources = [source] if source else list(services.scraper.news_sources)
+    unknown = [name for name in sources if name not in services.scraper.news_sources]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown source: {unknown[0]}")
+    counts = await asyncio.gather(*(services.scheduler.ingest_source(name) for name in sources))
+    return {"stored": dict(zip(sources, counts))}
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
@@ -1,119 +1,279 @@
-from typing import Dict, Any, List
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.tag import pos_tag
-from nltk.chunk import ne_chunk
+import hashlib
+import json
+import os
+import time
+from functools import cached_property
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 from collections import Counter
+from itertools import islice
+from services.cache import AnalysisCache
+from services.document import AnalysisDocument
+from services.entities import ENTITY_MODES, DEFAULT_GAZETTEER_PATH, Gazetteer
+from services.metrics import StageTimer
+from services.nltk_data import require_nltk_resources, use_bundle
+from services.sentiment import SENTIMENT_MODES, BatchSentiment
+from services.summarizer import ExtractiveSummarizer
+from services.topics import TopicIndex, DEFAULT_TOPICS_PATH
+
+# Bump when a change to the analysis stages should invalidate cached results
+ANALYZER_VERSION = '3'
+
+# Articles whose sentiment is scored in one vectorized pass by analyze_many in 'batch' mode
+SENTIMENT_BATCH_SIZE = 512
 
 class NewsAnalyzer:
-    def __init__(self):
-        # Download required NLTK data
-        try:
-            nltk.data.find('vader_lexicon')
-            nltk.data.find('punkt')
-            nltk.data.find('stopwords')
-            nltk.data.find('averaged_perceptron_tagger')
-            nltk.data.find('maxent_ne_chunker')
-            nltk.data.find('words')
-        except LookupError:
-            nltk.download('vader_lexicon')
-            nltk.download('punkt')
-            nltk.download('stopwords')
-            nltk.download('averaged_perceptron_tagger')
-            nltk.download('maxent_ne_chunker')
-            nltk.download('words')
+    """
+    Sentiment, topic, summary, entity and keyword analysis of articles.
+
+    Construction only checks that the vendored NLTK data is present and
+    reads the configuration; nltk and each model are imported and loaded on
+    first use of the stage that needs them (or by warm_up()), so serving
+    cached results never pays for them.
+    """
+
+    def __init__(self, topics_path: Optional[str] = None, cache: Optional[AnalysisCache] = None,
+                 gazetteer_path: Optional[str] = None, entity_mode: Optional[str] = None,
+                 sentiment_mode: Optional[str] = None):
+        # NLTK data comes from the bundle built at deploy time, never downloaded here
+        require_nltk_resources()
         
-        self.sia = SentimentIntensityAnalyzer()
-        self.stop_words = set(stopwords.words('english'))
+        with open(topics_path or DEFAULT_TOPICS_PATH, encoding='utf-8') as f:
+            self.topic_keywords = json.load(f)
         
-        # Topic keywords for classification
-        self.topic_keywords = {
-            'politics': ['government', 'minister', 'election', 'party', 'parliament', 'political', 'vote', 'democracy'],
-            'sports': ['cricket', 'football', 'game', 'player', 'tournament', 'match', 'sport', 'team', 'championship'],
-            'business': ['market', 'economy', 'company', 'stock', 'business', 'trade', 'investment', 'financial'],
-            'technology': ['technology', 'digital', 'software', 'internet', 'cyber', 'tech', 'AI', 'innovation'],
-            'entertainment': ['movie', 'film', 'music', 'actor', 'celebrity', 'entertainment', 'star', 'cinema'],
-            'health': ['health', 'medical', 'hospital', 'disease', 'treatment', 'doctor', 'patient', 'healthcare'],
-            'agriculture': ['farm', 'crop', 'agriculture', 'farmer', 'harvest', 'cultivation', 'agricultural', 'farming']
-        }
+        # Gazetteer automaton for the fast entity mode; 'accurate' uses ne_chunk
+        gazetteer_path = gazetteer_path or DEFAULT_GAZETTEER_PATH
+        self.gazetteer = Gazetteer.from_file(gazetteer_path)
+        self.entity_mode = self._check_entity_mode(entity_mode or os.environ.get('ENTITY_MODE', 'accurate'))
+        
+        # 'batch' scores VADER sentiment with the vectorized BatchSentiment; scores match 'exact',
+        # so both modes share cached results
+        self.sentiment_mode = sentiment_mode or os.environ.get('SENTIMENT_MODE', 'exact')
+        if self.sentiment_mode not in SENTIMENT_MODES:
+            raise ValueError(f"Unknown sentiment mode '{self.sentiment_mode}', choose from {SENTIMENT_MODES}")
+        
+        # Results are cached per content hash and analyzer/config version
+        self.cache = cache if cache is not None else AnalysisCache.from_env()
+        with open(gazetteer_path, 'rb') as f:
+            gazetteer = hashlib.sha256(f.read()).hexdigest()
+        config = json.dumps([self.topic_keywords, ExtractiveSummarizer.from_env().config()], sort_keys=True)
+        self.config_version = hashlib.sha256(f"{ANALYZER_VERSION}:{config}:{gazetteer}".encode('utf-8')).hexdigest()[:16]
+
+    @cached_property
+    def sia(self):
+        use_bundle()
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        return SentimentIntensityAnalyzer()
+
+    @cached_property
+    def batch_sentiment(self) -> BatchSentiment:
+        # VADER's lexicon compiled for vectorized scoring
+        return BatchSentiment(self.sia.lexicon)
+
+    @cached_property
+    def stop_words(self) -> Set[str]:
+        use_bundle()
+        from nltk.corpus import stopwords
+        return set(stopwords.words('english'))
 
-    def analyze_article(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
+    @cached_property
+    def tagger(self):
+        # Keep one tagger around; nltk.pos_tag builds a new one on every call
+        use_bundle()
+        from nltk.tag import PerceptronTagger
+        return PerceptronTagger()
+
+    @cached_property
+    def topic_index(self) -> TopicIndex:
+        # Keyword -> topic index for classification
+        return TopicIndex(self.topic_keywords, self.stop_words)
+
+    @cached_property
+    def summarizer(self) -> ExtractiveSummarizer:
+        # Extractive summaries, falling back to the lead sentences past the time budget
+        return ExtractiveSummarizer.from_env(self.stop_words)
+
+    def warm_up(self) -> None:
+        """
+        Run a tiny analysis so lazily loaded models (punkt, the NE chunker)
+        are in memory before the first real request arrives.
+        """
+        # Model loading would skew the stage histograms, so this run is not recorded
+        self._analyze({
+            "title": "Warm-up",
+            "content": "Prime Minister Narendra Modi visited Mumbai. The market rallied."
+        }, timer=StageTimer(histogram=None))
+
+    def document(self, text: str) -> AnalysisDocument:
+        """Segment and tokenize text once for all analysis stages."""
+        use_bundle()
+        # The tagger is only loaded once a stage asks for POS tags
+        return AnalysisDocument(text, self.stop_words, lambda: self.tagger)
+
+    def _check_entity_mode(self, entity_mode: str) -> str:
+        if entity_mode not in ENTITY_MODES:
+            raise ValueError(f"Unknown entity mode '{entity_mode}', choose from {ENTITY_MODES}")
+        return entity_mode
+
+    def analyze_article(self, article_data: Dict[str, Any], entity_mode: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze the content of a news article.
         
         Args:
             article_data (Dict[str, Any]): Dictionary containing article data
+            entity_mode (str): 'accurate' (NLTK chunker) or 'fast' (gazetteer),
+                defaults to the analyzer's entity_mode
             
         Returns:
-            Dict[str, Any]: Dictionary containing analysis results
+            Dict[str, Any]: Dictionary containing analysis results, with the
+                seconds spent per stage under 'stages'
         """
+        entity_mode = self._check_entity_mode(entity_mode or self.entity_mode)
+        timer = StageTimer()
+        key, cached = self._cached(article_data, entity_mode, timer)
+        if cached is not None:
+            return cached
+        
+        analysis = self._analyze(article_data, entity_mode, timer)
+        self._store(key, analysis)
+        return analysis
+
+    def _cached(self, article_data: Dict[str, Any], entity_mode: str,
+                timer: StageTimer) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """The article's cache key and cached analysis, either None without a cache or on a miss."""
+        if self.cache is None:
+            return None, None
+        with timer.stage('cache'):
+            key = self.cache.key(article_data, f"{self.config_version}:{entity_mode}")
+            cached = self.cache.get(key)
+        if cached is not None:
+            cached['stages'] = timer.stages
+        return key, cached
+
+    def _store(self, key: Optional[str], analysis: Dict[str, Any]) -> None:
+        if key is not None:
+            # Timings describe this run only, they are not cached
+            self.cache.set(key, {name: value for name, value in analysis.items() if name != 'stages'})
+
+    def _analyze(self, article_data: Dict[str, Any], entity_mode: str = 'accurate',
+                 timer: Optional[StageTimer] = None, sentiment: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run every analysis stage on an article, bypassing the cache.
+
+        A `sentiment` already scored for the article (by analyze_many in
+        batch mode) replaces the sentiment stage.
+        """
+        timer = timer or StageTimer()
         try:
             content = article_data["content"]
+            # Tokenization views are built lazily, so their cost lands in the first stage using them
+            with timer.stage('document'):
+                doc = self.document(content)
             
             # Perform sentiment analysis
-            sentiment_scores = self.sia.polarity_scores(content)
+            if sentiment is None:
+                with timer.stage('sentiment'):
+                    sentiment = self._sentiment([content])[0]
             
             # Classify topic
-            topic = self._classify_topic(content)
+            with timer.stage('topic'):
+                topic = self._classify_topic(doc)
             
-            # Generate summary (first few sentences, max 150 words)
-            summary = self._generate_summary(content)
+            # Generate an extractive summary (max 150 words)
+            with timer.stage('summary'):
+                summary = self._generate_summary(doc)
             
             # Extract entities (people and locations)
-            entities = self._extract_entities(content)
+            with timer.stage('entities'):
+                entities = self._extract_entities(doc, entity_mode)
+            
+            # Most frequent content words, also fed to the trend statistics
+            with timer.stage('keywords'):
+                keywords = self._extract_keywords(doc)
             
             return {
                 "title": article_data["title"],
                 "topic": topic,
                 "summary": summary,
-                "sentiment": sentiment_scores["compound"],
-                "entities": entities
+                "sentiment": sentiment,
+                "entities": entities,
+                "keywords": keywords,
+                "stages": timer.stages
             }
         except Exception as e:
             raise Exception(f"Failed to analyze article: {str(e)}")
 
-    def _classify_topic(self, text: str) -> str:
-        """Classify the topic of the article based on keyword frequency."""
-        words = word_tokenize(text.lower())
-        words = [w for w in words if w.isalnum() and w not in self.stop_words]
-        
-        topic_scores = {}
-        for topic, keywords in self.topic_keywords.items():
-            score = sum(1 for word in words if word in keywords)
-            topic_scores[topic] = score
+    def analyze_many(self, articles: Iterable[Dict[str, Any]], pool=None,
+                     entity_mode: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze several articles, optionally across an AnalysisPool.
         
+        Args:
+            articles (Iterable[Dict[str, Any]]): Articles with title and content
+            pool (AnalysisPool): Process pool to fan out to; runs in-process if omitted
+            entity_mode (str): Entity extraction mode, see analyze_article
+            
+        Returns:
+            Iterator[Dict[str, Any]]: Analyses, yielded in submission order
+        """
+        if pool is not None:
+            return pool.map(articles, entity_mode)
+        if self.sentiment_mode == 'batch':
+            return self._analyze_batches(articles, self._check_entity_mode(entity_mode or self.entity_mode))
+        return (self.analyze_article(article, entity_mode) for article in articles)
+
+    def _sentiment(self, texts: List[str]) -> List[float]:
+        """VADER compound score of each text in the analyzer's sentiment mode."""
+        if self.sentiment_mode == 'batch':
+            return self.batch_sentiment.compound(texts).tolist()
+        return [self.sia.polarity_scores(text)['compound'] for text in texts]
+
+    def _analyze_batches(self, articles: Iterable[Dict[str, Any]], entity_mode: str) -> Iterator[Dict[str, Any]]:
+        """analyze_many in batch mode: the cache misses of each chunk are sentiment-scored together."""
+        articles = iter(articles)
+        while True:
+            chunk = list(islice(articles, SENTIMENT_BATCH_SIZE))
+            if not chunk:
+                return
+            timers = [StageTimer() for _ in chunk]
+            lookups = [self._cached(article, entity_mode, timer) for article, timer in zip(chunk, timers)]
+            misses = [i for i, (_, cached) in enumerate(lookups) if cached is None]
+            start = time.perf_counter()
+            try:
+                scores = self._sentiment([chunk[i]["content"] for i in misses])
+            except Exception as e:
+                raise Exception(f"Failed to analyze article: {str(e)}")
+            # Each article's share of the batch
+            elapsed = (time.perf_counter() - start) / max(len(misses), 1)
+            scores = dict(zip(misses, scores))
+            for i, (article, timer) in enumerate(zip(chunk, timers)):
+                key, cached = lookups[i]
+                if cached is not None:
+                    yield cached
+                    continue
+                timer.record('sentiment', elapsed)
+                analysis = self._analyze(article, entity_mode, timer, scores[i])
+                self._store(key, analysis)
+                yield analysis
+
+    def _classify_topic(self, doc: AnalysisDocument) -> str:
+        """Classify the topic of the article based on keyword frequency."""
         # Return the topic with highest score, or 'general' if no clear topic
-        max_score = max(topic_scores.values())
-        if max_score > 0:
-            return max(topic_scores.items(), key=lambda x: x[1])[0]
-        return 'general'
-
-    def _generate_summary(self, text: str, max_words: int = 150) -> str:
-        """Generate a summary of the text within word limit."""
-        sentences = sent_tokenize(text)
-        summary = []
-        word_count = 0
-        
-        for sentence in sentences:
-            words = word_tokenize(sentence)
-            if word_count + len(words) <= max_words:
-                summary.append(sentence)
-                word_count += len(words)
-            else:
-                break
-        
-        return ' '.join(summary)
+        return self.topic_index.classify(doc.content_words, 'general')
+
+    def _generate_summary(self, doc: AnalysisDocument, max_words: Optional[int] = None) -> str:
+        """Generate an extractive summary of the text within word limit."""
+        return self.summarizer.summarize(doc.sentences, doc.sentence_tokens, max_words)
 
-    def _extract_entities(self, text: str) -> Dict[str, List[str]]:
+    def _extract_entities(self, doc: AnalysisDocument, entity_mode: str = 'accurate') -> Dict[str, List[str]]:
         """Extract named entities (people and locations) from the text."""
-        sentences = nltk.sent_tokenize(text)
+        if entity_mode == 'fast':
+            # One automaton pass over the tokens instead of tagging and chunking
+            return self.gazetteer.extract(doc.tokens)
+        
+        from nltk.chunk import ne_chunk
         entities = {'people': set(), 'locations': set()}
         
-        for sentence in sentences:
-            words = nltk.word_tokenize(sentence)
-            tagged = nltk.pos_tag(words)
+        for tagged in doc.tagged_sentences:
             named_entities = ne_chunk(tagged)
             
             for chunk in named_entities:
@@ -129,23 +289,19 @@ class NewsAnalyzer:
             'locations': list(entities['locations'])
         }
 
-    def _extract_keywords(self, text: str, num_keywords: int = 10) -> List[str]:
+    def _extract_keywords(self, doc: AnalysisDocument, num_keywords: int = 10) -> List[str]:
         """
         Extract the most important keywords from the text.
         
         Args:
-            text (str): The text to analyze
+            doc (AnalysisDocument): The tokenized text to analyze
             num_keywords (int): Number of keywords to extract
             
         Returns:
             List[str]: List of keywords
         """
-        # Tokenize and clean text
-        tokens = word_tokenize(text.lower())
-        tokens = [token for token in tokens if token.isalnum() and token not in self.stop_words]
-        
         # Count word frequencies
-        word_freq = Counter(tokens)
+        word_freq = Counter(doc.content_words)
         
         # Get most common words
         keywords = [word for word, _ in word_freq.most_common(num_keywords)]
@@ -0,0 +1,176 @@
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-scraped copies of an article hash the same."""
+    return ' '.join(text.split())
+
+class AnalysisCache:
+    """
+    Content-addressed cache of analysis results.
+
+    Entries are keyed on a hash of the normalized title and content plus the
+    analyzer/config version, so any change to the text or to the analyzer
+    produces a new key. Results live in an in-memory LRU bounded by entry
+    count and TTL, with an optional SQLite tier that survives restarts and
+    can be shared by several processes. The SQLite tier is pruned every
+    `prune_every` writes: expired rows are deleted and, above
+    `max_disk_entries`, the oldest rows are evicted.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600,
+                 path: Optional[str] = None, clock: Callable[[], float] = time.time,
+                 max_disk_entries: Optional[int] = 100000, prune_every: int = 256):
+        """
+        Args:
+            max_entries (int): Maximum number of results kept in memory
+            ttl (float): Seconds a result stays valid, None for no expiry
+            path (str): SQLite file for the on-disk tier, None for memory only
+            clock (Callable[[], float]): Time source, injectable for tests
+            max_disk_entries (int): Maximum number of rows in the SQLite tier,
+                None for no limit
+            prune_every (int): Writes between two prunes of the SQLite tier
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.clock = clock
+        self.max_disk_entries = max_disk_entries
+        self.prune_every = prune_every
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+        self.counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0,
+                         'disk_evictions': 0, 'disk_expirations': 0}
+        
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS analysis_cache '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS analysis_cache_created ON analysis_cache (created)')
+            self._db.commit()
+            with self._lock:
+                self._prune()
+
+    @classmethod
+    def from_env(cls) -> 'AnalysisCache':
+        """
+        Build a cache from ANALYSIS_CACHE_SIZE, ANALYSIS_CACHE_TTL,
+        ANALYSIS_CACHE_PATH and ANALYSIS_CACHE_DISK_SIZE.
+        """
+        ttl = os.environ.get('ANALYSIS_CACHE_TTL', '3600')
+        disk_size = int(os.environ.get('ANALYSIS_CACHE_DISK_SIZE', '100000'))
+        return cls(max_entries=int(os.environ.get('ANALYSIS_CACHE_SIZE', '1024')),
+                   ttl=float(ttl) if float(ttl) > 0 else None,
+                   path=os.environ.get('ANALYSIS_CACHE_PATH') or None,
+                   max_disk_entries=disk_size if disk_size > 0 else None)
+
+    @staticmethod
+    def key(article: Dict[str, Any], version: str = '') -> str:
+        """Return the cache key for an article under an analyzer version."""
+        digest = hashlib.sha256()
+        for part in (version, normalize_text(article.get('title', '')), normalize_text(article['content'])):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and self.clock() - created > self.ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created):
+                    self._entries.move_to_end(key)
+                    self.counters['hits'] += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+                self.counters['expirations'] += 1
+            
+            if self._db is not None:
+                row = self._db.execute('SELECT value, created FROM analysis_cache WHERE key = ?',
+                                       (key,)).fetchone()
+                if row is not None:
+                    if not self._expired(row[1]):
+                        value = json.loads(row[0])
+                        self._remember(key, row[1], value)
+                        self.counters['disk_hits'] += 1
+                        return copy.deepcopy(value)
+                    self._db.execute('DELETE FROM analysis_cache WHERE key = ?', (key,))
+                    self._db.commit()
+                    self.counters['expirations'] += 1
+            
+            self.counters['misses'] += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result in memory and, if configured, on disk."""
+        created = self.clock()
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(key, created, value)
+            if self._db is not None:
+                self._db.execute('INSERT OR REPLACE INTO analysis_cache (key, value, created) VALUES (?, ?, ?)',
+                                 (key, json.dumps(value), created))
+                self._db.commit()
+                self._writes += 1
+                if self._writes % self.prune_every == 0:
+                    self._prune()
+
+    def _prune(self) -> None:
+        """Delete expired rows, then the oldest rows above max_disk_entries. Call with the lock held."""
+        if self.ttl is not None:
+            deleted = self._db.execute('DELETE FROM analysis_cache WHERE created < ?',
+                                       (self.clock() - self.ttl,)).rowcount
+            self.counters['disk_expirations'] += deleted
+        if self.max_disk_entries is not None:
+            excess = self._db.execute('SELECT COUNT(*) FROM analysis_cache').fetchone()[0] - self.max_disk_entries
+            if excess > 0:
+                deleted = self._db.execute(
+                    'DELETE FROM analysis_cache WHERE key IN '
+                    '(SELECT key FROM analysis_cache ORDER BY created LIMIT ?)', (excess,)).rowcount
+                self.counters['disk_evictions'] += deleted
+        self._db.commit()
+
+    def _remember(self, key: str, created: float, value: Dict[str, Any]) -> None:
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM analysis_cache')
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache effectiveness.
+        
+        Returns:
+            Dict[str, Any]: Hit/miss/eviction counters, size and hit ratio
+        """
+        with self._lock:
+            lookups = self.counters['hits'] + self.counters['disk_hits'] + self.counters['misses']
+            hit_ratio = (self.counters['hits'] + self.counters['disk_hits']) / lookups if lookups else 0.0
+            return {**self.counters, 'size': len(self._entries), 'max_entries': self.max_entries,
+                    'disk': self.path is not None, 'max_disk_entries': self.max_disk_entries,
+                    'hit_ratio': hit_ratio}
@@ -0,0 +1,105 @@
+import os
+import time
+from typing import Dict, Any, Callable, Optional
+from services.scraper import NewsScraper
+from services.analyzer import NewsAnalyzer
+from services.batch import AnalysisPool
+from services.dedup import NearDuplicateIndex
+from services.scheduler import IngestionScheduler
+from services.store import ArticleStore
+from services.trends import TrendTracker
+
+class ServiceContainer:
+    """
+    Holds the process-wide scraper and analyzer instances.
+
+    The services are built once per worker by warm_up() (called from the
+    FastAPI lifespan) so request handlers never pay for NLTK data checks,
+    lexicon loading or model unpickling. With ANALYZER_WARMUP=lazy the
+    models are loaded by the first analysis instead, so a worker that
+    mostly serves cached or stored reads boots without importing NLTK.
+    """
+
+    def __init__(self,
+                 scraper_factory: Callable[[], Any] = NewsScraper,
+                 analyzer_factory: Callable[[], Any] = NewsAnalyzer,
+                 batch_workers: Optional[int] = None,
+                 store_factory: Callable[[], Any] = ArticleStore.from_env,
+                 ingest_enabled: Optional[bool] = None,
+                 eager: Optional[bool] = None):
+        self.scraper_factory = scraper_factory
+        self.analyzer_factory = analyzer_factory
+        self.batch_workers = batch_workers
+        self.store_factory = store_factory
+        if ingest_enabled is None:
+            ingest_enabled = os.environ.get('INGEST_ENABLED', '').lower() in ('1', 'true', 'yes')
+        self.ingest_enabled = ingest_enabled
+        if eager is None:
+            eager = os.environ.get('ANALYZER_WARMUP', 'eager').lower() != 'lazy'
+        self.eager = eager
+        self.store: Optional[ArticleStore] = None
+        self.scheduler: Optional[IngestionScheduler] = None
+        self.dedup: Optional[NearDuplicateIndex] = None
+        self.trends: Optional[TrendTracker] = None
+        self.scraper: Optional[Any] = None
+        self.analyzer: Optional[Any] = None
+        self.analysis_pool: Optional[AnalysisPool] = None
+        self.ready = False
+        self.error: Optional[str] = None
+        self.warmup_seconds: Optional[float] = None
+
+    def warm_up(self) -> None:
+        """
+        Build the services and prime their models.
+
+        Failures are recorded rather than raised so the API still starts and
+        can report why it is not ready.
+        """
+        start = time.perf_counter()
+        try:
+            # Open the store first so stored reads work even if the models fail to load
+            self.store = self.store_factory()
+            self.scraper = self.scraper_factory()
+            self.analyzer = self.analyzer_factory()
+            if self.eager and hasattr(self.analyzer, 'warm_up'):
+                self.analyzer.warm_up()
+            # Batch workers are spawned, and warm their own analyzer, on first use
+            self.analysis_pool = AnalysisPool(self.batch_workers, self.analyzer_factory)
+            self.dedup = NearDuplicateIndex.from_env()
+            self.trends = TrendTracker.from_env()
+            self.scheduler = IngestionScheduler(self.scraper, self.analyzer, self.store, dedup=self.dedup,
+                                                trends=self.trends)
+            self.ready = True
+            self.error = None
+        except Exception as e:
+            self.ready = False
+            self.error = str(e)
+            print(f"Service warm-up failed: {str(e)}")
+        finally:
+            self.warmup_seconds = time.perf_counter() - start
+
+    def shutdown(self) -> None:
+        """Release the services."""
+        if self.analysis_pool is not None:
+            self.analysis_pool.shutdown()
+            self.analysis_pool = None
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        self.scheduler = None
+        self.scraper = None
+        self.analyzer = None
+        self.ready = False
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Describe the readiness of the container.
+
+        Returns:
+            Dict[str, Any]: Readiness flag, warm-up duration and last error
+        """
+        return {
+            "ready": self.ready,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error
+        }
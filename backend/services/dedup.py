@@ -0,0 +1,271 @@
+import copy
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import numpy as np
+from services.cache import AnalysisCache
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD = re.compile(r'\w+')
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles.
+
+    Each shingle is hashed with CRC32 and pushed through `num_perm` universal
+    hash functions (a*x + b mod 2^61-1) in one vectorized NumPy step; the
+    signature is the per-function minimum. Seeded, so signatures are stable
+    across processes and can be persisted.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        # a < 2^31 and x < 2^32 keep a*x + b inside uint64
+        self.a = generator.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = generator.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """CRC32 hashes of the distinct word shingles of a text."""
+        words = _WORD.findall(text.lower())
+        size = min(self.shingle_size, len(words)) or 1
+        hashes = {zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+                  for i in range(max(1, len(words) - size + 1))}
+        return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text as a uint32 array of length num_perm."""
+        shingles = self.shingles(text)
+        hashed = (np.outer(self.a, shingles) + self.b[:, None]) % _MERSENNE_PRIME
+        return (hashed & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures that clusters near-duplicate articles.
+
+    Signatures are split into `bands` bands of `rows` rows; articles sharing
+    any band bucket are candidates, and a candidate is a duplicate when the
+    estimated Jaccard similarity reaches `threshold`. A lookup touches one
+    bucket per band, so checking an article does not scan the corpus.
+    Every article belongs to the cluster of the first article it matched;
+    an article re-added with changed content is taken out of its cluster and
+    matched again, touching only its buckets and its cluster's members. With
+    a path the index is kept in SQLite and reloaded across runs; writes are
+    committed once per deduplicate() pass.
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: float = 0.8,
+                 num_perm: int = 128, bands: int = 16, shingle_size: int = 5):
+        """
+        Args:
+            path (str): SQLite file to persist the index in, None for memory only
+            threshold (float): Minimum estimated Jaccard similarity of duplicates
+            num_perm (int): Signature length, must be divisible by bands
+            bands (int): Number of LSH bands
+            shingle_size (int): Words per shingle
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.clusters: Dict[str, str] = {}
+        # Cluster representative -> members in insertion order (dict as an ordered set)
+        self.members: Dict[str, Dict[str, None]] = {}
+        self.hashes: Dict[str, Optional[str]] = {}
+        self.buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+        self.counters = {'checked': 0, 'duplicates': 0, 'seconds': 0.0}
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS dedup_index (doc_id TEXT PRIMARY KEY, '
+                             'cluster TEXT NOT NULL, signature BLOB NOT NULL, content_hash TEXT)')
+            # Indexes created before content hashes get them on the next add of each article
+            columns = [row[1] for row in self._db.execute('PRAGMA table_info(dedup_index)')]
+            if 'content_hash' not in columns:
+                self._db.execute('ALTER TABLE dedup_index ADD COLUMN content_hash TEXT')
+            self._db.execute('CREATE INDEX IF NOT EXISTS dedup_index_cluster ON dedup_index (cluster)')
+            self._db.commit()
+            for doc_id, cluster, blob, content_hash in self._db.execute(
+                    'SELECT doc_id, cluster, signature, content_hash FROM dedup_index'):
+                self._index(doc_id, cluster, np.frombuffer(blob, dtype=np.uint32), content_hash)
+
+    @classmethod
+    def from_env(cls) -> 'NearDuplicateIndex':
+        """Build an index from DEDUP_INDEX_PATH and DEDUP_THRESHOLD."""
+        return cls(path=os.environ.get('DEDUP_INDEX_PATH') or None,
+                   threshold=float(os.environ.get('DEDUP_THRESHOLD', '0.8')))
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _index(self, doc_id: str, cluster: str, signature: np.ndarray, content_hash: Optional[str]) -> None:
+        self.signatures[doc_id] = signature
+        self.clusters[doc_id] = cluster
+        self.members.setdefault(cluster, {})[doc_id] = None
+        self.hashes[doc_id] = content_hash
+        for band, key in zip(self.buckets, self._band_keys(signature)):
+            band.setdefault(key, []).append(doc_id)
+
+    def _unindex(self, doc_id: str) -> None:
+        """Remove an article from its buckets; members of its cluster move to the next oldest member."""
+        for band, key in zip(self.buckets, self._band_keys(self.signatures.pop(doc_id))):
+            band[key].remove(doc_id)
+            if not band[key]:
+                del band[key]
+        cluster = self.clusters.pop(doc_id)
+        del self.hashes[doc_id]
+        del self.members[cluster][doc_id]
+        if not self.members[cluster]:
+            del self.members[cluster]
+        if cluster != doc_id or cluster not in self.members:
+            return
+        # The remaining members still duplicate each other, not the new content
+        members = self.members.pop(cluster)
+        representative = next(iter(members))
+        for member in members:
+            self.clusters[member] = representative
+        self.members[representative] = members
+        if self._db is not None:
+            self._db.execute('UPDATE dedup_index SET cluster = ? WHERE cluster = ? AND doc_id != ?',
+                             (representative, cluster, doc_id))
+
+    def _save(self, doc_id: str) -> None:
+        if self._db is not None:
+            self._db.execute('INSERT OR REPLACE INTO dedup_index VALUES (?, ?, ?, ?)',
+                             (doc_id, self.clusters[doc_id], self.signatures[doc_id].tobytes(),
+                              self.hashes[doc_id]))
+
+    def commit(self) -> None:
+        """Write pending index changes to SQLite."""
+        if self._db is not None:
+            with self._lock:
+                self._db.commit()
+
+    def query(self, signature: np.ndarray) -> Optional[str]:
+        """Return the cluster of the most similar indexed article above threshold."""
+        candidates = set()
+        for band, key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(band.get(key, ()))
+        best, best_similarity = None, self.threshold
+        for doc_id in candidates:
+            similarity = float(np.mean(self.signatures[doc_id] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = doc_id, similarity
+        return self.clusters[best] if best is not None else None
+
+    def add(self, doc_id: str, text: str, commit: bool = True) -> Optional[str]:
+        """
+        Index an article and return the cluster it duplicates, if any.
+
+        Args:
+            doc_id (str): Article identifier, usually its URL
+            text (str): Article content
+            commit (bool): Commit to SQLite now; pass False when adding a
+                batch and call commit() once at the end
+
+        Returns:
+            Optional[str]: The representative article of its cluster, or None
+                if the article is new (it then represents its own cluster)
+        """
+        start = time.perf_counter()
+        content_hash = AnalysisCache.key({'content': text})
+        with self._lock:
+            signature = None
+            if doc_id in self.clusters and self.hashes[doc_id] != content_hash:
+                signature = self.hasher.signature(text)
+                if np.array_equal(signature, self.signatures[doc_id]):
+                    # Same shingles (or an index from before content hashes): only record the hash
+                    self.hashes[doc_id] = content_hash
+                    self._save(doc_id)
+                else:
+                    self._unindex(doc_id)
+            if doc_id in self.clusters:
+                # Re-scraped, unchanged article: keep the cluster it was assigned to
+                cluster = self.clusters[doc_id]
+                duplicate_of = cluster if cluster != doc_id else None
+            else:
+                if signature is None:
+                    signature = self.hasher.signature(text)
+                duplicate_of = self.query(signature)
+                cluster = duplicate_of or doc_id
+                self._index(doc_id, cluster, signature, content_hash)
+                self._save(doc_id)
+            self.counters['checked'] += 1
+            if duplicate_of is not None:
+                self.counters['duplicates'] += 1
+            self.counters['seconds'] += time.perf_counter() - start
+        if commit:
+            self.commit()
+        return duplicate_of
+
+    def deduplicate(self, articles: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Split articles into those that need analysis and near-duplicates.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, str]]: Unique articles, and
+                a map from each duplicate's URL to its cluster representative
+        """
+        unique, duplicates = [], {}
+        for article in articles:
+            duplicate_of = self.add(article['url'], article['content'], commit=False)
+            if duplicate_of is None:
+                unique.append(article)
+            else:
+                duplicates[article['url']] = duplicate_of
+        self.commit()
+        return unique, duplicates
+
+    def stats(self) -> Dict[str, Any]:
+        """Articles checked, analyses skipped, index size and dedup time per article."""
+        with self._lock:
+            checked = self.counters['checked']
+            return {'checked': checked, 'skipped_analyses': self.counters['duplicates'],
+                    'indexed': len(self.signatures), 'clusters': len(self.members),
+                    'ms_per_article': self.counters['seconds'] * 1000 / checked if checked else 0.0}
+
+def analyze_deduplicated(analyzer: Any, articles: List[Dict[str, Any]], index: NearDuplicateIndex,
+                         pool: Any = None,
+                         lookup: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+                         entity_mode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Analyze articles once per near-duplicate cluster.
+
+    Duplicates reuse the analysis of their cluster representative, taken from
+    this batch or from `lookup` (e.g. the article store), with their own
+    title. A duplicate whose representative is unavailable is analyzed.
+
+    Returns:
+        List[Dict[str, Any]]: One analysis per input article, in input order
+    """
+    unique, duplicates = index.deduplicate(articles)
+    analyses = {article['url']: analysis
+                for article, analysis in zip(unique, analyzer.analyze_many(unique, pool, entity_mode))}
+
+    results = []
+    for article in articles:
+        analysis = analyses.get(article['url'])
+        if analysis is None:
+            representative = duplicates.get(article['url'])
+            base = analyses.get(representative) or (lookup(representative) if lookup else None)
+            if base is None:
+                analysis = analyzer.analyze_article(article, entity_mode)
+            else:
+                analysis = {key: copy.deepcopy(base[key])
+                            for key in ('topic', 'summary', 'sentiment', 'entities')}
+                # Stored articles do not keep their keywords
+                analysis['keywords'] = list(base.get('keywords', []))
+                analysis['title'] = article['title']
+        results.append(copy.deepcopy(analysis))
+    return results
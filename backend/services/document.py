@@ -0,0 +1,53 @@
+from functools import cached_property
+from typing import List, Optional, Set, Tuple
+
+class AnalysisDocument:
+    """
+    Article text segmented and tokenized once.
+
+    NewsAnalyzer builds one document per article and hands it to every stage,
+    so sentence splitting, word tokenization, lowercasing and POS tagging each
+    happen a single time. Derived views are computed lazily and cached.
+    The tagger may be given as a zero-argument function returning it, so it
+    is only loaded when POS tags are needed.
+    """
+
+    def __init__(self, text: str, stop_words: Optional[Set[str]] = None, tagger=None):
+        from nltk.tokenize import word_tokenize, sent_tokenize
+        self.text = text
+        self.stop_words = stop_words or set()
+        self.tagger = tagger
+        self.sentences: List[str] = sent_tokenize(text)
+        # Sentences already come from punkt, so skip word_tokenize's own split
+        self.sentence_tokens: List[List[str]] = [
+            word_tokenize(sentence, preserve_line=True) for sentence in self.sentences
+        ]
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """All tokens in document order."""
+        return [token for sentence in self.sentence_tokens for token in sentence]
+
+    @cached_property
+    def lower_tokens(self) -> List[str]:
+        """Lowercased tokens in document order."""
+        return [token.lower() for token in self.tokens]
+
+    @cached_property
+    def content_words(self) -> List[str]:
+        """Lowercased alphanumeric tokens that are not stopwords."""
+        return [token for token in self.lower_tokens
+                if token.isalnum() and token not in self.stop_words]
+
+    @cached_property
+    def sentence_lengths(self) -> List[int]:
+        """Number of tokens in each sentence."""
+        return [len(tokens) for tokens in self.sentence_tokens]
+
+    @cached_property
+    def tagged_sentences(self) -> List[List[Tuple[str, str]]]:
+        """POS-tagged tokens for each sentence."""
+        if self.tagger is None:
+            raise ValueError("AnalysisDocument needs a tagger for POS tags")
+        tagger = self.tagger if hasattr(self.tagger, 'tag') else self.tagger()
+        return [tagger.tag(tokens) for tokens in self.sentence_tokens]
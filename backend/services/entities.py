@@ -0,0 +1,116 @@
+import json
+import os
+from collections import deque
+from typing import Dict, Any, Iterator, List, Tuple
+
+# Gazetteer of people and places used by the fast entity mode, overridable per deployment
+DEFAULT_GAZETTEER_PATH = os.environ.get('GAZETTEER_PATH', os.path.join(os.path.dirname(__file__), 'gazetteer.json'))
+
+# Entity extraction modes accepted by NewsAnalyzer.analyze_article
+ENTITY_MODES = ('accurate', 'fast')
+
+class TokenAutomaton:
+    """
+    Aho-Corasick automaton over token sequences.
+
+    Patterns are tuples of tokens; finditer() reports every pattern occurring
+    in a token stream in a single pass, independent of how many patterns
+    were added.
+    """
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[Tuple[int, Any]]] = [[]]
+
+    def add(self, tokens: Tuple[str, ...], value: Any) -> None:
+        """Add a pattern; call build() after the last one."""
+        state = 0
+        for token in tokens:
+            if token not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][token] = len(self.goto) - 1
+            state = self.goto[state][token]
+        self.output[state].append((len(tokens), value))
+
+    def build(self) -> None:
+        """Compute failure links breadth-first."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def finditer(self, tokens: List[str]) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (start, end, value) for every pattern occurrence."""
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            for length, value in self.output[state]:
+                yield i - length + 1, i + 1, value
+
+class Gazetteer:
+    """
+    Dictionary-based entity extractor for the fast entity mode.
+
+    Names and aliases from a gazetteer file are compiled into one
+    TokenAutomaton. Matching is case-sensitive on the article tokens and
+    keeps the leftmost-longest non-overlapping matches, so "New Delhi" wins
+    over "Delhi". Aliases are reported under their canonical name.
+    """
+
+    def __init__(self, entries: Dict[str, Any]):
+        """
+        Args:
+            entries (Dict[str, Any]): {"people": [...], "locations": [...],
+                "aliases": {alias: canonical name}}
+        """
+        self.categories = [category for category in entries if category != 'aliases']
+        self.automaton = TokenAutomaton()
+        canonical = {}
+        for category in self.categories:
+            for name in entries[category]:
+                canonical[name] = category
+                self.automaton.add(tuple(name.split()), (category, name))
+        for alias, name in entries.get('aliases', {}).items():
+            if name in canonical:
+                self.automaton.add(tuple(alias.split()), (canonical[name], name))
+        self.automaton.build()
+        self.size = len(canonical)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_GAZETTEER_PATH) -> 'Gazetteer':
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def extract(self, tokens: List[str]) -> Dict[str, List[str]]:
+        """
+        Find gazetteer entities in a token sequence.
+
+        Args:
+            tokens (List[str]): Article tokens in document order
+
+        Returns:
+            Dict[str, List[str]]: Canonical names found per category
+        """
+        matches = sorted(self.automaton.finditer(tokens), key=lambda m: (m[0], -(m[1] - m[0])))
+        found = {category: [] for category in self.categories}
+        seen = set()
+        end = 0
+        for start, stop, (category, name) in matches:
+            if start < end:
+                continue
+            end = stop
+            if name not in seen:
+                seen.add(name)
+                found[category].append(name)
+        return found
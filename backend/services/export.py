@@ -0,0 +1,271 @@
+"""
+Columnar export of analyzed articles to Parquet or Arrow IPC files.
+
+Articles are written through a streaming writer one record batch (one
+Parquet row group) at a time, and read back memory-mapped batch by batch,
+so a dump of millions of articles never has to exist as Python dicts.
+pyarrow (pinned in requirements.txt) is imported here on first use only.
+
+    python -m services.export dump articles.parquet --content
+    python -m services.export reanalyze articles.parquet reanalyzed.parquet
+"""
+import argparse
+import importlib.util
+import os
+import time
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+FORMATS = ('parquet', 'arrow')
+
+MEDIA_TYPES = {
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.file'
+}
+
+def _pyarrow():
+    if not HAS_PYARROW:
+        raise ImportError("Arrow/Parquet export needs pyarrow: pip install pyarrow")
+    import pyarrow
+    return pyarrow
+
+def format_for(path: str) -> str:
+    """'arrow' for .arrow/.feather/.ipc files, 'parquet' otherwise."""
+    return 'arrow' if os.path.splitext(path)[1].lower() in ('.arrow', '.feather', '.ipc') else 'parquet'
+
+def article_schema(content: bool = False):
+    """
+    Arrow schema of an exported article.
+
+    Entities are split into `people` and `locations` list columns so they
+    can be filtered without parsing JSON; `published` is a UTC timestamp.
+    """
+    pa = _pyarrow()
+    fields = [
+        pa.field('url', pa.string(), nullable=False),
+        pa.field('source', pa.string()),
+        pa.field('title', pa.string()),
+        pa.field('topic', pa.string()),
+        pa.field('summary', pa.string()),
+        pa.field('sentiment', pa.float64()),
+        pa.field('people', pa.list_(pa.string())),
+        pa.field('locations', pa.list_(pa.string())),
+        pa.field('published', pa.timestamp('ms', tz='UTC'))
+    ]
+    if content:
+        fields.append(pa.field('content', pa.string()))
+    return pa.schema(fields)
+
+class ArticleWriter:
+    """
+    Streaming Parquet/Arrow writer of analyzed articles.
+
+    Rows shaped like ArticleStore items are buffered and written as one
+    record batch per `batch_size` rows, so memory is bounded by one batch
+    whatever the size of the export.
+    """
+
+    def __init__(self, sink: Any, format: str = 'parquet', batch_size: int = 10000,
+                 content: bool = False, compression: Optional[str] = None):
+        """
+        Args:
+            sink: File path or writable binary file object
+            format (str): 'parquet' or 'arrow' (Arrow IPC file)
+            batch_size (int): Rows per record batch / Parquet row group
+            content (bool): Write the article text column, needed for re-analysis
+            compression (str): Codec, defaults to zstd for Parquet and none for
+                Arrow so Arrow files can be memory-mapped without copying
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format: {format}")
+        pa = _pyarrow()
+        self.format = format
+        self.batch_size = batch_size
+        self.schema = article_schema(content)
+        self.rows_written = 0
+        self._rows: List[Dict[str, Any]] = []
+        if format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(sink, self.schema, compression=compression or 'zstd')
+        else:
+            import pyarrow.ipc
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(sink, self.schema, options=options)
+
+    def __enter__(self) -> 'ArticleWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """Buffer one article, writing a batch once `batch_size` are buffered."""
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        """Write the buffered articles as one record batch."""
+        if not self._rows:
+            return
+        pa = _pyarrow()
+        rows, self._rows = self._rows, []
+        columns = {name: [row.get(name) for row in rows]
+                   for name in ('url', 'source', 'title', 'topic', 'summary', 'sentiment', 'content')}
+        columns['people'] = [list(row['entities'].get('people', [])) for row in rows]
+        columns['locations'] = [list(row['entities'].get('locations', [])) for row in rows]
+        columns['published'] = [round(row['published'] * 1000) if row.get('published') is not None else None
+                                for row in rows]
+        arrays = []
+        for field in self.schema:
+            if field.name == 'published':
+                arrays.append(pa.array(columns['published'], pa.int64()).cast(field.type))
+            else:
+                arrays.append(pa.array(columns[field.name], field.type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        """Write any buffered articles and finish the file."""
+        self.flush()
+        self._writer.close()
+
+def export_store(store: Any, sink: Any, format: str = 'parquet', batch_size: int = 10000,
+                 content: bool = False, **filters: Any) -> int:
+    """
+    Stream stored articles into a Parquet/Arrow file.
+
+    Args:
+        store (ArticleStore): Store to export from
+        sink: File path or writable binary file object
+        format (str): 'parquet' or 'arrow'
+        batch_size (int): Rows read from SQLite and written per batch
+        content (bool): Include the article text
+        **filters: topic, source, since and until as for ArticleStore.iter_rows
+
+    Returns:
+        int: Number of articles written
+    """
+    with ArticleWriter(sink, format, batch_size, content) as writer:
+        for rows in store.iter_rows(batch_size, content=content, **filters):
+            writer.write_many(rows)
+    return writer.rows_written
+
+def iter_batches(path: str, batch_size: int = 10000, columns: Optional[List[str]] = None) -> Iterator[Any]:
+    """
+    Read an export back as memory-mapped record batches.
+
+    Arrow IPC files are mapped and their batches used in place (zero-copy
+    for uncompressed files); Parquet files are mapped and decoded one
+    `batch_size` slice at a time.
+
+    Args:
+        path (str): Exported file
+        batch_size (int): Rows per Parquet batch; Arrow files keep their written batches
+        columns (List[str]): Only read these columns
+
+    Yields:
+        pyarrow.RecordBatch: The next batch of articles
+    """
+    pa = _pyarrow()
+    if format_for(path) == 'arrow':
+        import pyarrow.ipc
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                yield batch.select(columns) if columns else batch
+    else:
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(path, memory_map=True)
+        yield from parquet.iter_batches(batch_size=batch_size, columns=columns)
+
+def iter_articles(path: str, batch_size: int = 10000,
+                  columns: Optional[List[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Read an export back as lists of article dicts, one batch at a time.
+
+    Rows are shaped like ArticleStore items (entities regrouped, published
+    as Unix time), so a batch can go straight to NewsAnalyzer.analyze_many
+    when the export includes content.
+    """
+    pa = _pyarrow()
+    import pyarrow.compute as pc
+    for batch in iter_batches(path, batch_size, columns):
+        if 'published' in batch.schema.names:
+            # Unix seconds in Arrow, much cheaper than building a datetime per row
+            index = batch.schema.get_field_index('published')
+            seconds = pc.divide(batch.column(index).cast(pa.int64()), 1000.0)
+            batch = batch.set_column(index, 'published', seconds)
+        rows = batch.to_pylist()
+        for row in rows:
+            if 'people' in row or 'locations' in row:
+                row['entities'] = {'people': row.pop('people', None) or [],
+                                   'locations': row.pop('locations', None) or []}
+        yield rows
+
+def reanalyze(analyzer: Any, source: str, sink: Any, format: Optional[str] = None,
+              batch_size: int = 1000, pool: Any = None) -> int:
+    """
+    Analyze every article of an export again and write the results.
+
+    Args:
+        analyzer (NewsAnalyzer): Analyzer to run
+        source (str): Export written with content
+        sink: File path or writable binary file object for the results
+        format (str): Output format, defaults to that of `source`
+        batch_size (int): Articles analyzed and written per batch
+        pool (AnalysisPool): Optional process pool for analyze_many
+
+    Returns:
+        int: Number of articles written
+    """
+    pa = _pyarrow()
+    if 'content' not in _schema(source, pa).names:
+        raise ValueError(f"{source} was exported without content and cannot be re-analyzed")
+    with ArticleWriter(sink, format or format_for(source), batch_size, content=True) as writer:
+        for rows in iter_articles(source, batch_size):
+            for row, analysis in zip(rows, analyzer.analyze_many(rows, pool)):
+                writer.write({**row, **analysis})
+    return writer.rows_written
+
+def _schema(path: str, pa: Any):
+    if format_for(path) == 'arrow':
+        import pyarrow.ipc
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).schema
+    import pyarrow.parquet as pq
+    return pq.read_schema(path, memory_map=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    dump = commands.add_parser('dump', help='export the article store')
+    dump.add_argument('output')
+    dump.add_argument('--content', action='store_true', help='include article text for re-analysis')
+    dump.add_argument('--topic')
+    dump.add_argument('--source')
+    dump.add_argument('--batch-size', type=int, default=10000)
+    again = commands.add_parser('reanalyze', help='analyze an export with content again')
+    again.add_argument('input')
+    again.add_argument('output')
+    again.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'dump':
+        from services.store import ArticleStore
+        count = export_store(ArticleStore.from_env(), args.output, format_for(args.output), args.batch_size,
+                             args.content, topic=args.topic, source=args.source)
+    else:
+        from services.analyzer import NewsAnalyzer
+        count = reanalyze(NewsAnalyzer(), args.input, args.output, format_for(args.output), args.batch_size)
+    print(f"Wrote {count} articles to {args.output} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == '__main__':
+    main()
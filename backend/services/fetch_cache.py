@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Callable, Optional
+from services.parsers import detect_encoding
+
+class FetchCache:
+    """
+    Persistent per-URL cache of response validators and extracted data.
+
+    For every fetched URL it remembers the ETag/Last-Modified validators, a
+    hash of the response body and whatever was extracted from it (article
+    title and content, or front-page links). Callers send the validators as
+    a conditional request; a 304 response or an unchanged body hash returns
+    the stored extraction without parsing the HTML again.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Args:
+            path (str): SQLite file to store entries in, ':memory:' for none
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS fetch_cache ('
+            'url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, '
+            'content_hash TEXT NOT NULL, data TEXT, fetched REAL NOT NULL)'
+        )
+        self._db.commit()
+        self.counters = {'not_modified': 0, 'unchanged': 0, 'parsed': 0}
+
+    @classmethod
+    def from_env(cls) -> Optional['FetchCache']:
+        """Build a cache stored at FETCH_CACHE_PATH, or None if it is unset."""
+        path = os.environ.get('FETCH_CACHE_PATH')
+        return cls(path) if path else None
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for a URL, or None."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT etag, last_modified, content_hash, data, fetched FROM fetch_cache WHERE url = ?',
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'content_hash': row[2],
+                'data': json.loads(row[3]), 'fetched': row[4]}
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Return If-None-Match/If-Modified-Since headers for a known URL."""
+        entry = self.get(url)
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def extract(self, url: str, response: Any, parse: Callable[[bytes, str], Any]) -> Any:
+        """
+        Return the extraction for a response, parsing only when needed.
+        
+        Args:
+            url (str): The requested URL
+            response: A requests or httpx response to a (conditional) GET
+            parse (Callable[[bytes, str], Any]): Extracts JSON-serializable data
+                from the response body and its encoding
+            
+        Returns:
+            Any: The stored or freshly parsed extraction
+        """
+        entry = self.get(url)
+        if response.status_code == 304:
+            if entry is None:
+                raise Exception(f"Got 304 for {url} without a cached copy")
+            self.counters['not_modified'] += 1
+            self._touch(url)
+            return entry['data']
+        
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if entry is not None and entry['content_hash'] == content_hash:
+            self.counters['unchanged'] += 1
+            self._store(url, response, content_hash, entry['data'])
+            return entry['data']
+        
+        data = parse(response.content, detect_encoding(response.content, response.headers.get('Content-Type')))
+        self.counters['parsed'] += 1
+        self._store(url, response, content_hash, data)
+        return data
+
+    def _store(self, url: str, response: Any, content_hash: str, data: Any) -> None:
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO fetch_cache (url, etag, last_modified, content_hash, data, fetched) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                 content_hash, json.dumps(data), time.time())
+            )
+            self._db.commit()
+
+    def _touch(self, url: str) -> None:
+        with self._lock:
+            self._db.execute('UPDATE fetch_cache SET fetched = ? WHERE url = ?', (time.time(), url))
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report how often parsing was skipped.
+        
+        Returns:
+            Dict[str, Any]: 304, unchanged-body and parsed counters plus entry count
+        """
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM fetch_cache').fetchone()[0]
+        return {**self.counters, 'entries': entries}
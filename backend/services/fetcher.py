@@ -0,0 +1,122 @@
+import asyncio
+import time
+from typing import Dict, Any, Optional
+import httpx
+from services.resilience import CircuitBreaker, HostControl, HostControls
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class AsyncFetcher:
+    """
+    Asynchronous HTTP fetcher shared by all scraping tasks.
+
+    Wraps one pooled httpx.AsyncClient and adds timeouts, bounded retries
+    with exponential backoff, and the per-host controls: a token-bucket rate
+    limit, an adaptive concurrency limit and a circuit breaker. Pass the
+    scraper's HostControls so that state outlives the fetcher. Use it as an
+    async context manager so the connection pool is closed afterwards.
+    """
+
+    def __init__(self,
+                 max_connections: int = 20,
+                 per_host_limit: int = 4,
+                 timeout: float = 10.0,
+                 retries: int = 2,
+                 backoff: float = 0.5,
+                 headers: Optional[Dict[str, str]] = None,
+                 controls: Optional[HostControls] = None):
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        # per_host_limit is the starting concurrency when no shared controls are given
+        self.controls = controls if controls is not None else HostControls(concurrency=per_host_limit)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = headers or DEFAULT_HEADERS
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> 'AsyncFetcher':
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.client.aclose()
+        self.client = None
+
+    async def fetch(self, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Fetch a URL, retrying transient failures.
+
+        Args:
+            url (str): The URL to fetch
+            **kwargs: Extra arguments passed to httpx.AsyncClient.get
+
+        Returns:
+            httpx.Response: The successful response
+
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries
+            CircuitOpenError: If the host's circuit is open
+        """
+        control = self.controls.get(url)
+        control.check()
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(control, url, **kwargs)
+                if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                    raise httpx.HTTPStatusError(f"Retryable status {response.status_code}",
+                                                request=response.request, response=response)
+                # 304 answers a conditional request and is handled by the caller
+                if response.status_code != 304:
+                    response.raise_for_status()
+                control.succeeded()
+                return response
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = (isinstance(e, httpx.TransportError)
+                             or e.response.status_code in RETRY_STATUSES)
+                if not retryable:
+                    # The host answered; a 404 is not a reason to trip its circuit
+                    control.succeeded()
+                    raise
+                # Stop retrying once other requests have tripped the circuit
+                if attempt >= self.retries or control.breaker.state == CircuitBreaker.OPEN:
+                    control.failed(e)
+                    raise
+                await asyncio.sleep(self._retry_delay(e, attempt))
+                attempt += 1
+
+    async def _send(self, control: HostControl, url: str, **kwargs: Any) -> httpx.Response:
+        """Send one request within the host's rate and concurrency limits."""
+        await asyncio.sleep(control.bucket.reserve())
+        await control.limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(url, **kwargs)
+        except httpx.TransportError as e:
+            control.observe(time.perf_counter() - start, error=e)
+            raise
+        finally:
+            control.limiter.release()
+        control.observe(time.perf_counter() - start, response.status_code)
+        return response
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Exponential backoff, or the server's Retry-After (capped at the timeout) if longer."""
+        delay = self.backoff * (2 ** attempt)
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = error.response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), self.timeout))
+        return delay
@@ -0,0 +1,138 @@
+"""
+Vendored NLTK data bundle.
+
+The analyzer's NLTK resources are installed into one directory at build
+time and verified there; nothing is downloaded at runtime.
+
+    python -m services.nltk_data fetch    # build step: download, fail unless it matches the lock file
+                                          # (the first fetch, with no lock file yet, writes it)
+    python -m services.nltk_data verify   # build/CI step: fail if anything is missing or changed
+    python -m services.nltk_data lock     # after a deliberate upgrade: rewrite the lock file
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List
+
+DEFAULT_NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'nltk_data')
+
+# Bundle directory: the first entry of NLTK_DATA, which nltk reads as an os.pathsep-separated list
+NLTK_DATA_DIR = os.environ.get('NLTK_DATA', '').split(os.pathsep)[0] or DEFAULT_NLTK_DATA_DIR
+
+# Committed checksums of the bundle files, written by `lock` (or the first `fetch`) and checked
+# by `fetch` and `verify` wherever the bundle is installed
+LOCK_FILE = os.path.join(DEFAULT_NLTK_DATA_DIR, 'bundle.lock.json')
+
+# NLTK resources used by the analyzer, keyed by package name with the path
+# nltk.data.find expects for each one.
+NLTK_RESOURCES = {
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'maxent_ne_chunker': 'chunkers/maxent_ne_chunker',
+    'words': 'corpora/words'
+}
+
+def use_bundle() -> None:
+    """Make nltk search the bundle first. Imports nltk, so call it on first use."""
+    import nltk
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+
+def _installed(path: str) -> bool:
+    """True if a resource is unpacked or zipped in the bundle, without importing nltk."""
+    return os.path.exists(os.path.join(NLTK_DATA_DIR, path)) or os.path.exists(
+        os.path.join(NLTK_DATA_DIR, path[:-len('.zip')] if path.endswith('.zip') else path + '.zip'))
+
+def missing_resources(resources: Dict[str, str] = NLTK_RESOURCES) -> List[str]:
+    """Packages of `resources` that are not in the bundle."""
+    return [package for package, path in resources.items() if not _installed(path)]
+
+def require_nltk_resources(resources: Dict[str, str] = NLTK_RESOURCES) -> None:
+    """Raise LookupError naming any resource missing from the bundle."""
+    missing = missing_resources(resources)
+    if missing:
+        raise LookupError(f"NLTK data missing from {NLTK_DATA_DIR}: {', '.join(missing)}. "
+                          f"Build the bundle with `python -m services.nltk_data fetch`")
+
+def _checksums() -> Dict[str, str]:
+    checksums = {}
+    for root, _, files in os.walk(NLTK_DATA_DIR):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, NLTK_DATA_DIR)
+            if path == LOCK_FILE or relative == os.path.basename(LOCK_FILE):
+                continue
+            with open(path, 'rb') as f:
+                checksums[relative] = hashlib.sha256(f.read()).hexdigest()
+    return dict(sorted(checksums.items()))
+
+def fetch(resources: Dict[str, str] = NLTK_RESOURCES, lock_file: str = LOCK_FILE) -> List[str]:
+    """
+    Download the resources into the bundle and check them against the lock file.
+
+    With no lock file yet, the download is trusted and its checksums are
+    written to `lock_file`, to be committed so later fetches are pinned.
+
+    Returns:
+        List[str]: Problems found by verify(), empty if the download matches the lock
+    """
+    import nltk
+    os.makedirs(NLTK_DATA_DIR, exist_ok=True)
+    for package in resources:
+        if not nltk.download(package, download_dir=NLTK_DATA_DIR, quiet=True):
+            raise Exception(f"Failed to download NLTK package {package}")
+    if not os.path.exists(lock_file):
+        lock(lock_file)
+        print(f"Wrote {lock_file}, commit it to pin the bundle")
+    return verify(resources, lock_file)
+
+def lock(lock_file: str = LOCK_FILE) -> None:
+    """Record the checksums of the current bundle; commit the result."""
+    with open(lock_file, 'w') as f:
+        json.dump(_checksums(), f, indent=2)
+        f.write('\n')
+
+def verify(resources: Dict[str, str] = NLTK_RESOURCES, lock_file: str = LOCK_FILE) -> List[str]:
+    """
+    Check the bundle against the resource list and the committed lock file.
+
+    Returns:
+        List[str]: Problems found, empty if the bundle is complete and unchanged
+    """
+    problems = [f"missing package {package}" for package in missing_resources(resources)]
+    if not os.path.exists(lock_file):
+        return problems + [f"missing lock file {lock_file}, create it with `python -m services.nltk_data lock`"]
+    with open(lock_file) as f:
+        expected = json.load(f)
+    actual = _checksums()
+    for path, checksum in expected.items():
+        if path not in actual:
+            problems.append(f"missing file {path}")
+        elif actual[path] != checksum:
+            problems.append(f"checksum mismatch for {path}")
+    for path in actual.keys() - expected.keys():
+        problems.append(f"file not in lock {path}")
+    return sorted(problems)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['fetch', 'verify', 'lock'])
+    args = parser.parse_args()
+
+    if args.command == 'lock':
+        lock()
+        print(f"Wrote {LOCK_FILE}")
+        return
+    problems = fetch() if args.command == 'fetch' else verify()
+    for problem in problems:
+        print(problem)
+    if problems:
+        sys.exit(1)
+    print(f"NLTK bundle at {NLTK_DATA_DIR} is complete")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+import codecs
+import importlib.util
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+# Backends are imported when a parser is first used; lxml and selectolax are optional
+HAS_LXML = _installed('lxml')
+HAS_SELECTOLAX = _installed('selectolax')
+
+_CHARSET_HEADER = re.compile(r'charset=["\']?([\w.:-]+)', re.I)
+_CHARSET_META = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.I)
+# Last compound of a CSS selector, e.g. "h1.title" in ".main h1.title"
+_COMPOUND = re.compile(r'^([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)$')
+
+def detect_encoding(body: bytes, content_type: Optional[str] = None) -> str:
+    """
+    Pick the encoding of an HTML response body.
+
+    Uses the Content-Type charset, then a <meta charset> in the first 2KB,
+    and falls back to UTF-8.
+    """
+    for match in (_CHARSET_HEADER.search(content_type or ''), _CHARSET_META.search(body[:2048])):
+        if match:
+            name = match.group(1)
+            name = name.decode('ascii', 'ignore') if isinstance(name, bytes) else name
+            try:
+                return codecs.lookup(name).name
+            except LookupError:
+                continue
+    return 'utf-8'
+
+def _last_compounds(selector: str) -> List[str]:
+    """Return the last compound of each comma-separated selector."""
+    return [part.split()[-1] for part in selector.split(',') if part.split()]
+
+def _markers(selector: str) -> Optional[List[bytes]]:
+    """
+    Byte strings one of which must appear in a page before `selector` can
+    match: the classes or id of each last compound, else its tag. None if a
+    compound has other parts (attributes, pseudo-classes).
+    """
+    markers = []
+    for compound in _last_compounds(selector):
+        match = _COMPOUND.match(compound)
+        if not match:
+            return None
+        names = re.findall(r'[.#]([\w-]+)', match.group(2))
+        markers.append(names[0].encode('utf-8') if names else b'<' + match.group(1).lower().encode('utf-8'))
+    return markers
+
+def _release(root: Any) -> None:
+    """
+    Free the nodes of a tree built by an lxml pull parser now. The parser sits
+    in a reference cycle that keeps its document alive until the next garbage
+    collection, which lets discarded pages pile up under load.
+    """
+    root.clear()
+
+def _complete(element: Any) -> bool:
+    """True once an incremental parse has moved past an element, i.e. it or an ancestor has a next sibling."""
+    while element is not None:
+        if element.getnext() is not None:
+            return True
+        element = element.getparent()
+    return False
+
+class BeautifulSoupParser:
+    """
+    BeautifulSoup backend.
+
+    With `partial` enabled only elements that can match the configured
+    selectors are built, via a SoupStrainer derived from the last compound
+    of each selector (tag, classes, id). Ancestor parts of descendant
+    selectors cannot be checked on the strained tree and are ignored.
+    """
+
+    def __init__(self, features: str = 'html.parser', partial: bool = False):
+        self.features = features
+        self.partial = partial
+        self.name = f"bs4-{features}" + ('-partial' if partial else '')
+
+    def _strainer(self, selectors: List[str]):
+        from bs4 import SoupStrainer
+        rules = []
+        for compound in selectors:
+            match = _COMPOUND.match(compound)
+            if not match:
+                return None  # Attribute or pseudo selectors: parse everything
+            tag = match.group(1)
+            parts = re.findall(r'([.#])([\w-]+)', match.group(2))
+            classes = {value for kind, value in parts if kind == '.'}
+            ids = {value for kind, value in parts if kind == '#'}
+            rules.append((tag, classes, ids))
+
+        def matches(name, attrs):
+            attrs = attrs or {}
+            element_classes = attrs.get('class') or ''
+            if isinstance(element_classes, str):
+                element_classes = element_classes.split()
+            element_classes = set(element_classes)
+            element_id = attrs.get('id')
+            return any((tag is None or tag == name)
+                       and classes <= element_classes
+                       and (not ids or element_id in ids)
+                       for tag, classes, ids in rules)
+        return SoupStrainer(matches)
+
+    def _soup(self, body: bytes, encoding: str, selectors: List[str] = None) -> Tuple[Any, bool]:
+        from bs4 import BeautifulSoup
+        strainer = self._strainer(selectors) if self.partial and selectors else None
+        soup = BeautifulSoup(body, self.features, from_encoding=encoding, parse_only=strainer)
+        return soup, strainer is not None
+
+    def article_links(self, body: bytes, encoding: str, config: Dict[str, str]) -> List[str]:
+        selector = config['article_selector']
+        soup, strained = self._soup(body, encoding, _last_compounds(selector))
+        if strained:
+            selector = ', '.join(_last_compounds(selector))
+        links = []
+        for element in soup.select(selector):
+            link = element.find('a')
+            if link and link.get('href'):
+                links.append(link['href'])
+        return links
+
+    def article(self, body: bytes, encoding: str, config: Dict[str, str] = None) -> Tuple[str, str]:
+        title_selector = config['title_selector'] if config else ''
+        content_selector = config['content_selector'] if config else ''
+        selectors = (_last_compounds(title_selector) + _last_compounds(content_selector)
+                     + ['h1', 'h2'])
+        soup, strained = self._soup(body, encoding, selectors)
+        if strained:
+            title_selector = ', '.join(_last_compounds(title_selector))
+            content_selector = ', '.join(_last_compounds(content_selector))
+
+        # Extract title
+        title = ''
+        if title_selector:
+            title_elem = soup.select_one(title_selector)
+            if title_elem:
+                title = title_elem.get_text().strip()
+
+        if not title:
+            title_tags = ['h1', 'h2']
+            for tag in title_tags:
+                title_elem = soup.find(tag)
+                if title_elem:
+                    title = title_elem.get_text().strip()
+                    break
+
+        # Extract content
+        content = ''
+        if content_selector:
+            content_elem = soup.select_one(content_selector)
+            if content_elem:
+                # Remove script and style elements
+                for elem in content_elem(['script', 'style']):
+                    elem.decompose()
+                content = content_elem.get_text().strip()
+
+        if not content:
+            # Fallback to paragraphs, which a strained parse did not keep
+            if strained:
+                from bs4 import BeautifulSoup, SoupStrainer
+                soup = BeautifulSoup(body, self.features, from_encoding=encoding,
+                                     parse_only=SoupStrainer('p'))
+            paragraphs = soup.find_all('p')
+            content = ' '.join([p.get_text().strip() for p in paragraphs])
+
+        return title, content
+
+class LxmlParser:
+    """
+    lxml.html backend using cssselect for the configured selectors.
+
+    With `partial` enabled, article pages are fed to an incremental parser
+    in growing chunks and parsing stops once the title and content elements
+    are complete (the parser has moved past them), so the comments, related
+    links and scripts after them are never parsed. Selectors with
+    pseudo-classes, missing or empty matches parse the whole page, with the
+    same result as the full backend.
+    """
+
+    def __init__(self, partial: bool = False, chunk_size: int = 16384):
+        self.partial = partial
+        self.chunk_size = chunk_size
+        self.name = 'lxml-partial' if partial else 'lxml'
+
+    def _tree(self, body: bytes, encoding: str):
+        import lxml.html
+        parser = lxml.html.HTMLParser(encoding=encoding)
+        return lxml.html.document_fromstring(body, parser=parser)
+
+    def article_links(self, body: bytes, encoding: str, config: Dict[str, str]) -> List[str]:
+        links = []
+        for element in self._tree(body, encoding).cssselect(config['article_selector']):
+            link = next(element.iter('a'), None)
+            if link is not None and link.get('href'):
+                links.append(link.get('href'))
+        return links
+
+    def _streamed_article(self, body: bytes, encoding: str, config: Dict[str, str]) -> Tuple[str, str, Any]:
+        """
+        Parse until the title and content elements are complete.
+
+        Returns:
+            Tuple[str, str, Any]: (title, content, None) on an early stop, else
+                ('', '', tree) with the whole page parsed
+        """
+        from lxml import etree
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+        selectors = [CSSSelector(config['title_selector'] or 'h1', translator='html'),
+                     CSSSelector(config['content_selector'], translator='html')]
+        markers = [_markers(config['title_selector'] or 'h1'), _markers(config['content_selector'])]
+        # Only the <html> start event is reported; matching runs in libxml2 on the partial tree
+        parser = etree.HTMLPullParser(events=('start',), tag='html', encoding=encoding)
+        parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        root = None
+        found = [None, None]
+        offset, size = 0, self.chunk_size
+        while offset < len(body):
+            parser.feed(body[offset:offset + size])
+            offset, size = offset + size, size * 2
+            if root is None:
+                root = next((element for _, element in parser.read_events()), None)
+                if root is None:
+                    continue
+            for i, selector in enumerate(selectors):
+                # A first match in document order stays first, so each selector finds it once.
+                # Until one of its markers has been fed it cannot match, and is not run
+                if found[i] is None and (markers[i] is None
+                                         or any(body.find(marker, 0, offset) >= 0 for marker in markers[i])):
+                    found[i] = next(iter(selector(root)), None)
+            if not all(element is not None and _complete(element) for element in found):
+                continue
+            title = found[0].text_content().strip()
+            for elem in list(found[1].iter('script', 'style')):
+                elem.drop_tree()
+            content = found[1].text_content().strip()
+            if title and content:
+                # Closing also frees the parser's input buffers, which the cycle would keep
+                _release(root)
+                parser.close()
+                return title, content, None
+            # Empty matches fall back to h1/h2 and paragraphs anywhere on the page
+            parser.feed(body[offset:])
+            break
+        return '', '', parser.close()
+
+    def article(self, body: bytes, encoding: str, config: Dict[str, str] = None) -> Tuple[str, str]:
+        # Pseudo-classes like :last-child can depend on the rest of the page
+        if self.partial and config and config['content_selector'] and body and not body.isspace() and \
+                ':' not in config['title_selector'] + config['content_selector']:
+            title, content, tree = self._streamed_article(body, encoding, config)
+            if tree is not None:
+                title, content = self._article_from_tree(tree, config)
+                _release(tree)
+            return title, content
+        return self._article_from_tree(self._tree(body, encoding), config)
+
+    def _article_from_tree(self, tree: Any, config: Optional[Dict[str, str]]) -> Tuple[str, str]:
+        title = ''
+        if config and config['title_selector']:
+            found = tree.cssselect(config['title_selector'])
+            if found:
+                title = found[0].text_content().strip()
+        if not title:
+            for tag in ('h1', 'h2'):
+                title_elem = next(tree.iter(tag), None)
+                if title_elem is not None:
+                    title = title_elem.text_content().strip()
+                    break
+
+        content = ''
+        if config and config['content_selector']:
+            found = tree.cssselect(config['content_selector'])
+            if found:
+                content_elem = found[0]
+                for elem in list(content_elem.iter('script', 'style')):
+                    elem.drop_tree()
+                content = content_elem.text_content().strip()
+        if not content:
+            content = ' '.join(p.text_content().strip() for p in tree.iter('p'))
+
+        return title, content
+
+class SelectolaxParser:
+    """selectolax (lexbor) backend."""
+
+    name = 'selectolax'
+
+    def _tree(self, body: bytes, encoding: str):
+        from selectolax.lexbor import LexborHTMLParser
+        # lexbor reads bytes as UTF-8; decode anything else ourselves
+        if encoding != 'utf-8':
+            body = body.decode(encoding, 'replace')
+        return LexborHTMLParser(body)
+
+    def article_links(self, body: bytes, encoding: str, config: Dict[str, str]) -> List[str]:
+        links = []
+        for element in self._tree(body, encoding).css(config['article_selector']):
+            link = element.css_first('a')
+            if link is not None and link.attributes.get('href'):
+                links.append(link.attributes['href'])
+        return links
+
+    def article(self, body: bytes, encoding: str, config: Dict[str, str] = None) -> Tuple[str, str]:
+        tree = self._tree(body, encoding)
+
+        title = ''
+        if config and config['title_selector']:
+            title_elem = tree.css_first(config['title_selector'])
+            if title_elem is not None:
+                title = title_elem.text().strip()
+        if not title:
+            for tag in ('h1', 'h2'):
+                title_elem = tree.css_first(tag)
+                if title_elem is not None:
+                    title = title_elem.text().strip()
+                    break
+
+        content = ''
+        if config and config['content_selector']:
+            content_elem = tree.css_first(config['content_selector'])
+            if content_elem is not None:
+                for elem in content_elem.css('script, style'):
+                    elem.decompose()
+                content = content_elem.text().strip()
+        if not content:
+            content = ' '.join(p.text().strip() for p in tree.css('p'))
+
+        return title, content
+
+def available_parsers() -> List[str]:
+    """Names of the parser backends usable in this environment."""
+    names = ['html.parser', 'html.parser-partial']
+    if HAS_LXML:
+        names += ['lxml', 'lxml-partial', 'bs4-lxml', 'bs4-lxml-partial']
+    if HAS_SELECTOLAX:
+        names.append('selectolax')
+    return names
+
+def get_parser(name: str) -> Any:
+    """
+    Build a parser backend by name.
+
+    Args:
+        name (str): One of available_parsers()
+
+    Returns:
+        Any: Parser exposing article_links() and article()
+    """
+    if name in ('html.parser', 'html.parser-partial'):
+        return BeautifulSoupParser('html.parser', partial=name.endswith('-partial'))
+    if name in ('bs4-lxml', 'bs4-lxml-partial') and HAS_LXML:
+        return BeautifulSoupParser('lxml', partial=name.endswith('-partial'))
+    if name in ('lxml', 'lxml-partial') and HAS_LXML:
+        return LxmlParser(partial=name.endswith('-partial'))
+    if name == 'selectolax' and HAS_SELECTOLAX:
+        return SelectolaxParser()
+    raise ValueError(f"Parser backend '{name}' is not available, choose from {available_parsers()}")
@@ -0,0 +1,290 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Deque, Optional
+from urllib.parse import urlsplit
+
+# Responses that mean the host is overloaded or failing rather than the request being wrong
+FAILURE_STATUSES = {429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+class TokenBucket:
+    """
+    Token-bucket rate limit: `rate` requests per second with bursts of up to
+    `burst`.
+
+    reserve() takes a token and returns how long the caller must wait before
+    using it, so the same bucket serves the async fetcher (asyncio.sleep)
+    and the synchronous scraper (time.sleep).
+    """
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, returning the seconds to wait until it is available."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is a queue of reservations paid back at `rate`
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to a host's responses (AIMD).
+
+    Every response without trouble raises the limit by 1/limit (about one
+    slot per round of requests) up to `maximum`. A throttling or failing
+    response (429/5xx, timeout), or a recent latency more than
+    `latency_factor` times the host's baseline, multiplies it by `decrease`
+    down to `minimum`. The baseline follows the fastest latencies seen and
+    drifts up slowly if the host gets permanently slower; baselines under
+    `latency_floor` count as the floor so jitter on fast hosts is ignored.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 8,
+                 latency_factor: float = 2.0, decrease: float = 0.5, latency_floor: float = 0.05):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_factor = latency_factor
+        self.decrease = decrease
+        self.latency_floor = latency_floor
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self.recent: Optional[float] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        # A threading lock, not asyncio primitives: the limiter outlives event loops
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        while True:
+            with self._lock:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                future = asyncio.get_running_loop().create_future()
+                self._waiters.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    if future in self._waiters:
+                        self._waiters.remove(future)
+                    else:
+                        # Pass on the wake-up this waiter received
+                        self._wake()
+                raise
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            future = self._waiters.popleft()
+            future.get_loop().call_soon_threadsafe(_resolve, future)
+            free -= 1
+
+    def record(self, latency: float, throttled: bool = False) -> None:
+        """Adjust the limit after a response that took `latency` seconds."""
+        with self._lock:
+            self.recent = latency if self.recent is None else 0.7 * self.recent + 0.3 * latency
+            self.baseline = latency if self.baseline is None else min(latency, 0.95 * self.baseline + 0.05 * latency)
+            if throttled or self.recent > self.latency_factor * max(self.baseline, self.latency_floor):
+                self.limit = max(self.minimum, self.limit * self.decrease)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake()
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+class CircuitBreaker:
+    """
+    Stops requests to a host after `failure_threshold` consecutive failures.
+
+    The circuit stays open for `reset_timeout` seconds, then lets a single
+    probe through (half-open); its success closes the circuit and its
+    failure opens it again. A probe that never reports back is replaced
+    after another `reset_timeout`.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a request may be sent now."""
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and (not self._probing
+                                                 or self.clock() - self._probe_started >= self.reset_timeout):
+                self._probing = True
+                self._probe_started = self.clock()
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                # Late failures of requests sent before the trip do not extend it
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    self.opened_at = self.clock()
+                self.state = self.OPEN
+                self._probing = False
+
+class HostControl:
+    """Rate limit, adaptive concurrency limit and circuit breaker of one host, plus its counters."""
+
+    def __init__(self, host: str, bucket: TokenBucket, limiter: AdaptiveLimiter, breaker: CircuitBreaker):
+        self.host = host
+        self.bucket = bucket
+        self.limiter = limiter
+        self.breaker = breaker
+        self.counters = {'requests': 0, 'failures': 0, 'throttled': 0, 'rejected': 0}
+        self.latency: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_success: Optional[float] = None
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if the host's circuit does not allow a request now."""
+        if not self.breaker.allow():
+            self.counters['rejected'] += 1
+            raise CircuitOpenError(f"Circuit open for {self.host}, retrying in {self.breaker.retry_in():.0f}s")
+
+    def observe(self, latency: float, status: Optional[int] = None, error: Optional[Exception] = None) -> None:
+        """Record one response (or transport error) for the limiter and counters."""
+        throttled = error is not None or status in FAILURE_STATUSES
+        self.counters['requests'] += 1
+        if throttled:
+            self.counters['throttled'] += 1
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        self.limiter.record(latency, throttled)
+
+    def succeeded(self) -> None:
+        """Record a fetch that the host answered properly, even if with a client error."""
+        self.breaker.record_success()
+        self.last_success = time.time()
+
+    def failed(self, error: Exception) -> None:
+        """Record a fetch that still failed after its retries."""
+        self.counters['failures'] += 1
+        self.last_error = str(error)
+        self.breaker.record_failure()
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            'host': self.host,
+            'state': self.breaker.state,
+            'retry_in': round(self.breaker.retry_in(), 1),
+            'concurrency_limit': int(self.limiter.limit),
+            'in_flight': self.limiter.in_flight,
+            'rate': self.bucket.rate,
+            'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None,
+            **self.counters,
+            'consecutive_failures': self.breaker.failures,
+            'trips': self.breaker.trips,
+            'last_error': self.last_error,
+            'last_success': self.last_success
+        }
+
+class HostControls:
+    """
+    Per-host HostControl registry shared by every fetch of a scraper.
+
+    The scraper owns one registry for its lifetime, so rate limits, learned
+    concurrency limits and open circuits carry over between requests and
+    ingestion runs.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: float = 20.0, concurrency: int = 4,
+                 max_concurrency: int = 8, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate (float): Requests per second allowed per host
+            burst (float): Requests a host may receive at once before `rate` applies
+            concurrency (int): Initial concurrent requests per host
+            max_concurrency (int): Highest concurrency the limiter may grow to
+            failure_threshold (int): Consecutive failed fetches that open a host's circuit
+            reset_timeout (float): Seconds an open circuit waits before a probe
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_concurrency = max(max_concurrency, concurrency)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.hosts: Dict[str, HostControl] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'HostControls':
+        """Build controls from the SCRAPER_HOST_* and SCRAPER_BREAKER_* variables."""
+        return cls(rate=float(os.environ.get('SCRAPER_HOST_RATE', '10')),
+                   burst=float(os.environ.get('SCRAPER_HOST_BURST', '20')),
+                   concurrency=int(os.environ.get('SCRAPER_HOST_CONCURRENCY', '4')),
+                   max_concurrency=int(os.environ.get('SCRAPER_HOST_MAX_CONCURRENCY', '8')),
+                   failure_threshold=int(os.environ.get('SCRAPER_BREAKER_FAILURES', '5')),
+                   reset_timeout=float(os.environ.get('SCRAPER_BREAKER_RESET', '30')))
+
+    def get(self, url: str) -> HostControl:
+        """The control of the URL's host, created on first use."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostControl(
+                    host,
+                    TokenBucket(self.rate, self.burst, self.clock),
+                    AdaptiveLimiter(self.concurrency, maximum=self.max_concurrency),
+                    CircuitBreaker(self.failure_threshold, self.reset_timeout, self.clock))
+            return self.hosts[host]
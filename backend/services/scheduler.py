@@ -0,0 +1,105 @@
+import asyncio
+import os
+import time
+from typing import Dict, Any, List, Optional
+from fastapi.concurrency import run_in_threadpool
+from services.dedup import NearDuplicateIndex, analyze_deduplicated
+from services.fetcher import AsyncFetcher
+from services.store import ArticleStore
+from services.trends import TrendTracker
+
+class IngestionScheduler:
+    """
+    Background poller that keeps the ArticleStore up to date.
+
+    Each entry in NewsScraper.news_sources is polled on its own interval
+    (its 'interval' key, or the scheduler default). New or changed articles
+    are analyzed off the event loop and written to the store; articles
+    already stored with the same content are skipped, and near-duplicates
+    of articles already seen reuse their cluster's analysis. The keywords
+    of newly stored articles feed the trend statistics.
+    """
+
+    def __init__(self, scraper: Any, analyzer: Any, store: ArticleStore,
+                 default_interval: Optional[float] = None, pool: Any = None,
+                 dedup: Optional[NearDuplicateIndex] = None, trends: Optional[TrendTracker] = None):
+        self.scraper = scraper
+        self.analyzer = analyzer
+        self.store = store
+        self.pool = pool
+        self.dedup = dedup
+        self.trends = trends
+        self.default_interval = default_interval or float(os.environ.get('INGEST_INTERVAL', '300'))
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.state: Dict[str, Dict[str, Any]] = {}
+
+    def interval(self, source: str) -> float:
+        return float(self.scraper.news_sources[source].get('interval', self.default_interval))
+
+    async def ingest_source(self, source: str, fetcher: Optional[AsyncFetcher] = None) -> int:
+        """
+        Scrape, analyze and store one source once.
+
+        Args:
+            source (str): Source identifier
+            fetcher (AsyncFetcher): Open fetcher to use; a new one is opened if omitted
+
+        Returns:
+            int: Number of articles analyzed and stored
+        """
+        if fetcher is None:
+            async with self.scraper.fetcher() as fetcher:
+                return await self.ingest_source(source, fetcher)
+
+        state = self.state.setdefault(source, {'runs': 0, 'stored': 0})
+        start = time.time()
+        try:
+            articles = await self.scraper.scrape_source_async(source, fetcher)
+            fresh = [article for article in articles if not self.store.is_current(article)]
+            analyses = await run_in_threadpool(self._analyze, fresh)
+            for article, analysis in zip(fresh, analyses):
+                # Count keywords once per URL, not again when a story is updated
+                if self.trends is not None and self.store.get(article['url']) is None:
+                    self.trends.add(analysis['topic'], analysis.get('keywords', []))
+                self.store.upsert(source, article, analysis)
+            state.update(last_error=None, last_count=len(fresh))
+            state['stored'] += len(fresh)
+            return len(fresh)
+        except Exception as e:
+            state.update(last_error=str(e), last_count=0)
+            print(f"Ingestion of {source} failed: {str(e)}")
+            return 0
+        finally:
+            state['runs'] += 1
+            state['last_run'] = start
+            state['last_duration'] = time.time() - start
+
+    def _analyze(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.dedup is None:
+            return list(self.analyzer.analyze_many(articles, self.pool))
+        return analyze_deduplicated(self.analyzer, articles, self.dedup, self.pool, self.store.get)
+
+    async def _poll(self, source: str) -> None:
+        async with self.scraper.fetcher() as fetcher:
+            while True:
+                await self.ingest_source(source, fetcher)
+                await asyncio.sleep(self.interval(source))
+
+    def start(self) -> None:
+        """Start one polling task per source on the running event loop."""
+        for source in self.scraper.news_sources:
+            if source not in self.tasks:
+                self.tasks[source] = asyncio.create_task(self._poll(source))
+
+    async def stop(self) -> None:
+        """Cancel the polling tasks and wait for them to finish."""
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.tasks.clear()
+
+    def status(self) -> Dict[str, Any]:
+        """Per-source run counters, last run time and last error."""
+        return {source: {**self.state.get(source, {}), 'interval': self.interval(source),
+                         'running': source in self.tasks}
+                for source in self.scraper.news_sources}
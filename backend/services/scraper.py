@@ -1,18 +1,28 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, Any, List
-import nltk
-from nltk.tokenize import sent_tokenize
-from urllib.parse import urljoin
+import asyncio
+import os
+import time
+from functools import cached_property
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional
+from urllib.parse import urljoin, urlparse
+from services.fetch_cache import FetchCache
+from services.fetcher import AsyncFetcher, DEFAULT_HEADERS
+from services.metrics import SCRAPER_FETCH_SECONDS, SCRAPER_PARSE_SECONDS
+from services.parsers import HAS_LXML, detect_encoding, get_parser
+from services.resilience import FAILURE_STATUSES, HostControls
 
 class NewsScraper:
-    def __init__(self):
-        # Download required NLTK data
-        try:
-            nltk.data.find('punkt')
-        except LookupError:
-            nltk.download('punkt')
-        
+    def __init__(self, timeout: float = 10.0, max_articles_per_source: int = 5,
+                 fetch_cache: Optional[FetchCache] = None, parser: Optional[str] = None,
+                 host_controls: Optional[HostControls] = None):
+        self.timeout = timeout
+        self.max_articles_per_source = max_articles_per_source
+        # HTML backend, see services.parsers.available_parsers()
+        self.parser = get_parser(parser or os.environ.get('SCRAPER_PARSER')
+                                 or ('lxml-partial' if HAS_LXML else 'html.parser'))
+        # Remembers validators and extractions so unchanged pages are not re-parsed
+        self.fetch_cache = fetch_cache if fetch_cache is not None else FetchCache.from_env()
+        # Per-host rate limits, concurrency limits and circuit breakers, kept across scrapes
+        self.host_controls = host_controls if host_controls is not None else HostControls.from_env()
         self.news_sources = {
             'timesofindia': {
                 'url': 'https://timesofindia.indiatimes.com/?loc=in',
@@ -166,6 +176,28 @@ The bill also addresses climate change adaptation and resilience building in the
             }
         ]
 
+    @cached_property
+    def session(self):
+        # Reuse connections across the synchronous scrape_* calls; requests is only needed by them
+        import requests
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        return session
+
+    def fetcher(self) -> AsyncFetcher:
+        """A new AsyncFetcher sharing this scraper's host controls; open it with `async with`."""
+        return AsyncFetcher(timeout=self.timeout, controls=self.host_controls)
+
+    def source_health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Health of every news source's host.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Circuit state, current limits, latency and counters per source
+        """
+        return {name: self.host_controls.get(config['url']).health()
+                for name, config in self.news_sources.items()}
+
     def scrape_all_sources(self) -> List[Dict[str, Any]]:
         """
         Return sample articles for testing.
@@ -190,35 +222,24 @@ The bill also addresses climate change adaptation and resilience building in the
         
         try:
             # Fetch the webpage
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(config['url'], headers=headers)
-            response.raise_for_status()
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find all article links
-            article_elements = soup.select(config['article_selector'])
-            
-            for element in article_elements[:5]:  # Limit to 5 articles per source
-                try:
-                    # Find article link
-                    link = element.find('a')
-                    if not link:
-                        continue
-                        
-                    article_url = urljoin(config['url'], link['href'])
-                    article_data = self.scrape_article(article_url, config)
-                    if article_data:
-                        articles.append(article_data)
-                except Exception as e:
-                    print(f"Error scraping article: {str(e)}")
-                    continue
-            
+            with SCRAPER_FETCH_SECONDS.time(source=source, page='front'):
+                response = self._get(config['url'])
+            links = self._extract(config['url'], response,
+                                  lambda body, encoding: self._extract_article_links(body, encoding, config))
         except Exception as e:
-            raise Exception(f"Failed to scrape {source}: {str(e)}")
+            # A failing or tripped source falls back to the links seen last time
+            links = self._cached(config['url'], e)
+            if links is None:
+                raise Exception(f"Failed to scrape {source}: {str(e)}")
+        
+        for article_url in links:
+            try:
+                article_data = self.scrape_article(article_url, config)
+                if article_data:
+                    articles.append(article_data)
+            except Exception as e:
+                print(f"Error scraping article: {str(e)}")
+                continue
             
         return articles
 
@@ -235,53 +256,213 @@ The bill also addresses climate change adaptation and resilience building in the
         """
         try:
             # Fetch the webpage
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
+            with SCRAPER_FETCH_SECONDS.time(source=self._source_name(config, url), page='article'):
+                response = self._get(url)
             
-            # Extract title
-            title = ''
-            if config and config['title_selector']:
-                title_elem = soup.select_one(config['title_selector'])
-                if title_elem:
-                    title = title_elem.get_text().strip()
-            
-            if not title:
-                title_tags = ['h1', 'h2']
-                for tag in title_tags:
-                    title_elem = soup.find(tag)
-                    if title_elem:
-                        title = title_elem.get_text().strip()
-                        break
+            return self._extract(url, response, lambda body, encoding: self._parse_article(body, encoding, url, config))
+        except Exception as e:
+            print(f"Failed to scrape article {url}: {str(e)}")
+            return self._cached(url, e)
+
+    async def scrape_sources_async(self, sources: List[str] = None,
+                                   fetcher: AsyncFetcher = None) -> List[Dict[str, Any]]:
+        """
+        Scrape several news sources concurrently.
+        
+        Every source front page and every article link is fetched in parallel
+        through one pooled AsyncFetcher. A failing source, or one whose
+        circuit is open, contributes its last cached pages if it has any and
+        is otherwise reported and skipped instead of failing the whole run.
+        
+        Args:
+            sources (List[str]): Source identifiers, defaults to all news_sources
+            fetcher (AsyncFetcher): Fetcher to use; a new one is opened if omitted
             
-            # Extract content
-            content = ''
-            if config and config['content_selector']:
-                content_elem = soup.select_one(config['content_selector'])
-                if content_elem:
-                    # Remove script and style elements
-                    for elem in content_elem(['script', 'style']):
-                        elem.decompose()
-                    content = content_elem.get_text().strip()
+        Returns:
+            List[Dict[str, Any]]: Articles from all sources that succeeded
+        """
+        sources = sources or list(self.news_sources)
+        if fetcher is None:
+            async with self.fetcher() as fetcher:
+                return await self.scrape_sources_async(sources, fetcher)
+        
+        results = await asyncio.gather(
+            *(self.scrape_source_async(source, fetcher) for source in sources),
+            return_exceptions=True
+        )
+        articles = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(str(result))
+                continue
+            articles.extend(result)
+        return articles
+
+    async def scrape_source_async(self, source: str, fetcher: AsyncFetcher) -> List[Dict[str, Any]]:
+        """
+        Asynchronous counterpart of scrape_source.
+        
+        Args:
+            source (str): Source identifier
+            fetcher (AsyncFetcher): Open fetcher used for all requests
             
-            if not content:
-                # Fallback to paragraphs
-                paragraphs = soup.find_all('p')
-                content = ' '.join([p.get_text().strip() for p in paragraphs])
+        Returns:
+            List[Dict[str, Any]]: List of articles from the source
+        """
+        config = self.news_sources[source]
+        links = await self._fetch_links_async(source, fetcher)
+        
+        results = await asyncio.gather(
+            *(self.scrape_article_async(url, fetcher, config) for url in links)
+        )
+        return [article for article in results if article]
+
+    async def iter_sources_async(self, sources: List[str] = None,
+                                 fetcher: AsyncFetcher = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scrape several news sources concurrently, yielding each article as soon
+        as it has been fetched and parsed.
+        
+        Args:
+            sources (List[str]): Source identifiers, defaults to all news_sources
+            fetcher (AsyncFetcher): Fetcher to use; a new one is opened if omitted
             
-            if not title or not content:
-                return None
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Articles in completion order
+        """
+        sources = sources or list(self.news_sources)
+        if fetcher is None:
+            async with self.fetcher() as fetcher:
+                async for article in self.iter_sources_async(sources, fetcher):
+                    yield article
+            return
+        
+        # Front-page tasks map to their source, article tasks map to None
+        pending = {asyncio.ensure_future(self._fetch_links_async(source, fetcher)): source
+                   for source in sources}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source = pending.pop(task)
+                    if source is None:
+                        if task.result():
+                            yield task.result()
+                        continue
+                    try:
+                        links = task.result()
+                    except Exception as e:
+                        print(str(e))
+                        continue
+                    config = self.news_sources[source]
+                    for url in links:
+                        pending[asyncio.ensure_future(self.scrape_article_async(url, fetcher, config))] = None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _fetch_links_async(self, source: str, fetcher: AsyncFetcher) -> List[str]:
+        """Fetch a source front page and return its article links."""
+        config = self.news_sources[source]
+        try:
+            # Includes time spent waiting for a connection slot
+            with SCRAPER_FETCH_SECONDS.time(source=source, page='front'):
+                response = await fetcher.fetch(config['url'], headers=self._request_headers(config['url']))
+            return self._extract(config['url'], response,
+                                 lambda body, encoding: self._extract_article_links(body, encoding, config))
+        except Exception as e:
+            links = self._cached(config['url'], e)
+            if links is None:
+                raise Exception(f"Failed to scrape {source}: {str(e)}")
+            return links
+
+    async def scrape_article_async(self, url: str, fetcher: AsyncFetcher,
+                                   config: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Asynchronous counterpart of scrape_article.
+        
+        Args:
+            url (str): The URL of the news article to scrape
+            fetcher (AsyncFetcher): Open fetcher used for the request
+            config (Dict[str, str]): Configuration for the news source
             
-            return {
-                "title": title,
-                "content": content,
-                "url": url
-            }
+        Returns:
+            Dict[str, Any]: Dictionary containing article data
+        """
+        try:
+            with SCRAPER_FETCH_SECONDS.time(source=self._source_name(config, url), page='article'):
+                response = await fetcher.fetch(url, headers=self._request_headers(url))
+            return self._extract(url, response, lambda body, encoding: self._parse_article(body, encoding, url, config))
         except Exception as e:
             print(f"Failed to scrape article {url}: {str(e)}")
-            return None 
\ No newline at end of file
+            return self._cached(url, e)
+
+    def _get(self, url: str) -> Any:
+        """Synchronous GET within the host's rate limit and circuit breaker."""
+        control = self.host_controls.get(url)
+        control.check()
+        time.sleep(control.bucket.reserve())
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers=self._request_headers(url))
+        except Exception as e:
+            control.observe(time.perf_counter() - start, error=e)
+            control.failed(e)
+            raise
+        control.observe(time.perf_counter() - start, response.status_code)
+        if response.status_code in FAILURE_STATUSES:
+            control.failed(Exception(f"HTTP {response.status_code} from {url}"))
+        else:
+            control.succeeded()
+        response.raise_for_status()
+        return response
+
+    def _cached(self, url: str, error: Exception) -> Any:
+        """The last extraction of a URL that could not be fetched, or None."""
+        entry = self.fetch_cache.get(url) if self.fetch_cache is not None else None
+        if entry is None:
+            return None
+        print(f"Serving cached copy of {url}: {str(error)}")
+        return entry['data']
+
+    def _source_name(self, config: Optional[Dict[str, str]], url: str) -> str:
+        """Metrics label of the source a config belongs to, or the URL's host."""
+        for name, source_config in self.news_sources.items():
+            if source_config is config:
+                return name
+        return urlparse(url).netloc or 'unknown'
+
+    def _request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional-request headers for a URL we have fetched before."""
+        if self.fetch_cache is None:
+            return {}
+        return self.fetch_cache.conditional_headers(url)
+
+    def _extract(self, url: str, response: Any, parse: Callable[[bytes, str], Any]) -> Any:
+        """Parse a response, reusing the cached extraction when it is unchanged."""
+        if self.fetch_cache is None:
+            return parse(response.content, detect_encoding(response.content, response.headers.get('Content-Type')))
+        return self.fetch_cache.extract(url, response, parse)
+
+    def _extract_article_links(self, body: bytes, encoding: str, config: Dict[str, str]) -> List[str]:
+        """Return the absolute URLs of the articles listed on a front page."""
+        with SCRAPER_PARSE_SECONDS.time(source=self._source_name(config, config['url']), page='front',
+                                        parser=self.parser.name):
+            links = self.parser.article_links(body, encoding, config)
+        return [urljoin(config['url'], link) for link in links[:self.max_articles_per_source]]
+
+    def _parse_article(self, body: bytes, encoding: str, url: str,
+                       config: Dict[str, str] = None) -> Dict[str, Any]:
+        """Extract the title and content of an article page."""
+        with SCRAPER_PARSE_SECONDS.time(source=self._source_name(config, url), page='article',
+                                        parser=self.parser.name):
+            title, content = self.parser.article(body, encoding, config)
+        
+        if not title or not content:
+            return None
+        
+        return {
+            "title": title,
+            "content": content,
+            "url": url
+        }
@@ -0,0 +1,289 @@
+import threading
+from itertools import chain, repeat
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+# 'exact' scores each article with NLTK's VADER, 'batch' scores a batch at once with BatchSentiment
+SENTIMENT_MODES = ('exact', 'batch')
+
+# Largest difference from SentimentIntensityAnalyzer.polarity_scores()['compound'];
+# both round to 4 decimals, so float summation order can move the last digit
+COMPOUND_TOLERANCE = 1e-4
+
+# Distinct words remembered before the vocabulary is rebuilt from scratch
+MAX_VOCABULARY = 1000000
+
+class BatchSentiment:
+    """
+    VADER compound scores for many texts at once.
+
+    A reimplementation of nltk's SentimentIntensityAnalyzer.polarity_scores
+    over NumPy arrays. Every distinct token is compiled once into a
+    vocabulary of array-backed properties (lexicon valence, booster scalar,
+    negation, capitalisation, ...); a batch of texts then becomes one flat
+    array of word codes and VADER's rules (ALL-CAPS emphasis, boosters and
+    negations in the three preceding words, "never so", idioms, "least",
+    "but", punctuation emphasis) are evaluated for the lexicon words of all
+    texts together with array lookups of their neighbours, instead of a
+    Python loop per word.
+
+    nltk's quirks are reproduced, including scoring a repeated word in the
+    context of its first occurrence, so compound scores match polarity_scores
+    within COMPOUND_TOLERANCE. Only the compound score is computed.
+    """
+
+    def __init__(self, lexicon: Dict[str, float]):
+        """
+        Args:
+            lexicon (Dict[str, float]): VADER lexicon, e.g. SentimentIntensityAnalyzer().lexicon
+        """
+        from nltk.sentiment.vader import VaderConstants
+        self.lexicon = lexicon
+        self.constants = VaderConstants()
+        self.punctuation = set(VaderConstants.PUNC_LIST)
+        # Exact-case words of multi-word idioms and boosters, matched by part id
+        phrases = list(VaderConstants.SPECIAL_CASE_IDIOMS) + [key for key in VaderConstants.BOOSTER_DICT
+                                                              if ' ' in key]
+        self.parts = {word: index + 1 for index, word in
+                      enumerate(sorted({word for phrase in phrases for word in phrase.split(' ')}))}
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # Whitespace token -> code of the word VADER makes of it, -1 if VADER drops it
+        self.tokens: Dict[str, int] = {}
+        self.words: Dict[str, int] = {}
+        self._properties: List[Tuple] = []
+        self._table: Optional[Dict[str, np.ndarray]] = None
+
+    def _word(self, token: str) -> Optional[str]:
+        """VADER's word for a whitespace token: one leading or trailing PUNC_LIST mark is stripped."""
+        if len(token) <= 1:
+            return None
+        stripped = self.constants.REGEX_REMOVE_PUNCTUATION.sub('', token)
+        if stripped != token and len(stripped) > 1:
+            if token.endswith(stripped) and token[:-len(stripped)] in self.punctuation:
+                return stripped
+            if token.startswith(stripped) and token[len(stripped):] in self.punctuation:
+                return stripped
+        return token
+
+    def _code(self, token: str) -> int:
+        word = self._word(token)
+        if word is None:
+            code = -1
+        elif word in self.words:
+            code = self.words[word]
+        else:
+            code = self.words[word] = len(self._properties)
+            lower = word.lower()
+            constants = self.constants
+            self._properties.append((
+                self.lexicon.get(lower, np.nan),
+                constants.BOOSTER_DICT.get(lower, 0.0),
+                lower in constants.BOOSTER_DICT,
+                word.isupper(),
+                lower in constants.NEGATE or "n't" in lower,
+                lower == 'kind',
+                lower == 'of',
+                lower == 'least',
+                lower in ('at', 'very'),
+                lower == 'but',
+                word == 'never',
+                word in ('so', 'this'),
+                self.parts.get(word, 0)
+            ))
+            self._table = None
+        self.tokens[token] = code
+        return code
+
+    def _properties_table(self) -> Dict[str, np.ndarray]:
+        if self._table is None:
+            names = ('valence', 'booster', 'is_booster', 'upper', 'negated', 'kind', 'of', 'least',
+                     'at_very', 'but', 'never', 'so_this', 'part')
+            # A last row for "no word", looked up at code -1 beyond the ends of a text
+            sentinel = (np.nan, 0.0) + (False,) * 10 + (0,)
+            columns = list(zip(*self._properties, sentinel))
+            dtypes = [np.float64] * 2 + [bool] * 10 + [np.int32]
+            self._table = {name: np.array(column, dtype=dtype) for name, column, dtype in zip(names, columns, dtypes)}
+        return self._table
+
+    def _encode(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Word codes of all texts, and the index of the text each word belongs to."""
+        if len(self.tokens) > MAX_VOCABULARY:
+            self._reset()
+        splits = [text.split() for text in texts]
+        lengths = np.fromiter(map(len, splits), dtype=np.int64, count=len(splits))
+        tokens = list(chain.from_iterable(splits))
+        codes = np.fromiter(map(self.tokens.get, tokens, repeat(-2)), dtype=np.int64, count=len(tokens))
+        for index in np.flatnonzero(codes == -2):
+            token = tokens[index]
+            code = self.tokens.get(token)
+            codes[index] = code if code is not None else self._code(token)
+        segments = np.repeat(np.arange(len(texts)), lengths)
+        kept = codes >= 0
+        return codes[kept], segments[kept]
+
+    def compound(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        VADER compound score of each text, as polarity_scores(text)['compound'].
+
+        Args:
+            texts (Sequence[str]): Texts to score
+
+        Returns:
+            np.ndarray: One compound score in [-1, 1] per text
+        """
+        if not texts:
+            return np.zeros(0)
+        with self._lock:
+            codes, segments = self._encode(texts)
+            table = self._properties_table()
+        sums = self._sentiment_sums(codes, segments, len(texts), table)
+        constants = self.constants
+        compounds = np.zeros(len(texts))
+        for index, text in enumerate(texts):
+            total = sums[index]
+            if np.isnan(total):
+                continue
+            # Punctuation emphasis, exactly as SentimentIntensityAnalyzer._punctuation_emphasis
+            exclamations = min(text.count('!'), 4) * 0.292
+            questions = text.count('?')
+            emphasis = exclamations + (0 if questions <= 1 else questions * 0.18 if questions <= 3 else 0.96)
+            if total > 0:
+                total += emphasis
+            elif total < 0:
+                total -= emphasis
+            compounds[index] = round(constants.normalize(float(total)), 4)
+        return compounds
+
+    def score(self, texts: Sequence[str],
+              sentences: Sequence[Sequence[str]]) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """
+        Document and per-sentence compound scores in one vectorized pass.
+
+        Args:
+            texts (Sequence[str]): Documents
+            sentences (Sequence[Sequence[str]]): Sentences of each document
+
+        Returns:
+            Tuple[np.ndarray, List[np.ndarray]]: Document scores, and an array of sentence scores per document
+        """
+        flat = [sentence for document in sentences for sentence in document]
+        compounds = self.compound(list(texts) + flat)
+        bounds = np.cumsum([len(texts)] + [len(document) for document in sentences])
+        return compounds[:len(texts)], np.split(compounds[len(texts):], bounds[1:-1] - len(texts))
+
+    def _sentiment_sums(self, codes: np.ndarray, segments: np.ndarray, count: int,
+                        table: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Sum of the word sentiments of each text, NaN for texts without words.
+
+        Only lexicon words carry sentiment, so the rules are evaluated at
+        their positions alone, looking up the words around them.
+        """
+        constants = self.constants
+        length = np.bincount(segments, minlength=count)
+        uppers = np.bincount(segments, weights=table['upper'][codes], minlength=count)
+        cap_differential = (uppers > 0) & (uppers < length)
+
+        index = np.flatnonzero(~np.isnan(table['valence'][codes]))
+        segment = segments[index]
+        position = index - (np.cumsum(length) - length)[segment]
+        after = length[segment] - position - 1
+        cap_differential = cap_differential[segment]
+        neighbours: Dict[int, np.ndarray] = {}
+
+        def prop(name: str, offset: int = 0) -> np.ndarray:
+            """Property of the word `offset` before each lexicon word (after if negative)."""
+            # Outside the text the sentinel row answers: no valence, False, part 0
+            if offset not in neighbours:
+                inside = position >= offset if offset > 0 else after >= -offset
+                neighbours[offset] = np.where(inside, codes[np.clip(index - offset, 0, len(codes) - 1)], -1)
+            return table[name][neighbours[offset]]
+
+        def in_lexicon(offset: int) -> np.ndarray:
+            return ~np.isnan(prop('valence', offset))
+
+        value = prop('valence')
+        caps = prop('upper') & cap_differential
+        value = np.where(caps, np.where(value > 0, value + constants.C_INCR, value - constants.C_INCR), value)
+
+        for start in range(3):
+            offset = start + 1
+            applies = (position > start) & ~in_lexicon(offset)
+            # scalar_inc_dec of the preceding word, damped with distance
+            scalar = np.where(value < 0, -prop('booster', offset), prop('booster', offset))
+            caps = prop('is_booster', offset) & prop('upper', offset) & cap_differential
+            scalar = np.where(caps, np.where(value > 0, scalar + constants.C_INCR, scalar - constants.C_INCR), scalar)
+            scalar = scalar * (1.0, 0.95, 0.9)[start]
+            value = np.where(applies, value + scalar, value)
+
+            # _never_check
+            negation = applies & prop('negated', offset)
+            if start > 0:
+                never_so = prop('never', offset) & prop('so_this', start)
+                if start == 2:
+                    never_so |= prop('so_this', 1)
+                never_so &= applies
+                value = np.where(never_so, value * (1.5 if start == 1 else 1.25), value)
+                negation &= ~never_so
+            value = np.where(negation, value * constants.N_SCALAR, value)
+        value = self._idioms_check(value, (position > 2) & ~in_lexicon(3), prop)
+
+        # _least_check
+        least = (position > 0) & ~in_lexicon(1) & prop('least', 1) & ((position == 1) | ~prop('at_very', 2))
+        value = np.where(least, value * constants.N_SCALAR, value)
+
+        # Boosters and "kind" before "of" carry no sentiment themselves
+        skipped = prop('is_booster') | (prop('kind') & prop('of', -1))
+        value = np.where(skipped, 0.0, value)
+
+        # nltk scores each word at words.index(word), its first occurrence in the text
+        keys = segment * len(table['valence']) + codes[index]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        sentiments = value[first[inverse]]
+
+        # _but_check: halve the words before the first "but", amplify those after it
+        but = np.flatnonzero(table['but'][codes])
+        first_but = np.full(count, len(codes))
+        np.minimum.at(first_but, segments[but], but)
+        pivot = first_but[segment]
+        sentiments = np.where(pivot < len(codes),
+                              sentiments * np.where(index < pivot, 0.5, np.where(index > pivot, 1.5, 1.0)),
+                              sentiments)
+
+        sums = np.bincount(segment, weights=sentiments, minlength=count)
+        return np.where(length > 0, sums, np.nan)
+
+    def _idioms_check(self, value: np.ndarray, applies: np.ndarray, prop) -> np.ndarray:
+        """SentimentIntensityAnalyzer._idioms_check for the lexicon words where `applies`."""
+        ids = self.parts
+
+        def phrase_at(phrases: Iterable[str], start: int, size: int) -> np.ndarray:
+            """Value of the phrase of `size` words starting `start` words before the word, NaN if none."""
+            parts = [prop('part', start - k) for k in range(size)]
+            found = np.full(len(value), np.nan)
+            for phrase in phrases:
+                words = phrase.split(' ')
+                if len(words) == size:
+                    match = np.logical_and.reduce([part == ids[word] for part, word in zip(parts, words)])
+                    found = np.where(match, phrases[phrase], found)
+            return found
+
+        idioms = self.constants.SPECIAL_CASE_IDIOMS
+        # onezero, twoonezero, twoone, threetwoone, threetwo: the first match wins
+        idiom = np.full(len(value), np.nan)
+        for start, size in reversed([(1, 2), (2, 3), (2, 2), (3, 3), (3, 2)]):
+            candidate = phrase_at(idioms, start, size)
+            idiom = np.where(np.isnan(candidate), idiom, candidate)
+        # Idioms starting at the word override them: zeroone, then zeroonetwo
+        for size in (2, 3):
+            candidate = phrase_at(idioms, 0, size)
+            idiom = np.where(np.isnan(candidate), idiom, candidate)
+        value = np.where(applies & ~np.isnan(idiom), idiom, value)
+
+        # Booster bigrams ("kind of", "sort of") in threetwo or twoone
+        boosters = self.constants.BOOSTER_DICT
+        boosted = ~np.isnan(phrase_at(boosters, 3, 2)) | ~np.isnan(phrase_at(boosters, 2, 2))
+        return np.where(applies & boosted, value + self.constants.B_DECR, value)
@@ -0,0 +1,196 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from services.cache import AnalysisCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    sentiment REAL NOT NULL,
+    entities TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    published REAL NOT NULL,
+    content TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published);
+CREATE INDEX IF NOT EXISTS idx_articles_topic_published ON articles (topic, published);
+CREATE INDEX IF NOT EXISTS idx_articles_sentiment ON articles (sentiment);
+CREATE INDEX IF NOT EXISTS idx_articles_source_published ON articles (source, published);
+"""
+
+# Columns returned by the read methods; content is only read by iter_rows
+COLUMNS = 'url, source, title, topic, summary, sentiment, entities, published'
+
+class ArticleStore:
+    """
+    SQLite store of analyzed articles.
+
+    Written by the ingestion scheduler and read by the /articles endpoints,
+    so reads never wait on scraping. Articles are unique by URL and indexed
+    on topic, published time, sentiment and source. `published` is the time
+    the article was first ingested, since the sources do not expose one.
+    The article text is kept too so exports can be re-analyzed.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Args:
+            path (str): SQLite database file, ':memory:' for a throwaway store
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+        # Stores created before the content column get it added empty
+        columns = [row['name'] for row in self._db.execute('PRAGMA table_info(articles)')]
+        if 'content' not in columns:
+            self._db.execute("ALTER TABLE articles ADD COLUMN content TEXT NOT NULL DEFAULT ''")
+        self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> 'ArticleStore':
+        """Open the store at ARTICLE_STORE_PATH (default: articles.sqlite)."""
+        return cls(os.environ.get('ARTICLE_STORE_PATH', 'articles.sqlite'))
+
+    def content_hash(self, article: Dict[str, Any]) -> str:
+        return AnalysisCache.key(article)
+
+    def is_current(self, article: Dict[str, Any]) -> bool:
+        """True if the article is stored with the same content."""
+        with self._lock:
+            row = self._db.execute('SELECT content_hash FROM articles WHERE url = ?',
+                                   (article['url'],)).fetchone()
+        return row is not None and row['content_hash'] == self.content_hash(article)
+
+    def upsert(self, source: str, article: Dict[str, Any], analysis: Dict[str, Any]) -> None:
+        """
+        Store or update an analyzed article.
+
+        Args:
+            source (str): Source identifier the article was scraped from
+            article (Dict[str, Any]): Scraped article with url, title and content
+            analysis (Dict[str, Any]): Result of NewsAnalyzer.analyze_article
+        """
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO articles (url, source, title, topic, summary, sentiment, entities, content_hash, '
+                'published, content) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET title = excluded.title, topic = excluded.topic, '
+                'summary = excluded.summary, sentiment = excluded.sentiment, entities = excluded.entities, '
+                'content_hash = excluded.content_hash, content = excluded.content',
+                (article['url'], source, analysis['title'], analysis['topic'], analysis['summary'],
+                 analysis['sentiment'], json.dumps(analysis['entities']), self.content_hash(article),
+                 time.time(), article['content'])
+            )
+            self._db.commit()
+
+    def query(self, topic: Optional[str] = None, source: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              min_sentiment: Optional[float] = None, max_sentiment: Optional[float] = None,
+              limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """
+        Page through stored articles, newest first.
+
+        Args:
+            topic (str): Only articles classified under this topic
+            source (str): Only articles from this source
+            since (float): Only articles published at or after this Unix time
+            until (float): Only articles published before this Unix time
+            min_sentiment (float): Lowest compound sentiment to include
+            max_sentiment (float): Highest compound sentiment to include
+            limit (int): Page size
+            offset (int): Number of matching articles to skip
+
+        Returns:
+            Dict[str, Any]: The page of articles and the total match count
+        """
+        clauses, params = self._filters(topic, source, since, until, min_sentiment, max_sentiment)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self._lock:
+            total = self._db.execute(f'SELECT COUNT(*) FROM articles {where}', params).fetchone()[0]
+            rows = self._db.execute(
+                f'SELECT {COLUMNS} FROM articles {where} ORDER BY published DESC, id DESC LIMIT ? OFFSET ?',
+                params + [limit, offset]
+            ).fetchall()
+
+        return {'items': [self._item(row) for row in rows], 'total': total, 'limit': limit, 'offset': offset}
+
+    def iter_rows(self, batch_size: int = 10000, content: bool = False, topic: Optional[str] = None,
+                  source: Optional[str] = None, since: Optional[float] = None,
+                  until: Optional[float] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream matching articles in insertion order, one batch at a time.
+
+        Batches are read by id range rather than OFFSET, so each costs the
+        same however deep into the table it is and only one batch is held
+        in memory.
+
+        Args:
+            batch_size (int): Articles per batch
+            content (bool): Include the article text
+            topic (str): Only articles classified under this topic
+            source (str): Only articles from this source
+            since (float): Only articles published at or after this Unix time
+            until (float): Only articles published before this Unix time
+
+        Yields:
+            List[Dict[str, Any]]: Articles shaped like query() items
+        """
+        clauses, params = self._filters(topic, source, since, until)
+        columns = f"id, {COLUMNS}{', content' if content else ''}"
+        last_id = 0
+        while True:
+            where = ' AND '.join(['id > ?'] + clauses)
+            with self._lock:
+                rows = self._db.execute(f'SELECT {columns} FROM articles WHERE {where} ORDER BY id LIMIT ?',
+                                        [last_id] + params + [batch_size]).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1]['id']
+            items = [self._item(row) for row in rows]
+            for item in items:
+                del item['id']
+            yield items
+
+    @staticmethod
+    def _filters(topic: Optional[str] = None, source: Optional[str] = None, since: Optional[float] = None,
+                 until: Optional[float] = None, min_sentiment: Optional[float] = None,
+                 max_sentiment: Optional[float] = None) -> Tuple[List[str], List[Any]]:
+        clauses = []
+        params: List[Any] = []
+        for clause, value in (('topic = ?', topic), ('source = ?', source),
+                              ('published >= ?', since), ('published < ?', until),
+                              ('sentiment >= ?', min_sentiment), ('sentiment <= ?', max_sentiment)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return clauses, params
+
+    @staticmethod
+    def _item(row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        item['entities'] = json.loads(item['entities'])
+        return item
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored article for a URL, or None."""
+        with self._lock:
+            row = self._db.execute(f'SELECT {COLUMNS} FROM articles WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        return self._item(row)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,153 @@
+import os
+import time
+from typing import Dict, List, Optional, Set
+import numpy as np
+
+def lead_summary(sentences: List[str], lengths: List[int], max_words: int) -> str:
+    """Leading sentences up to `max_words` tokens."""
+    summary = []
+    word_count = 0
+    for sentence, length in zip(sentences, lengths):
+        if word_count + length > max_words:
+            break
+        summary.append(sentence)
+        word_count += length
+    return ' '.join(summary)
+
+class ExtractiveSummarizer:
+    """
+    TextRank summarizer over TF-IDF sentence vectors.
+
+    The article becomes one sparse sentence-by-term TF-IDF matrix; its
+    cosine similarity graph is ranked with a PageRank power iteration whose
+    teleport vector favours early sentences (news puts the key facts first).
+    The best-ranked sentences that fit in `max_words` are returned in
+    document order. If scoring runs past the per-article time budget the
+    summarizer falls back to the leading sentences.
+    """
+
+    def __init__(self, stop_words: Optional[Set[str]] = None, max_words: int = 150,
+                 budget: Optional[float] = 0.05, damping: float = 0.85,
+                 max_iterations: int = 50, tolerance: float = 1e-6):
+        """
+        Args:
+            stop_words (Set[str]): Lowercased words ignored when scoring
+            max_words (int): Default summary length in tokens
+            budget (float): Seconds allowed for scoring one article, None for no limit
+            damping (float): PageRank damping factor
+            max_iterations (int): Power iteration cap
+            tolerance (float): L1 change at which the power iteration stops
+        """
+        self.stop_words = stop_words or set()
+        self.max_words = max_words
+        self.budget = budget
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_env(cls, stop_words: Optional[Set[str]] = None) -> 'ExtractiveSummarizer':
+        """Build a summarizer from SUMMARY_MAX_WORDS and SUMMARY_BUDGET_MS (0 disables the budget)."""
+        budget_ms = float(os.environ.get('SUMMARY_BUDGET_MS', '50'))
+        return cls(stop_words, max_words=int(os.environ.get('SUMMARY_MAX_WORDS', '150')),
+                   budget=budget_ms / 1000 if budget_ms > 0 else None)
+
+    def config(self) -> Dict[str, float]:
+        """Settings that change summaries, for cache versioning."""
+        return {'max_words': self.max_words, 'damping': self.damping,
+                'max_iterations': self.max_iterations, 'tolerance': self.tolerance}
+
+    def _tfidf(self, sentence_tokens: List[List[str]]):
+        from scipy import sparse
+        vocabulary: Dict[str, int] = {}
+        rows, columns = [], []
+        for row, tokens in enumerate(sentence_tokens):
+            for token in tokens:
+                token = token.lower()
+                if token.isalnum() and token not in self.stop_words:
+                    rows.append(row)
+                    columns.append(vocabulary.setdefault(token, len(vocabulary)))
+        counts = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)),
+                                   shape=(len(sentence_tokens), len(vocabulary)))
+        counts.sum_duplicates()
+        counts.data = 1 + np.log(counts.data)
+
+        document_frequency = np.bincount(counts.indices, minlength=len(vocabulary))
+        idf = np.log((1 + counts.shape[0]) / (1 + document_frequency)) + 1
+        matrix = counts.multiply(idf.astype(np.float32)).tocsr()
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ matrix
+
+    def rank(self, sentence_tokens: List[List[str]], deadline: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        TextRank score of every sentence.
+
+        Args:
+            sentence_tokens (List[List[str]]): Tokens of each sentence
+            deadline (float): time.perf_counter() value to give up at
+
+        Returns:
+            Optional[np.ndarray]: One score per sentence, or None if the deadline passed
+        """
+        matrix = self._tfidf(sentence_tokens)
+        similarity = (matrix @ matrix.T).toarray()
+        np.fill_diagonal(similarity, 0)
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+
+        count = similarity.shape[0]
+        out_weight = similarity.sum(axis=1)
+        dangling = out_weight == 0
+        out_weight[dangling] = 1
+        transition = similarity / out_weight[:, None]
+
+        teleport = 1 / np.arange(1, count + 1)
+        teleport /= teleport.sum()
+        scores = np.full(count, 1 / count)
+        for _ in range(self.max_iterations):
+            # Sentences sharing no terms hand their score to the teleport vector
+            updated = (self.damping * (scores @ transition)
+                       + (self.damping * scores[dangling].sum() + 1 - self.damping) * teleport)
+            converged = np.abs(updated - scores).sum() < self.tolerance
+            scores = updated
+            if converged:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+        return scores
+
+    def summarize(self, sentences: List[str], sentence_tokens: List[List[str]],
+                  max_words: Optional[int] = None, budget: Optional[float] = None) -> str:
+        """
+        Summarize an article from its sentences.
+
+        Args:
+            sentences (List[str]): Sentences in document order
+            sentence_tokens (List[List[str]]): Tokens of each sentence
+            max_words (int): Summary length in tokens, defaults to self.max_words
+            budget (float): Seconds allowed for scoring, defaults to self.budget
+
+        Returns:
+            str: Selected sentences joined in document order
+        """
+        max_words = max_words or self.max_words
+        budget = self.budget if budget is None else budget
+        lengths = [len(tokens) for tokens in sentence_tokens]
+        if sum(lengths) <= max_words:
+            return ' '.join(sentences)
+
+        deadline = time.perf_counter() + budget if budget else None
+        scores = self.rank(sentence_tokens, deadline)
+        if scores is None:
+            return lead_summary(sentences, lengths, max_words)
+
+        selected = []
+        word_count = 0
+        # Stable sort keeps the earlier sentence on ties
+        for index in np.argsort(-scores, kind='stable'):
+            if word_count + lengths[index] <= max_words:
+                selected.append(index)
+                word_count += lengths[index]
+        return ' '.join(sentences[index] for index in sorted(selected))
@@ -0,0 +1,88 @@
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+# Topic taxonomy used for classification, overridable per deployment
+DEFAULT_TOPICS_PATH = os.environ.get('NEWS_TOPICS_PATH', os.path.join(os.path.dirname(__file__), 'topics.json'))
+
+class TopicIndex:
+    """
+    Inverted keyword index for topic classification.
+
+    Every keyword (single word or phrase) is lowercased, stripped of
+    stopwords and stemmed, then mapped to the topics it votes for with its
+    weight. Classifying an article is one pass over its tokens with a
+    dictionary lookup per phrase length, so cost grows with article length
+    rather than with the size of the taxonomy.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, float]], stop_words: Optional[Set[str]] = None):
+        """
+        Args:
+            taxonomy (Dict[str, Dict[str, float]]): topic -> {keyword: weight}
+            stop_words (Set[str]): Words dropped from keywords and articles
+        """
+        self.taxonomy = taxonomy
+        self.topics = list(taxonomy)
+        self.stop_words = stop_words or set()
+        from nltk.stem import PorterStemmer
+        self.stem = lru_cache(maxsize=100000)(PorterStemmer().stem)
+        
+        # Keywords like "farm"/"farming" stem to the same key; each topic counts once
+        # per key, with the largest weight among its keywords
+        weights: Dict[Tuple[str, ...], Dict[str, float]] = {}
+        for topic, keywords in taxonomy.items():
+            for keyword, weight in keywords.items():
+                key = self._key(keyword.lower().split())
+                if key:
+                    topics = weights.setdefault(key, {})
+                    topics[topic] = max(topics.get(topic, float(weight)), float(weight))
+        self.index: Dict[Tuple[str, ...], List[Tuple[str, float]]] = {
+            key: list(topics.items()) for key, topics in weights.items()
+        }
+        # Longest phrases first so "stock market" is preferred over "market"
+        self.phrase_lengths = sorted({len(key) for key in self.index}, reverse=True)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TOPICS_PATH, stop_words: Optional[Set[str]] = None) -> 'TopicIndex':
+        """Load a taxonomy from a JSON file of {topic: {keyword: weight}}."""
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), stop_words)
+
+    def _key(self, words: List[str]) -> Tuple[str, ...]:
+        return tuple(self.stem(word) for word in words if word not in self.stop_words)
+
+    def scores(self, words: List[str]) -> Dict[str, float]:
+        """
+        Score every topic against an article.
+        
+        Args:
+            words (List[str]): Lowercased article tokens with stopwords removed
+            
+        Returns:
+            Dict[str, float]: Weighted keyword hits per topic
+        """
+        stems = [self.stem(word) for word in words]
+        topic_scores = dict.fromkeys(self.topics, 0.0)
+        i = 0
+        while i < len(stems):
+            for length in self.phrase_lengths:
+                matches = self.index.get(tuple(stems[i:i + length]))
+                if matches:
+                    for topic, weight in matches:
+                        topic_scores[topic] += weight
+                    i += length
+                    break
+            else:
+                i += 1
+        return topic_scores
+
+    def classify(self, words: List[str], default: str = 'general') -> str:
+        """Return the best scoring topic, or `default` if nothing matched."""
+        topic_scores = self.scores(words)
+        if not topic_scores:
+            return default
+        # max keeps the first topic in taxonomy order on ties
+        best = max(topic_scores.items(), key=lambda x: x[1])
+        return best[0] if best[1] > 0 else default
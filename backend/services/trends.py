@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional
+import numpy as np
+
+_PRIME = np.uint64((1 << 61) - 1)
+
+# Key of the windows that aggregate every topic
+ALL_TOPICS = '*'
+
+class CountMinSketch:
+    """
+    Count-Min sketch of term counts.
+
+    `depth` rows of `width` counters; a term increments one counter per row
+    and its estimate is the row minimum, which never undercounts and
+    overcounts by at most 2N/width with high probability. Memory is fixed
+    at depth * width counters however many distinct terms are added.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, seed: int = 1):
+        self.width = width
+        generator = np.random.RandomState(seed)
+        self.a = generator.randint(1, 1 << 31, size=depth, dtype=np.uint64)
+        self.b = generator.randint(0, 1 << 31, size=depth, dtype=np.uint64)
+        self.rows = np.arange(depth)
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+
+    def _columns(self, term: str) -> np.ndarray:
+        hashed = np.uint64(zlib.crc32(term.encode('utf-8')))
+        return ((self.a * hashed + self.b) % _PRIME % np.uint64(self.width)).astype(np.intp)
+
+    def add(self, term: str, count: int = 1) -> int:
+        """Count a term and return its new estimate."""
+        columns = self._columns(term)
+        self.table[self.rows, columns] += count
+        return int(self.table[self.rows, columns].min())
+
+    def estimate(self, term: str) -> int:
+        return int(self.table[self.rows, self._columns(term)].min())
+
+    def columns(self, terms: List[str]) -> np.ndarray:
+        """Counter columns of several terms (depth x terms), reusable across sketches with the same seed."""
+        hashed = np.fromiter((zlib.crc32(term.encode('utf-8')) for term in terms), dtype=np.uint64, count=len(terms))
+        return ((np.outer(self.a, hashed) + self.b[:, None]) % _PRIME % np.uint64(self.width)).astype(np.intp)
+
+    def estimate_many(self, columns: np.ndarray) -> np.ndarray:
+        """Estimates for the terms behind columns()."""
+        return self.table[self.rows[:, None], columns].min(axis=0)
+
+class TopK:
+    """Heavy hitters: the `k` terms with the highest sketch estimates seen so far."""
+
+    def __init__(self, k: int = 50):
+        self.k = k
+        self.counts: Dict[str, int] = {}
+
+    def offer(self, term: str, estimate: int) -> None:
+        if term in self.counts or len(self.counts) < self.k:
+            self.counts[term] = estimate
+            return
+        smallest = min(self.counts, key=self.counts.get)
+        if estimate > self.counts[smallest]:
+            del self.counts[smallest]
+            self.counts[term] = estimate
+
+class TrendWindow:
+    """Keyword statistics of one topic over one time window."""
+
+    def __init__(self, k: int, width: int, depth: int):
+        self.articles = 0
+        self.sketch = CountMinSketch(width, depth)
+        self.top = TopK(k)
+
+    def add(self, keywords: Iterable[str]) -> None:
+        self.articles += 1
+        for keyword in keywords:
+            self.top.offer(keyword, self.sketch.add(keyword))
+
+class TrendTracker:
+    """
+    Incremental keyword trends per topic and time window.
+
+    Every ingested article adds its keywords (NewsAnalyzer._extract_keywords)
+    to a Count-Min sketch and heavy-hitter list for its topic and for all
+    topics, in the time window it was ingested in. Each keyword counts once
+    per article, so counts are document frequencies. Only the last
+    `windows` windows are kept, so memory is bounded by
+    topics * windows * (width * depth counters + k terms), and a query only
+    reads the heavy hitters of the requested windows; stored articles are
+    never rescanned.
+    """
+
+    def __init__(self, window: float = 3600, windows: int = 24, k: int = 50,
+                 width: int = 2048, depth: int = 4, clock=time.time):
+        """
+        Args:
+            window (float): Window length in seconds
+            windows (int): Number of windows kept
+            k (int): Heavy hitters tracked per topic and window
+            width (int): Count-Min sketch width
+            depth (int): Count-Min sketch depth
+            clock (Callable[[], float]): Time source, injectable for tests
+        """
+        self.window = window
+        self.windows = windows
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.clock = clock
+        self.topics: Dict[str, 'OrderedDict[int, TrendWindow]'] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'TrendTracker':
+        """Build a tracker from TRENDS_WINDOW (seconds) and TRENDS_WINDOWS."""
+        return cls(window=float(os.environ.get('TRENDS_WINDOW', '3600')),
+                   windows=int(os.environ.get('TRENDS_WINDOWS', '24')))
+
+    def _expire(self, current: int) -> None:
+        for windows in self.topics.values():
+            while windows and next(iter(windows)) <= current - self.windows:
+                windows.popitem(last=False)
+
+    def add(self, topic: str, keywords: List[str], timestamp: Optional[float] = None) -> None:
+        """
+        Record the keywords of one ingested article.
+
+        Args:
+            topic (str): Topic the article was classified under
+            keywords (List[str]): Its keywords
+            timestamp (float): Ingestion time, defaults to now
+        """
+        bucket = int((self.clock() if timestamp is None else timestamp) // self.window)
+        keywords = list(dict.fromkeys(keywords))
+        with self._lock:
+            self._expire(int(self.clock() // self.window))
+            for key in (topic, ALL_TOPICS):
+                windows = self.topics.setdefault(key, OrderedDict())
+                if bucket not in windows:
+                    windows[bucket] = TrendWindow(self.k, self.width, self.depth)
+                    # Late articles can open an older window; keep windows in time order
+                    for later in [b for b in windows if b > bucket]:
+                        windows.move_to_end(later)
+                windows[bucket].add(keywords)
+
+    def trending(self, topic: Optional[str] = None, windows: int = 1, limit: int = 10) -> Dict[str, Any]:
+        """
+        Trending keywords of a topic over the most recent windows.
+
+        Args:
+            topic (str): Topic to report, None for all topics
+            windows (int): Number of most recent windows to cover, at most self.windows
+            limit (int): Number of keywords to return
+
+        Returns:
+            Dict[str, Any]: Articles in the span and keywords with their
+                document count and lift (rate in the span over the rate in
+                all kept windows)
+        """
+        current = int(self.clock() // self.window)
+        windows = max(1, min(windows, self.windows))
+        with self._lock:
+            self._expire(current)
+            kept = self.topics.get(topic or ALL_TOPICS, {})
+            span = [kept[b] for b in range(current - windows + 1, current + 1) if b in kept]
+            candidates = sorted({term for trend in span for term in trend.top.counts})
+            articles = sum(trend.articles for trend in span)
+            all_articles = sum(trend.articles for trend in kept.values())
+            counts = np.zeros(len(candidates), dtype=np.int64)
+            totals = np.zeros(len(candidates), dtype=np.int64)
+            if candidates:
+                # Windows share a seed, so the candidates are hashed once
+                columns = span[0].sketch.columns(candidates)
+                for bucket, trend in kept.items():
+                    estimates = trend.sketch.estimate_many(columns)
+                    totals += estimates
+                    if bucket > current - windows:
+                        counts += estimates
+
+        keywords = []
+        for i in sorted(range(len(candidates)), key=lambda i: (-counts[i], candidates[i]))[:limit]:
+            lift = (counts[i] / articles) / ((totals[i] + 1) / (all_articles + 1))
+            keywords.append({'keyword': candidates[i], 'count': int(counts[i]), 'lift': round(float(lift), 3)})
+        return {'topic': topic, 'window_seconds': self.window, 'windows': windows,
+                'since': (current - windows + 1) * self.window, 'articles': articles,
+                'keywords': keywords}
@@ -0,0 +1,65 @@
+import os
+from collections import Counter
+import pytest
+from services.nltk_data import missing_resources, use_bundle
+from services.scraper import NewsScraper
+
+# CI builds the bundle and sets REQUIRE_NLTK_DATA so these fail instead of skipping
+pytestmark = pytest.mark.skipif(bool(missing_resources()) and not os.environ.get('REQUIRE_NLTK_DATA'),
+                                reason='the NLTK data bundle is not installed')
+
+SAMPLES = NewsScraper().sample_articles
+
+@pytest.fixture(scope='module')
+def analyzer():
+    from services.analyzer import NewsAnalyzer
+    from services.cache import AnalysisCache
+    return NewsAnalyzer(cache=AnalysisCache())
+
+def per_stage_analysis(analyzer, content):
+    """Sentiment, keywords and entities as the stages computed them before AnalysisDocument."""
+    use_bundle()
+    import nltk
+    from nltk.tokenize import word_tokenize, sent_tokenize
+    words = [w for w in word_tokenize(content.lower()) if w.isalnum() and w not in analyzer.stop_words]
+    entities = {'people': set(), 'locations': set()}
+    for sentence in sent_tokenize(content):
+        for chunk in nltk.ne_chunk(nltk.pos_tag(word_tokenize(sentence))):
+            if hasattr(chunk, 'label'):
+                name = ' '.join(c[0] for c in chunk)
+                if chunk.label() == 'PERSON':
+                    entities['people'].add(name)
+                elif chunk.label() in ('GPE', 'LOCATION'):
+                    entities['locations'].add(name)
+    return {'sentiment': analyzer.sia.polarity_scores(content)['compound'],
+            'keywords': [word for word, _ in Counter(words).most_common(10)],
+            'entities': entities}
+
+def test_sample_articles_match_the_per_stage_pipeline(analyzer):
+    for article in SAMPLES:
+        analysis = analyzer.analyze_article(article, 'accurate')
+        expected = per_stage_analysis(analyzer, article['content'])
+        assert analysis['title'] == article['title']
+        assert analysis['sentiment'] == expected['sentiment']
+        # List numbers are now counted too (see test_document) and may take keyword slots;
+        # the words keep their order
+        words = [word for word in analysis['keywords'] if word.isalpha()]
+        assert words == [word for word in expected['keywords'] if word.isalpha()][:len(words)]
+        assert {key: set(names) for key, names in analysis['entities'].items()} == expected['entities']
+        assert analysis['topic'] in set(analyzer.topic_keywords) | {'general'}
+        assert 0 < len(analysis['summary'].split()) <= 150
+        assert set(analysis['stages']) >= {'document', 'sentiment', 'topic', 'summary', 'entities', 'keywords'}
+
+def test_batch_sentiment_mode_matches_exact(analyzer):
+    from services.analyzer import NewsAnalyzer
+    from services.cache import AnalysisCache
+    batch = NewsAnalyzer(cache=AnalysisCache(), sentiment_mode='batch')
+    analyses = list(batch.analyze_many(SAMPLES * 2, entity_mode='fast'))
+    assert [analysis['sentiment'] for analysis in analyses] == \
+           [analyzer.sia.polarity_scores(article['content'])['compound'] for article in SAMPLES * 2]
+    assert all(analysis['stages']['sentiment'] >= 0 for analysis in analyses[:len(SAMPLES)])
+
+def test_unknown_sentiment_mode_is_rejected():
+    from services.analyzer import NewsAnalyzer
+    with pytest.raises(ValueError):
+        NewsAnalyzer(sentiment_mode='fuzzy')
@@ -1,20 +1,39 @@
-import requests
-import json
+import asyncio
+from benchmarks.suite import asgi_client
+from services.container import ServiceContainer
+from services.store import ArticleStore
 
-def test_analyze_endpoint():
-    url = "http://localhost:8000/analyze"
-    headers = {"Content-Type": "application/json"}
-    data = {"url": "https://www.hindustantimes.com/"}
-    
-    try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
-        print("Status Code:", response.status_code)
-        print("\nResponse:")
-        print(json.dumps(result, indent=2))
-    except requests.exceptions.RequestException as e:
-        print(f"Error: {e}")
+class KeywordAnalyzer:
+    """Minimal analyzer so the API runs in-process without NLTK data."""
 
-if __name__ == "__main__":
-    test_analyze_endpoint() 
\ No newline at end of file
+    def analyze_article(self, article_data, entity_mode=None):
+        return {
+            "title": article_data["title"],
+            "topic": "general",
+            "summary": article_data["content"][:40],
+            "sentiment": 0.0,
+            "entities": {"people": [], "locations": []},
+            "keywords": article_data["content"].lower().split()[:5]
+        }
+
+    def analyze_many(self, articles, pool=None, entity_mode=None):
+        return (self.analyze_article(article, entity_mode) for article in articles)
+
+def test_analyze_endpoints_in_process():
+    async def exercise():
+        services = ServiceContainer(analyzer_factory=KeywordAnalyzer, store_factory=ArticleStore,
+                                    ingest_enabled=False)
+        async with asgi_client(services) as client:
+            news = await client.get("/analyze-news")
+            article = {"title": "Markets", "content": "Markets rallied on Monday in Mumbai.",
+                       "url": "https://www.hindustantimes.com/business/markets"}
+            batch = await client.post("/analyze/batch", json={"articles": [article]})
+        return news, batch
+
+    news, batch = asyncio.run(exercise())
+    assert news.status_code == 200
+    assert len(news.json()) == 3
+    assert batch.status_code == 200
+    result = batch.json()[0]
+    assert result["url"] == "https://www.hindustantimes.com/business/markets"
+    assert result["keywords"] == ["markets", "rallied", "on", "monday", "in"]
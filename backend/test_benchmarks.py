@@ -0,0 +1,47 @@
+import os
+from benchmarks import suite
+
+def results(**medians):
+    return {'results': {name.replace('_', '.'): {'median': median} for name, median in medians.items()}}
+
+def test_compare_flags_regressions_above_threshold():
+    rows = suite.compare(results(parse_a=1.0, parse_b=1.0, parse_c=1.0, parse_d=1.0),
+                         results(parse_a=1.05, parse_b=1.5, parse_c=0.5, parse_e=1.0), threshold=0.1)
+    assert {row['name']: row['status'] for row in rows} == {
+        'parse.a': 'ok', 'parse.b': 'regression', 'parse.c': 'improvement',
+        'parse.d': 'missing', 'parse.e': 'new'
+    }
+    assert suite._print_comparison(rows) is True
+
+def test_missing_cases_fail_unless_allowed(capsys):
+    current = {**results(parse_a=1.0), 'skipped': {'analyzer.document': 'LookupError: Resource punkt not found.'}}
+    rows = suite.compare(results(parse_a=1.0, analyzer_document=1.0), current)
+    assert rows[0] == {'name': 'analyzer.document', 'baseline': 1.0, 'current': None, 'change': None,
+                       'status': 'missing', 'reason': 'LookupError: Resource punkt not found.'}
+    assert suite._print_comparison(rows) is True
+    assert 'missing (LookupError: Resource punkt not found.)' in capsys.readouterr().out
+    assert suite._print_comparison(rows, allow_missing=True) is False
+
+def test_run_times_fixture_parsing_and_records_skips(monkeypatch):
+    def missing_data(stack):
+        raise LookupError("\n*****\n  Resource \x1b[93mpunkt\x1b[0m not found.\n")
+    monkeypatch.setitem(suite.CASES, 'analyzer.missing', missing_data)
+
+    run = suite.run(['parse.lxml.front_page', 'analyzer.missing'], repeat=2, min_time=0.001)
+    timing = run['results']['parse.lxml.front_page']
+    assert 0 < timing['min'] <= timing['median']
+    assert run['skipped'] == {'analyzer.missing': 'LookupError: Resource punkt not found.'}
+    assert suite.compare(run, run) == [
+        {'name': 'parse.lxml.front_page', 'baseline': timing['median'], 'current': timing['median'],
+         'change': 0.0, 'status': 'ok'}
+    ]
+
+def test_committed_baseline_matches_the_cases():
+    baseline = suite._load(os.path.join(suite.BASELINES, 'main.json'))
+    assert set(baseline['results']) | set(baseline['skipped']) <= set(suite.CASES)
+    assert any(name.startswith('parse.') for name in baseline['results'])
+
+def test_machine_differences_are_reported():
+    meta = {'python': '3.11.7', 'platform': 'Linux', 'cpus': 8}
+    assert suite.machine_differences({'meta': meta}, {'meta': meta}) == []
+    assert suite.machine_differences({'meta': meta}, {'meta': {**meta, 'cpus': 2}}) == ['cpus: 8 -> 2']
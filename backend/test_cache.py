@@ -0,0 +1,75 @@
+from services.cache import AnalysisCache
+
+ARTICLE = {"title": "Budget 2024", "content": "The Finance Minister presented the budget.", "url": "a"}
+RESULT = {"title": "Budget 2024", "topic": "politics", "sentiment": 0.1}
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_key_ignores_whitespace_but_not_version():
+    reflowed = dict(ARTICLE, content="The Finance  Minister\npresented the budget. ")
+    assert AnalysisCache.key(ARTICLE, "v1") == AnalysisCache.key(reflowed, "v1")
+    assert AnalysisCache.key(ARTICLE, "v1") != AnalysisCache.key(ARTICLE, "v2")
+
+def test_hit_returns_a_copy():
+    cache = AnalysisCache()
+    key = cache.key(ARTICLE)
+    assert cache.get(key) is None
+    cache.set(key, RESULT)
+    hit = cache.get(key)
+    hit["url"] = "mutated"
+    assert cache.get(key) == RESULT
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+def test_lru_eviction():
+    cache = AnalysisCache(max_entries=2)
+    cache.set("a", RESULT)
+    cache.set("b", RESULT)
+    cache.get("a")
+    cache.set("c", RESULT)
+    assert cache.get("b") is None
+    assert cache.get("a") == RESULT
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = AnalysisCache(ttl=60, clock=clock)
+    cache.set("a", RESULT)
+    clock.now += 61
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    AnalysisCache(path=path).set("a", RESULT)
+    cache = AnalysisCache(path=path)
+    assert cache.get("a") == RESULT
+    assert cache.get("a") == RESULT
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["hits"] == 1
+
+def test_disk_tier_is_bounded(tmp_path):
+    cache = AnalysisCache(max_entries=1, path=str(tmp_path / "cache.sqlite"), clock=Clock(),
+                          max_disk_entries=3, prune_every=2)
+    for key in "abcdef":
+        cache.clock.now += 1
+        cache.set(key, RESULT)
+    # Pruned after the 2nd, 4th and 6th writes, oldest rows first
+    assert cache.get("b") is None and cache.get("c") is None
+    assert cache.get("d") == RESULT
+    assert cache.stats()["disk_evictions"] == 3
+
+def test_expired_rows_are_pruned_without_being_read(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    clock = Clock()
+    cache = AnalysisCache(ttl=60, path=path, clock=clock, prune_every=1)
+    cache.set("old", RESULT)
+    clock.now += 61
+    cache.set("new", RESULT)
+    assert cache.stats()["disk_expirations"] == 1
+    assert [row[0] for row in cache._db.execute("SELECT key FROM analysis_cache")] == ["new"]
@@ -0,0 +1,104 @@
+from services.dedup import NearDuplicateIndex, analyze_deduplicated
+from services.scraper import NewsScraper
+
+SAMPLES = NewsScraper().sample_articles
+
+def rewrite(article, url):
+    """A wire-story copy: same body, lightly edited, different outlet."""
+    content = article['content'].replace('remarkable', 'strong').replace('Several', 'Many')
+    return {'title': article['title'] + ' | Outlet B', 'content': content + '\nReported by PTI.', 'url': url}
+
+class CountingAnalyzer:
+    def __init__(self):
+        self.analyzed = []
+
+    def analyze_article(self, article, entity_mode=None):
+        self.analyzed.append(article['url'])
+        return {'title': article['title'], 'topic': 'business', 'summary': article['content'][:20],
+                'sentiment': 0.5, 'entities': {'people': [], 'locations': ['India']}}
+
+    def analyze_many(self, articles, pool=None, entity_mode=None):
+        return (self.analyze_article(article) for article in articles)
+
+def test_near_duplicates_share_a_cluster():
+    index = NearDuplicateIndex()
+    assert index.add(SAMPLES[0]['url'], SAMPLES[0]['content']) is None
+    assert index.add(SAMPLES[1]['url'], SAMPLES[1]['content']) is None
+    copy = rewrite(SAMPLES[0], 'https://other.example/economy')
+    assert index.add(copy['url'], copy['content']) == SAMPLES[0]['url']
+    assert index.stats()['clusters'] == 2
+    assert index.stats()['skipped_analyses'] == 1
+
+def test_readding_an_article_is_not_a_duplicate():
+    index = NearDuplicateIndex()
+    index.add(SAMPLES[0]['url'], SAMPLES[0]['content'])
+    assert index.add(SAMPLES[0]['url'], SAMPLES[0]['content']) is None
+
+def test_duplicates_reuse_the_representative_analysis():
+    analyzer = CountingAnalyzer()
+    articles = SAMPLES + [rewrite(SAMPLES[2], 'https://other.example/agri')]
+    results = analyze_deduplicated(analyzer, articles, NearDuplicateIndex())
+    assert analyzer.analyzed == [article['url'] for article in SAMPLES]
+    assert results[3]['title'] == articles[3]['title']
+    assert results[3]['summary'] == results[2]['summary']
+
+def test_index_persists_across_runs(tmp_path):
+    path = str(tmp_path / 'dedup.sqlite')
+    NearDuplicateIndex(path).add(SAMPLES[0]['url'], SAMPLES[0]['content'])
+    index = NearDuplicateIndex(path)
+    copy = rewrite(SAMPLES[0], 'https://other.example/economy')
+    assert index.add(copy['url'], copy['content']) == SAMPLES[0]['url']
+
+    stored = {'title': 'x', 'topic': 'business', 'summary': 'from store', 'sentiment': 0.1, 'entities': {}}
+    analyzer = CountingAnalyzer()
+    another = rewrite(SAMPLES[0], 'https://third.example/economy')
+    results = analyze_deduplicated(analyzer, [another], index, lookup=lambda url: stored)
+    assert analyzer.analyzed == []
+    assert results[0]['summary'] == 'from store'
+
+def test_changed_article_leaves_its_cluster(tmp_path):
+    path = str(tmp_path / 'dedup.sqlite')
+    index = NearDuplicateIndex(path)
+    index.add(SAMPLES[0]['url'], SAMPLES[0]['content'])
+    copy = rewrite(SAMPLES[0], 'https://other.example/economy')
+    assert index.add(copy['url'], copy['content']) == SAMPLES[0]['url']
+
+    # The copy is replaced by an unrelated story, then by another copy of SAMPLES[2]
+    assert index.add(copy['url'], SAMPLES[1]['content']) is None
+    assert NearDuplicateIndex(path).add(copy['url'], SAMPLES[1]['content']) is None
+    assert index.add(copy['url'], rewrite(SAMPLES[2], copy['url'])['content']) is None
+    assert index.add(SAMPLES[2]['url'], SAMPLES[2]['content']) == copy['url']
+
+def test_changed_representative_hands_its_cluster_to_a_member():
+    index = NearDuplicateIndex()
+    index.add(SAMPLES[0]['url'], SAMPLES[0]['content'])
+    first = rewrite(SAMPLES[0], 'https://b.example/economy')
+    second = rewrite(SAMPLES[0], 'https://c.example/economy')
+    index.add(first['url'], first['content'])
+    index.add(second['url'], second['content'])
+
+    assert index.add(SAMPLES[0]['url'], SAMPLES[1]['content']) is None
+    assert index.add(first['url'], first['content']) is None
+    assert index.add(second['url'], second['content']) == first['url']
+    assert index.stats()['clusters'] == 2
+
+def test_cluster_handoff_is_persisted(tmp_path):
+    path = str(tmp_path / 'dedup.sqlite')
+    index = NearDuplicateIndex(path)
+    first = rewrite(SAMPLES[0], 'https://b.example/economy')
+    second = rewrite(SAMPLES[0], 'https://c.example/economy')
+    index.deduplicate([SAMPLES[0], first, second])
+    index.add(SAMPLES[0]['url'], SAMPLES[1]['content'])
+
+    reloaded = NearDuplicateIndex(path)
+    assert reloaded.clusters == index.clusters
+    assert reloaded.members == {SAMPLES[0]['url']: {SAMPLES[0]['url']: None},
+                                first['url']: {first['url']: None, second['url']: None}}
+
+def test_deduplicate_commits_once_per_pass(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / 'dedup.sqlite'))
+    statements = []
+    index._db.set_trace_callback(statements.append)
+    index.deduplicate(SAMPLES + [rewrite(SAMPLES[0], 'https://b.example/economy')])
+    assert [statement for statement in statements if statement == 'COMMIT'] == ['COMMIT']
+    assert len(NearDuplicateIndex(str(tmp_path / 'dedup.sqlite')).signatures) == 4
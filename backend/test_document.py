@@ -0,0 +1,82 @@
+import os
+import pytest
+from services.nltk_data import NLTK_RESOURCES, missing_resources, use_bundle
+from services.scraper import NewsScraper
+
+pytestmark = pytest.mark.skipif(bool(missing_resources({'punkt': NLTK_RESOURCES['punkt']}))
+                                and not os.environ.get('REQUIRE_NLTK_DATA'),
+                                reason='punkt is not in the NLTK data bundle')
+
+SAMPLES = NewsScraper().sample_articles
+STOP_WORDS = {'the', 'a', 'of', 'and', 'in', 'to', 'with', 'by'}
+
+@pytest.fixture
+def nltk():
+    use_bundle()
+    import nltk
+    return nltk
+
+def document(text, tagger=None):
+    from services.document import AnalysisDocument
+    return AnalysisDocument(text, STOP_WORDS, tagger)
+
+@pytest.mark.parametrize('article', SAMPLES, ids=lambda article: article['url'].rsplit('/', 1)[-1])
+def test_views_match_the_per_stage_tokenization(nltk, article):
+    from nltk.tokenize import sent_tokenize, word_tokenize
+    text = article['content']
+    doc = document(text)
+    sentences = sent_tokenize(text)
+    assert doc.sentences == sentences
+    # What the summary and entity stages tokenized per sentence
+    assert doc.sentence_tokens == [word_tokenize(sentence) for sentence in sentences]
+    assert doc.sentence_lengths == [len(word_tokenize(sentence)) for sentence in sentences]
+    assert doc.tokens == [token for sentence in doc.sentence_tokens for token in sentence]
+    # What the topic and keyword stages tokenized over the lowercased text. That split
+    # lowercased sentences, so list markers like "1." stayed one token and were dropped;
+    # the shared tokens keep them as "1", otherwise the words are the same
+    assert [word for word in doc.content_words if word.isalpha()] == \
+           [word for word in word_tokenize(text.lower()) if word.isalpha() and word not in STOP_WORDS]
+
+def test_preserve_line_only_skips_the_second_sentence_split(nltk):
+    from nltk.tokenize import word_tokenize
+    doc = document("GDP grew 8.4% in Q4. Mr. Sharma said exports rose. Will it last?")
+    assert len(doc.sentences) == len(doc.sentence_tokens) == len(doc.sentence_lengths)
+    for sentence, tokens in zip(doc.sentences, doc.sentence_tokens):
+        assert tokens == word_tokenize(sentence)
+        assert tokens[-1] in ('.', '?')
+    # Without the punkt split first, inner sentence-final periods stay glued to their words
+    assert 'Q4.' in word_tokenize(' '.join(doc.sentences), preserve_line=True)
+    assert 'Q4' in doc.tokens
+
+def test_views_are_computed_once_and_shared(nltk, monkeypatch):
+    import nltk.tokenize
+    calls = {'word_tokenize': 0, 'tagger': 0}
+    word_tokenize = nltk.tokenize.word_tokenize
+
+    def counting_word_tokenize(*args, **kwargs):
+        calls['word_tokenize'] += 1
+        return word_tokenize(*args, **kwargs)
+
+    class Tagger:
+        def tag(self, tokens):
+            return [(token, 'NN') for token in tokens]
+
+    def load_tagger():
+        calls['tagger'] += 1
+        return Tagger()
+
+    monkeypatch.setattr(nltk.tokenize, 'word_tokenize', counting_word_tokenize)
+    doc = document(SAMPLES[0]['content'], load_tagger)
+    assert calls == {'word_tokenize': len(doc.sentences), 'tagger': 0}
+    for _ in range(2):
+        # Topic, keyword, summary and entity stages all read from the same views
+        assert doc.content_words is doc.content_words
+        assert doc.tokens is doc.tokens
+        doc.sentence_lengths
+        doc.tagged_sentences
+    assert calls == {'word_tokenize': len(doc.sentences), 'tagger': 1}
+    assert [len(tagged) for tagged in doc.tagged_sentences] == doc.sentence_lengths
+
+def test_tags_need_a_tagger(nltk):
+    with pytest.raises(ValueError):
+        document("No tagger here.").tagged_sentences
@@ -0,0 +1,25 @@
+from services.entities import Gazetteer, TokenAutomaton
+
+def test_automaton_finds_overlapping_patterns_in_one_pass():
+    automaton = TokenAutomaton()
+    for pattern in [('a', 'b'), ('b', 'c'), ('a', 'b', 'c', 'd'), ('c',)]:
+        automaton.add(pattern, ' '.join(pattern))
+    automaton.build()
+    found = sorted(automaton.finditer(['x', 'a', 'b', 'c', 'd']))
+    assert found == [(1, 3, 'a b'), (1, 5, 'a b c d'), (2, 4, 'b c'), (3, 4, 'c')]
+
+def test_gazetteer_prefers_longest_match_and_resolves_aliases():
+    gazetteer = Gazetteer({'people': ['Narendra Modi'], 'locations': ['Delhi', 'New Delhi'],
+                           'aliases': {'PM Modi': 'Narendra Modi', 'Modi': 'Narendra Modi'}})
+    tokens = 'PM Modi flew to New Delhi , where Modi met Delhi officials'.split()
+    assert gazetteer.extract(tokens) == {'people': ['Narendra Modi'], 'locations': ['New Delhi', 'Delhi']}
+
+def test_gazetteer_matching_is_case_sensitive():
+    gazetteer = Gazetteer({'people': [], 'locations': ['Kerala']})
+    assert gazetteer.extract('kerala Kerala'.split()) == {'people': [], 'locations': ['Kerala']}
+
+def test_bundled_gazetteer_loads():
+    gazetteer = Gazetteer.from_file()
+    assert gazetteer.size > 100
+    entities = gazetteer.extract('Virat Kohli scored in Mumbai'.split())
+    assert entities == {'people': ['Virat Kohli'], 'locations': ['Mumbai']}
@@ -0,0 +1,81 @@
+import sqlite3
+import pytest
+from fastapi.testclient import TestClient
+import main
+from services.container import ServiceContainer
+from services.store import ArticleStore
+from test_main import FakeAnalyzer
+from services.export import ArticleWriter, export_store, iter_articles, iter_batches, reanalyze
+
+def make_store(count=25):
+    store = ArticleStore()
+    for i in range(count):
+        article = {'url': f'https://example.com/{i}', 'title': f'Story {i}', 'content': f'Body of story {i}.'}
+        analysis = {'title': article['title'], 'topic': 'business' if i % 2 else 'sports',
+                    'summary': article['content'], 'sentiment': i / 100,
+                    'entities': {'people': [f'Person {i}'], 'locations': []}}
+        store.upsert('alpha', article, analysis)
+    return store
+
+@pytest.mark.parametrize('suffix', ['parquet', 'arrow'])
+def test_store_export_round_trips_in_batches(tmp_path, suffix):
+    store = make_store()
+    path = str(tmp_path / f'articles.{suffix}')
+    assert export_store(store, path, suffix, batch_size=10, content=True) == 25
+
+    batches = list(iter_batches(path, batch_size=10))
+    assert [batch.num_rows for batch in batches] == [10, 10, 5]
+    rows = [row for rows in iter_articles(path, batch_size=10) for row in rows]
+    expected = [item for items in store.iter_rows(content=True) for item in items]
+    assert [row['url'] for row in rows] == [item['url'] for item in expected]
+    assert rows[3]['entities'] == {'people': ['Person 3'], 'locations': []}
+    assert rows[3]['content'] == 'Body of story 3.'
+    assert rows[3]['published'] == pytest.approx(expected[3]['published'], abs=0.001)
+
+def test_export_filters_and_column_selection(tmp_path):
+    path = str(tmp_path / 'business.parquet')
+    assert export_store(make_store(), path, topic='business') == 12
+    batch = next(iter_batches(path, columns=['url', 'sentiment']))
+    assert batch.schema.names == ['url', 'sentiment']
+
+def test_reanalyze_needs_content(tmp_path):
+    store = make_store(5)
+    without = str(tmp_path / 'plain.arrow')
+    export_store(store, without, 'arrow')
+    with pytest.raises(ValueError):
+        reanalyze(FakeAnalyzer(), without, str(tmp_path / 'out.arrow'))
+
+    source = str(tmp_path / 'full.arrow')
+    export_store(store, source, 'arrow', content=True)
+    assert reanalyze(FakeAnalyzer(), source, str(tmp_path / 'out.parquet'), 'parquet', batch_size=2) == 5
+    rows = [row for rows in iter_articles(str(tmp_path / 'out.parquet')) for row in rows]
+    assert {row['topic'] for row in rows} == {'general'}
+    assert rows[0]['source'] == 'alpha'
+
+def test_writer_accepts_file_objects(tmp_path):
+    with open(tmp_path / 'one.parquet', 'wb') as f, ArticleWriter(f) as writer:
+        writer.write({'url': 'u', 'title': 't', 'entities': {}, 'published': None})
+    assert next(iter_articles(str(tmp_path / 'one.parquet')))[0]['entities'] == {'people': [], 'locations': []}
+
+def test_store_adds_content_column_to_old_databases(tmp_path):
+    path = str(tmp_path / 'old.sqlite')
+    db = sqlite3.connect(path)
+    db.execute('CREATE TABLE articles (id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, source TEXT NOT NULL, '
+               'title TEXT NOT NULL, topic TEXT NOT NULL, summary TEXT NOT NULL, sentiment REAL NOT NULL, '
+               'entities TEXT NOT NULL, content_hash TEXT NOT NULL, published REAL NOT NULL)')
+    db.execute("INSERT INTO articles VALUES (1, 'u', 's', 't', 'general', '', 0, '{}', 'h', 0)")
+    db.commit()
+    db.close()
+    store = ArticleStore(path)
+    assert next(store.iter_rows(content=True))[0]['content'] == ''
+
+def test_export_endpoint_returns_parquet(tmp_path):
+    main.app.state.services = ServiceContainer(analyzer_factory=FakeAnalyzer, store_factory=lambda: make_store(3))
+    with TestClient(main.app) as client:
+        response = client.get('/articles/export', params={'content': 'true'})
+        assert response.status_code == 200
+        assert response.headers['x-article-count'] == '3'
+        assert response.headers['content-type'] == 'application/vnd.apache.parquet'
+        (tmp_path / 'download.parquet').write_bytes(response.content)
+        rows = next(iter_articles(str(tmp_path / 'download.parquet')))
+        assert [row['title'] for row in rows] == ['Story 0', 'Story 1', 'Story 2']
@@ -0,0 +1,189 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+import main
+from services.analyzer import NewsAnalyzer
+from services.container import ServiceContainer
+from services.entities import Gazetteer
+from services.store import ArticleStore
+from services.scraper import NewsScraper
+
+class FakeAnalyzer:
+    """Stands in for NewsAnalyzer so the API can be tested without NLTK data."""
+
+    sentiment_mode = 'exact'
+
+    def analyze_article(self, article_data, entity_mode=None):
+        entities = {"people": [], "locations": []}
+        if entity_mode == "fast":
+            entities = Gazetteer.from_file().extract(article_data["content"].split())
+        return {
+            "title": article_data["title"],
+            "topic": "general",
+            "summary": article_data["content"][:50],
+            "sentiment": 0.0,
+            "entities": entities,
+            "keywords": article_data["content"].lower().split()[:3],
+            "stages": {"summary": 0.001}
+        }
+
+    analyze_many = NewsAnalyzer.analyze_many
+
+def make_client(analyzer_factory=FakeAnalyzer, batch_workers=None):
+    main.app.state.services = ServiceContainer(scraper_factory=NewsScraper,
+                                               analyzer_factory=analyzer_factory,
+                                               batch_workers=batch_workers,
+                                               store_factory=ArticleStore)
+    return TestClient(main.app)
+
+def test_ready_reports_warmup_time():
+    with make_client() as client:
+        response = client.get("/ready")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["ready"] is True
+        assert body["warmup_seconds"] >= 0
+
+def test_ready_is_503_when_warmup_fails():
+    def broken():
+        raise LookupError("missing vader_lexicon")
+
+    with make_client(broken) as client:
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert "vader_lexicon" in response.json()["error"]
+        assert client.get("/analyze-news").status_code == 503
+
+def test_analyze_news_reuses_services():
+    with make_client() as client:
+        analyzer = main.app.state.services.analyzer
+        response = client.get("/analyze-news")
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+        assert main.app.state.services.analyzer is analyzer
+
+def test_batch_analysis_keeps_submission_order_across_workers():
+    articles = [{"title": f"Story {i}", "content": f"Body of story {i}", "url": f"https://example.com/{i}"}
+                for i in range(40)]
+    with make_client(batch_workers=2) as client:
+        response = client.post("/analyze/batch", json={"articles": articles})
+        assert response.status_code == 200
+        results = response.json()
+        assert [r["title"] for r in results] == [a["title"] for a in articles]
+        assert [r["url"] for r in results] == [a["url"] for a in articles]
+
+def test_batch_entity_mode_reaches_pool_workers():
+    articles = [{"title": "Visit", "content": "Narendra Modi met officials in New Delhi", "url": "https://example.com/v"}]
+    with make_client(batch_workers=2) as client:
+        response = client.post("/analyze/batch", json={"articles": articles, "entity_mode": "fast"})
+        assert response.status_code == 200
+        assert response.json()[0]["entities"]["locations"] == ["New Delhi"]
+        response = client.post("/analyze/batch", json={"articles": articles, "entity_mode": "slow"})
+        assert response.status_code == 422
+
+def test_profile_attaches_stage_breakdown():
+    articles = [{"title": "Story", "content": "Body of the story", "url": "https://example.com/s"}]
+    with make_client() as client:
+        plain = client.post("/analyze/batch", json={"articles": articles}).json()[0]
+        assert "stages" not in plain
+        profiled = client.get("/analyze-news", params={"profile": "true"}).json()[0]
+        assert profiled["stages"] == {"summary": 0.001}
+
+def test_metrics_exposes_request_histograms():
+    with make_client() as client:
+        client.get("/ready")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert '# TYPE http_request_duration_seconds histogram' in response.text
+        assert 'http_request_duration_seconds_count{method="GET",route="/ready",status="200"}' in response.text
+
+def test_sources_health_lists_every_source():
+    with make_client() as client:
+        sources = client.get("/sources/health").json()["sources"]
+    assert set(sources) == {"timesofindia", "thehindu", "hindustantimes"}
+    assert sources["thehindu"]["host"] == "www.thehindu.com"
+    assert sources["thehindu"]["state"] == "closed"
+
+def test_stream_yields_one_ndjson_line_per_article():
+    with make_client() as client:
+        response = client.get("/analyze-news/stream")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["url"] for line in lines] == [a["url"] for a in NewsScraper().sample_articles]
+
+def test_stream_sse_format_ends_with_done_event():
+    with make_client() as client:
+        response = client.get("/analyze-news/stream", params={"format": "sse"})
+        events = response.text.strip().split("\n\n")
+        assert len(events) == 4
+        assert events[0].startswith("data: ")
+        assert events[-1].startswith("event: done")
+
+def test_disconnect_with_a_full_queue_stops_the_producer():
+    services = SimpleNamespace(scraper=NewsScraper(), analyzer=FakeAnalyzer(), dedup=None)
+
+    async def run():
+        stream = main.iter_article_analyses(services, live=False, max_pending=1)
+        await stream.__anext__()
+        await asyncio.sleep(0.1)  # The producer fills the queue and blocks on put
+        await stream.aclose()
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+
+def test_stream_rejects_unbounded_max_pending():
+    with make_client() as client:
+        assert client.get("/analyze-news/stream", params={"max_pending": 1000}).status_code == 422
+        assert client.get("/analyze-news/stream", params={"max_pending": 0}).status_code == 422
+
+def test_live_stream_scrapes_concurrently(stub_news_server):
+    def scraper_factory():
+        scraper = NewsScraper(timeout=5)
+        scraper.news_sources = stub_news_server.news_sources()
+        return scraper
+
+    main.app.state.services = ServiceContainer(scraper_factory=scraper_factory,
+                                               analyzer_factory=FakeAnalyzer,
+                                               store_factory=ArticleStore)
+    with TestClient(main.app) as client:
+        response = client.get("/analyze-news/stream", params={"live": "true", "max_pending": 1})
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 15
+        assert all(line["url"].startswith(stub_news_server.base_url) for line in lines)
+
+def test_ingested_articles_are_served_from_the_store(stub_news_server):
+    def scraper_factory():
+        scraper = NewsScraper(timeout=5)
+        scraper.news_sources = stub_news_server.news_sources()
+        return scraper
+
+    main.app.state.services = ServiceContainer(scraper_factory=scraper_factory,
+                                               analyzer_factory=FakeAnalyzer,
+                                               store_factory=ArticleStore)
+    with TestClient(main.app) as client:
+        assert client.get("/articles").json()["total"] == 0
+        stored = client.post("/ingest/run").json()["stored"]
+        assert stored == {"alpha": 5, "beta": 5, "gamma": 5}
+        # Unchanged articles are not analyzed again
+        assert client.post("/ingest/run", params={"source": "alpha"}).json()["stored"] == {"alpha": 0}
+
+        requests_before = len(stub_news_server.requests)
+        page = client.get("/articles", params={"source": "beta", "limit": 2, "offset": 1}).json()
+        assert page["total"] == 5
+        assert len(page["items"]) == 2
+        assert page["items"][0]["topic"] == "general"
+        assert client.get("/articles", params={"topic": "sports"}).json()["total"] == 0
+        assert client.get("/articles", params={"since": "2100-01-01T00:00:00"}).json()["total"] == 0
+        assert len(stub_news_server.requests) == requests_before
+
+        status = client.get("/ingest/status").json()
+        assert status["enabled"] is False
+        assert status["sources"]["alpha"]["runs"] == 2
+
+        trends = client.get("/trends", params={"topic": "general", "limit": 3}).json()
+        assert trends["articles"] == 15
+        assert len(trends["keywords"]) == 3
+        assert client.get("/trends", params={"topic": "sports"}).json()["keywords"] == []
@@ -0,0 +1,39 @@
+import asyncio
+from services.metrics import (SCRAPER_FETCH_SECONDS, SCRAPER_PARSE_SECONDS, Histogram,
+                              MetricsRegistry, StageTimer)
+from services.scraper import NewsScraper
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('stage_seconds', 'Stage time', ('stage',), buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.01, 0.05, 2.0):
+        histogram.observe(seconds, stage='summary')
+    lines = registry.render().splitlines()
+    assert lines[:2] == ['# HELP stage_seconds Stage time', '# TYPE stage_seconds histogram']
+    assert 'stage_seconds_bucket{stage="summary",le="0.01"} 2' in lines
+    assert 'stage_seconds_bucket{stage="summary",le="0.1"} 3' in lines
+    assert 'stage_seconds_bucket{stage="summary",le="+Inf"} 4' in lines
+    assert 'stage_seconds_count{stage="summary"} 4' in lines
+    assert histogram.count(stage='summary') == 4
+
+def test_label_values_are_escaped():
+    histogram = Histogram('h', 'help', ('route',), buckets=(1.0,))
+    histogram.observe(0.5, route='a"b\\c')
+    assert 'h_count{route="a\\"b\\\\c"} 1' in histogram.render()
+
+def test_stage_timer_keeps_breakdown_and_observes():
+    histogram = Histogram('h', 'help', ('stage',))
+    timer = StageTimer(histogram)
+    with timer.stage('topic'):
+        pass
+    assert list(timer.stages) == ['topic']
+    assert histogram.count(stage='topic') == 1
+
+def test_scraper_records_fetch_and_parse_time_per_source(stub_news_server):
+    scraper = NewsScraper(timeout=5, fetch_cache=None)
+    scraper.news_sources = stub_news_server.news_sources()
+    fetched = SCRAPER_FETCH_SECONDS.count(source='gamma', page='article')
+    parsed = SCRAPER_PARSE_SECONDS.count(source='gamma', page='front', parser=scraper.parser.name)
+    asyncio.run(scraper.scrape_sources_async(['gamma']))
+    assert SCRAPER_FETCH_SECONDS.count(source='gamma', page='article') == fetched + 5
+    assert SCRAPER_PARSE_SECONDS.count(source='gamma', page='front', parser=scraper.parser.name) == parsed + 1
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+from services.nltk_data import NLTK_RESOURCES
+
+BACKEND = os.path.dirname(os.path.abspath(__file__))
+
+def _python(code, nltk_data):
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND, capture_output=True, text=True,
+                            env={**os.environ, 'NLTK_DATA': str(nltk_data)})
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+def _stub_bundle(root):
+    for path in NLTK_RESOURCES.values():
+        os.makedirs(root / path)
+
+def test_importing_the_app_skips_heavy_dependencies(tmp_path):
+    loaded = _python("import sys, main\n"
+                     "print(' '.join(m for m in ('nltk', 'bs4', 'requests', 'scipy') if m in sys.modules))",
+                     tmp_path)
+    assert loaded.strip() == ''
+
+def test_cached_analysis_does_not_import_nltk(tmp_path):
+    _stub_bundle(tmp_path)
+    loaded = _python(
+        "import sys\n"
+        "from services.analyzer import NewsAnalyzer\n"
+        "from services.cache import AnalysisCache\n"
+        "analyzer = NewsAnalyzer(cache=AnalysisCache())\n"
+        "article = {'title': 'T', 'content': 'Cached text.', 'url': 'u'}\n"
+        "key = analyzer.cache.key(article, f'{analyzer.config_version}:accurate')\n"
+        "analyzer.cache.set(key, {'sentiment': 'neutral'})\n"
+        "assert analyzer.analyze_article(article)['sentiment'] == 'neutral'\n"
+        "print('nltk' in sys.modules)",
+        tmp_path)
+    assert loaded.strip() == 'False'
+
+def test_missing_bundle_is_reported(tmp_path):
+    out = _python("from services.analyzer import NewsAnalyzer\n"
+                  "try:\n"
+                  "    NewsAnalyzer()\n"
+                  "except LookupError as e:\n"
+                  "    print(e)\n",
+                  tmp_path)
+    assert 'vader_lexicon' in out and 'services.nltk_data fetch' in out
+
+def test_verify_checks_lock_file(tmp_path):
+    bundle, lock_file = tmp_path / 'bundle', tmp_path / 'bundle.lock.json'
+    _stub_bundle(bundle)
+    (bundle / 'corpora' / 'stopwords' / 'english').write_text('the\n')
+    verify = f"from services import nltk_data; print(nltk_data.verify(lock_file={str(lock_file)!r}))"
+    assert 'missing lock file' in _python(verify, bundle)
+    _python(f"from services import nltk_data; nltk_data.lock({str(lock_file)!r})", bundle)
+    assert _python(verify, bundle).strip() == '[]'
+    lock = json.loads(lock_file.read_text())
+    assert list(lock) == [os.path.join('corpora', 'stopwords', 'english')]
+
+    (bundle / 'corpora' / 'stopwords' / 'english').write_text('changed\n')
+    (bundle / 'corpora' / 'stopwords' / 'french').write_text('le\n')
+    out = _python(verify, bundle)
+    assert 'checksum mismatch' in out and 'file not in lock' in out
+
+def test_fetch_checks_the_download_against_the_lock(tmp_path):
+    bundle, lock_file = tmp_path / 'bundle', tmp_path / 'bundle.lock.json'
+    _stub_bundle(bundle)
+    lock_file.write_text(json.dumps({os.path.join('corpora', 'stopwords', 'english'): 'pinned'}))
+    out = _python("import nltk\n"
+                  "from services import nltk_data\n"
+                  "def download(package, download_dir, quiet):\n"
+                  "    with open(download_dir + '/corpora/stopwords/english', 'w') as f:\n"
+                  "        f.write('upstream changed')\n"
+                  "    return True\n"
+                  "nltk.download = download\n"
+                  f"print(nltk_data.fetch(lock_file={str(lock_file)!r}))",
+                  bundle)
+    assert 'checksum mismatch' in out
+    assert json.loads(lock_file.read_text()) == {os.path.join('corpora', 'stopwords', 'english'): 'pinned'}
+
+def test_first_fetch_writes_the_lock_file(tmp_path):
+    bundle, lock_file = tmp_path / 'bundle', tmp_path / 'bundle.lock.json'
+    _stub_bundle(bundle)
+    out = _python("import nltk\n"
+                  "from services import nltk_data\n"
+                  "def download(package, download_dir, quiet):\n"
+                  "    with open(download_dir + '/corpora/stopwords/english', 'w') as f:\n"
+                  "        f.write('the')\n"
+                  "    return True\n"
+                  "nltk.download = download\n"
+                  f"print(nltk_data.fetch(lock_file={str(lock_file)!r}))",
+                  bundle)
+    assert 'commit it' in out and out.strip().endswith('[]')
+    assert list(json.loads(lock_file.read_text())) == [os.path.join('corpora', 'stopwords', 'english')]
+
+def test_bundle_is_the_first_nltk_data_entry(tmp_path):
+    nltk_data = os.pathsep.join([str(tmp_path / 'first'), str(tmp_path / 'second')])
+    out = _python("from services import nltk_data; print(nltk_data.NLTK_DATA_DIR)", nltk_data)
+    assert out.strip() == str(tmp_path / 'first')
@@ -0,0 +1,77 @@
+import pytest
+from benchmarks.stub_server import StubNewsServer
+from services.parsers import available_parsers, detect_encoding, get_parser
+
+CONFIG = {
+    'url': 'http://example.com/',
+    'article_selector': '.main-content .article',
+    'title_selector': 'h1',
+    'content_selector': '.article-body'
+}
+
+@pytest.fixture(scope='module')
+def pages():
+    stub = StubNewsServer()
+    return {
+        'front': stub.render('/alpha/')['body'].encode('utf-8'),
+        'article': stub.render('/alpha/article/3')['body'].encode('utf-8')
+    }
+
+@pytest.mark.parametrize('name', available_parsers())
+def test_backends_agree_with_html_parser(name, pages):
+    reference = get_parser('html.parser')
+    parser = get_parser(name)
+    assert parser.article_links(pages['front'], 'utf-8', CONFIG) == \
+        reference.article_links(pages['front'], 'utf-8', CONFIG)
+    title, content = parser.article(pages['article'], 'utf-8', CONFIG)
+    assert (title, content) == reference.article(pages['article'], 'utf-8', CONFIG)
+    assert title == 'Alpha story 3'
+    assert 'Copyright' not in content
+
+@pytest.mark.parametrize('name', available_parsers())
+def test_paragraph_fallback(name):
+    page = b'<html><body><h2>Headline</h2><div><p>One.</p><p>Two.</p></div></body></html>'
+    assert get_parser(name).article(page, 'utf-8', CONFIG) == ('Headline', 'One. Two.')
+
+@pytest.mark.parametrize('name', available_parsers())
+def test_decodes_from_bytes(name):
+    page = '<html><head><meta charset="windows-1252"></head><body><h1>Café</h1></body></html>'
+    body = page.encode('windows-1252')
+    encoding = detect_encoding(body)
+    assert encoding == 'cp1252'
+    assert get_parser(name).article(body, encoding, CONFIG)[0] == 'Café'
+
+def test_header_charset_wins():
+    assert detect_encoding(b'<meta charset="utf-8">', 'text/html; charset=ISO-8859-1') == 'iso8859-1'
+    assert detect_encoding(b'<p>no hints</p>') == 'utf-8'
+
+PAGES = [
+    b'<html><body><h1>Title</h1><div class="article-body"><p>Body.</p><script>x()</script></div>'
+    b'<div class="comments">' + b'<p>Comment.</p>' * 2000 + b'</div></body></html>',
+    # Content before the title, and a nested match that comes second in document order
+    b'<html><body><div class="content"><div class="article-body"><p>Inner.</p></div><p>Outer.</p></div>'
+    b'<h1 class="title">Late title</h1></body></html>',
+    # Empty title element: falls back to h2 anywhere on the page
+    b'<html><body><h1> </h1><div class="article-body">Body.</div><h2>Sub</h2></body></html>',
+    # No content match: falls back to every paragraph
+    b'<html><body><h1>T</h1><p>One.</p><div class="comments"><p>Two.</p></div></body></html>',
+]
+PARTIAL_CONFIGS = [CONFIG, {**CONFIG, 'title_selector': 'h1.title, h1', 'content_selector': '.content, .article-body'},
+                   {**CONFIG, 'content_selector': 'body > .article-body'}, {**CONFIG, 'title_selector': ''},
+                   {**CONFIG, 'content_selector': 'div:last-child'}]
+
+@pytest.mark.skipif('lxml' not in available_parsers(), reason='lxml is not installed')
+@pytest.mark.parametrize('config', PARTIAL_CONFIGS)
+@pytest.mark.parametrize('page', PAGES)
+def test_lxml_partial_matches_full_parse(page, config):
+    from services.parsers import LxmlParser
+    partial = LxmlParser(partial=True, chunk_size=64)
+    assert partial.article(page, 'utf-8', config) == get_parser('lxml').article(page, 'utf-8', config)
+
+@pytest.mark.skipif('lxml' not in available_parsers(), reason='lxml is not installed')
+def test_lxml_partial_stops_after_the_content():
+    from services.parsers import LxmlParser
+    parser = LxmlParser(partial=True, chunk_size=64)
+    assert parser._streamed_article(PAGES[0], 'utf-8', CONFIG) == ('Title', 'Body.', None)
+    # The empty h1 needs the rest of the page
+    assert parser._streamed_article(PAGES[2], 'utf-8', CONFIG)[2] is not None
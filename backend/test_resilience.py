@@ -0,0 +1,84 @@
+import asyncio
+from services.resilience import AdaptiveLimiter, CircuitBreaker, CircuitOpenError, HostControls, TokenBucket
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+    clock.now = 10
+    assert bucket.reserve() == 0
+
+def test_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 30
+
+    clock.now = 31
+    assert breaker.allow()  # The probe
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.trips == 2
+
+    clock.now = 62
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+def test_limiter_backs_off_and_recovers():
+    limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=6)
+    limiter.record(0.1, throttled=True)
+    assert limiter.limit == 2
+    limiter.record(1.0)  # Recent latency far above the baseline
+    assert limiter.limit == 1
+    for _ in range(50):
+        limiter.record(0.1)
+    assert limiter.limit == 6
+
+def test_limiter_bounds_concurrency():
+    limiter = AdaptiveLimiter(initial=2)
+    active = []
+    peak = []
+
+    async def task():
+        await limiter.acquire()
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.pop()
+        limiter.release()
+
+    async def run():
+        await asyncio.gather(*(task() for _ in range(8)))
+
+    asyncio.run(run())
+    assert max(peak) == 2
+    assert limiter.in_flight == 0
+
+def test_open_circuit_rejects_without_request():
+    controls = HostControls(failure_threshold=1)
+    control = controls.get('https://news.example.com/a')
+    assert controls.get('https://news.example.com/b') is control
+    control.failed(Exception('timed out'))
+    try:
+        control.check()
+        assert False, 'expected CircuitOpenError'
+    except CircuitOpenError as e:
+        assert 'news.example.com' in str(e)
+    health = control.health()
+    assert health['state'] == 'open'
+    assert health['rejected'] == 1
+    assert health['last_error'] == 'timed out'
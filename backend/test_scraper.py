@@ -0,0 +1,105 @@
+import asyncio
+from services.fetch_cache import FetchCache
+from services.fetcher import AsyncFetcher
+from services.resilience import HostControls
+from services.scraper import NewsScraper
+
+def make_scraper(server):
+    scraper = NewsScraper(timeout=5)
+    scraper.news_sources = server.news_sources()
+    return scraper
+
+def test_async_scrape_fetches_every_source(stub_news_server):
+    scraper = make_scraper(stub_news_server)
+    articles = asyncio.run(scraper.scrape_sources_async())
+    assert len(articles) == 15
+    article = articles[0]
+    assert article['title'] == 'Alpha story 0'
+    assert 'cricket tournament' in article['content']
+    assert 'Copyright' not in article['content']
+
+def test_async_scrape_matches_sync(stub_news_server):
+    scraper = make_scraper(stub_news_server)
+    sync_articles = scraper.scrape_source('beta')
+    async_articles = asyncio.run(scraper.scrape_sources_async(['beta']))
+    assert sync_articles == async_articles
+
+def test_async_scrape_runs_in_parallel(slow_stub_news_server):
+    scraper = make_scraper(slow_stub_news_server)
+    articles = asyncio.run(scraper.scrape_sources_async())
+    assert len(articles) == 15
+    # Each request is held for 50ms, so a sequential scraper never overlaps two
+    assert slow_stub_news_server.peak_in_flight > 1
+
+def test_fetcher_retries_transient_errors(stub_news_server):
+    stub_news_server.failures['/alpha/article/1'] = 2
+    scraper = make_scraper(stub_news_server)
+
+    async def run():
+        async with AsyncFetcher(retries=2, backoff=0.01) as fetcher:
+            return await scraper.scrape_sources_async(['alpha'], fetcher)
+
+    assert len(asyncio.run(run())) == 5
+    assert stub_news_server.requests.count('/alpha/article/1') == 3
+
+def test_failing_source_does_not_fail_the_run(stub_news_server):
+    stub_news_server.failures['/gamma/'] = 10
+    scraper = make_scraper(stub_news_server)
+
+    async def run():
+        async with AsyncFetcher(retries=1, backoff=0.01) as fetcher:
+            return await scraper.scrape_sources_async(fetcher=fetcher)
+
+    articles = asyncio.run(run())
+    assert len(articles) == 10
+    assert not any('Gamma' in article['title'] for article in articles)
+
+def test_conditional_requests_skip_parsing(stub_news_server):
+    stub_news_server.validators = True
+    scraper = make_scraper(stub_news_server)
+    scraper.fetch_cache = FetchCache()
+
+    first = asyncio.run(scraper.scrape_sources_async())
+    second = asyncio.run(scraper.scrape_sources_async())
+    assert first == second
+    assert scraper.fetch_cache.stats()['parsed'] == 18
+    assert scraper.fetch_cache.stats()['not_modified'] == 18
+
+    stub_news_server.revision += 1
+    third = scraper.scrape_source('alpha')
+    assert 'revision 1' in third[0]['content']
+    assert scraper.fetch_cache.stats()['parsed'] == 23
+
+def test_unchanged_body_skips_parsing_without_validators(stub_news_server, tmp_path):
+    path = str(tmp_path / 'fetch.sqlite')
+    scraper = make_scraper(stub_news_server)
+    scraper.fetch_cache = FetchCache(path)
+    first = scraper.scrape_source('alpha')
+
+    # A new scraper reuses the persisted extractions
+    scraper = make_scraper(stub_news_server)
+    scraper.fetch_cache = FetchCache(path)
+    assert scraper.scrape_source('alpha') == first
+    assert scraper.fetch_cache.stats() == {'not_modified': 0, 'unchanged': 6, 'parsed': 0, 'entries': 6}
+
+def test_tripped_host_serves_cached_pages(stub_news_server):
+    scraper = make_scraper(stub_news_server)
+    scraper.fetch_cache = FetchCache()
+    scraper.host_controls = HostControls(failure_threshold=2, reset_timeout=60)
+    first = asyncio.run(scraper.scrape_sources_async())
+
+    for path in stub_news_server.requests:
+        stub_news_server.failures[path] = 100
+    requests_before = len(stub_news_server.requests)
+
+    async def run():
+        async with AsyncFetcher(retries=0, controls=scraper.host_controls) as fetcher:
+            return await scraper.scrape_sources_async(fetcher=fetcher)
+
+    assert asyncio.run(run()) == first
+    # Requests stop once the circuit opens; the rest are answered from the cache
+    assert len(stub_news_server.requests) - requests_before < 18
+    health = scraper.source_health()['alpha']
+    assert health['state'] == 'open'
+    assert health['rejected'] > 0
+    assert scraper.scrape_source('beta') == [article for article in first if 'Beta' in article['title']]
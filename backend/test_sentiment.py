@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from services.sentiment import COMPOUND_TOLERANCE, BatchSentiment
+
+LEXICON = {'good': 1.9, 'great': 3.1, 'bad': -2.5, 'terrible': -2.1, 'win': 2.8, 'loss': -1.3,
+           'death': -2.9, 'kiss': 1.8, 'nice': 1.8, 'hope': 1.9, 'fail': -2.5}
+
+TEXTS = [
+    "The results were good.",
+    "The results were not good, they were TERRIBLE!!!",
+    "The team played extremely well and it was a GREAT win.",
+    "It was kind of good but the loss hurt",
+    "That deal was the kiss of death for the firm.",
+    "Never so good. This is at least nice, and least bad",
+    "good good bad good. Good? Good??",
+    "Is it good??? Is it bad????",
+    "GOOD BAD",
+    "A , ! ?",
+    "",
+    "The shares barely moved; hope isn't lost, \"great\" news (for now)",
+    "we didn't fail, we'll win. good,bad great...",
+]
+
+@pytest.fixture(scope='module')
+def vader(tmp_path_factory):
+    path = tmp_path_factory.mktemp('vader') / 'lexicon.txt'
+    path.write_text('\n'.join(f"{word}\t{valence}\t0.5\t[]" for word, valence in LEXICON.items()))
+    return SentimentIntensityAnalyzer(lexicon_file=f'file:{path}')
+
+def test_batch_matches_vader_compound(vader):
+    scores = BatchSentiment(vader.lexicon).compound(TEXTS)
+    expected = [vader.polarity_scores(text)['compound'] for text in TEXTS]
+    assert scores.tolist() == pytest.approx(expected, abs=COMPOUND_TOLERANCE)
+    assert scores[-3] == 0.0
+
+def test_batch_matches_vader_on_random_texts(vader):
+    rng = np.random.default_rng(0)
+    words = list(LEXICON) + ['not', 'but', 'BUT', 'never', 'so', 'this', 'least', 'at', 'very', 'kind', 'of',
+                             'sort', 'the', 'very', 'extremely', 'BARELY', 'GOOD', 'good!', ',bad', 'cut',
+                             'mustard', 'the', 'bomb', 'yeah', 'right', 'market', 'rose', '?', '!!']
+    texts = [' '.join(rng.choice(words, size=rng.integers(0, 20))) for _ in range(500)]
+    scores = BatchSentiment(vader.lexicon).compound(texts)
+    expected = [vader.polarity_scores(text)['compound'] for text in texts]
+    assert np.abs(scores - expected).max() <= COMPOUND_TOLERANCE
+
+def test_score_returns_sentence_compounds(vader):
+    documents = ["Good news. Bad news!", "Nothing here", "A great win. A loss. Nice."]
+    sentences = [["Good news.", "Bad news!"], [], ["A great win.", "A loss.", "Nice."]]
+    scorer = BatchSentiment(vader.lexicon)
+    compounds, per_sentence = scorer.score(documents, sentences)
+    assert compounds.tolist() == scorer.compound(documents).tolist()
+    assert [len(scores) for scores in per_sentence] == [2, 0, 3]
+    assert per_sentence[2].tolist() == [vader.polarity_scores(s)['compound'] for s in sentences[2]]
+
+def test_vocabulary_is_rebuilt_past_its_limit(vader, monkeypatch):
+    monkeypatch.setattr('services.sentiment.MAX_VOCABULARY', 3)
+    scorer = BatchSentiment(vader.lexicon)
+    scorer.compound(["one two three four five"])
+    assert scorer.compound(["good times"])[0] == vader.polarity_scores("good times")['compound']
+    assert len(scorer.tokens) == 2
@@ -0,0 +1,39 @@
+import pytest
+from services.summarizer import ExtractiveSummarizer, lead_summary
+
+SENTENCES = [
+    "The weather in the city was pleasant on Monday .",
+    "The finance minister presented the budget with a major tax reform .",
+    "Economists said the tax reform in the budget would lift growth .",
+    "Markets rallied after the budget as investors welcomed the tax reform .",
+    "A local festival drew large crowds .",
+]
+TOKENS = [sentence.split() for sentence in SENTENCES]
+STOP_WORDS = {'the', 'a', 'in', 'on', 'with', 'as', 'after', 'would', 'was', 'said'}
+
+def test_short_articles_are_returned_whole():
+    summarizer = ExtractiveSummarizer(STOP_WORDS)
+    assert summarizer.summarize(SENTENCES, TOKENS, max_words=100) == ' '.join(SENTENCES)
+
+def test_central_sentences_are_kept_in_document_order():
+    summarizer = ExtractiveSummarizer(STOP_WORDS)
+    summary = summarizer.summarize(SENTENCES, TOKENS, max_words=25)
+    assert summary == ' '.join(SENTENCES[1:3])
+
+def test_summary_respects_max_words():
+    summarizer = ExtractiveSummarizer(STOP_WORDS)
+    summary = summarizer.summarize(SENTENCES, TOKENS, max_words=12)
+    assert len(summary.split()) <= 12
+    assert summary == SENTENCES[1]
+
+def test_exceeding_the_budget_falls_back_to_lead_sentences():
+    summarizer = ExtractiveSummarizer(STOP_WORDS, budget=1e-9)
+    summary = summarizer.summarize(SENTENCES, TOKENS, max_words=25)
+    assert summary == lead_summary(SENTENCES, [len(tokens) for tokens in TOKENS], 25)
+    assert summary.startswith("The weather")
+
+def test_sentences_without_content_words_still_rank():
+    summarizer = ExtractiveSummarizer(STOP_WORDS)
+    scores = summarizer.rank([['the', '.'], ['a', '.'], ['budget', 'tax'], ['tax', 'budget']])
+    assert scores.sum() == pytest.approx(1.0)
+    assert scores[2] > scores[1]
@@ -0,0 +1,54 @@
+import re
+from services.scraper import NewsScraper
+from services.topics import TopicIndex
+
+TAXONOMY = {
+    'business': {'market': 1, 'stock market': 3, 'investment': 1},
+    'technology': {'AI': 2, 'software': 1},
+    'sports': {'cricket': 1, 'match': 1}
+}
+
+def test_default_taxonomy_loads():
+    index = TopicIndex.from_file()
+    assert 'politics' in index.topics
+    assert index.classify(['parliament', 'passed', 'election', 'bill']) == 'politics'
+
+def test_uppercase_keywords_match_lowercased_text():
+    index = TopicIndex(TAXONOMY)
+    assert index.classify(['ai', 'models', 'everywhere']) == 'technology'
+
+def test_keywords_are_stemmed():
+    index = TopicIndex(TAXONOMY)
+    assert index.scores(['investments', 'markets'])['business'] == 2
+
+def test_phrases_take_precedence_and_are_weighted():
+    index = TopicIndex(TAXONOMY)
+    scores = index.scores(['stock', 'market', 'rally', 'market'])
+    assert scores['business'] == 4
+
+def test_weights_decide_topic():
+    index = TopicIndex(TAXONOMY)
+    assert index.classify(['cricket', 'ai']) == 'technology'
+
+def test_ties_keep_taxonomy_order_and_empty_is_general():
+    index = TopicIndex(TAXONOMY)
+    assert index.classify(['market', 'software']) == 'business'
+    assert index.classify(['nothing', 'relevant']) == 'general'
+
+def test_keywords_sharing_a_stem_count_once():
+    index = TopicIndex({'agriculture': {'farm': 1, 'farming': 2}, 'business': {'market': 1}})
+    assert index.index[('farm',)] == [('agriculture', 2.0)]
+    assert index.scores(['farming', 'farms'])['agriculture'] == 4
+
+def test_default_taxonomy_has_one_entry_per_stem_and_topic():
+    index = TopicIndex.from_file()
+    for key, matches in index.index.items():
+        topics = [topic for topic, _ in matches]
+        assert len(topics) == len(set(topics)), key
+
+def test_default_taxonomy_classifies_the_sample_articles():
+    index = TopicIndex.from_file()
+    expected = {'india-economy': 'business', 'cricket-tournament': 'sports', 'agri-reform': 'agriculture'}
+    for article in NewsScraper().sample_articles:
+        words = re.findall(r'[a-z0-9]+', article['content'].lower())
+        assert index.classify(words) == expected[article['url'].rsplit('/', 1)[-1]]
@@ -0,0 +1,54 @@
+from services.trends import CountMinSketch, TopK, TrendTracker
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_count_min_never_undercounts():
+    sketch = CountMinSketch(width=64, depth=4)
+    truth = {f"term{i}": i % 7 + 1 for i in range(200)}
+    for term, count in truth.items():
+        sketch.add(term, count)
+    assert all(sketch.estimate(term) >= count for term, count in truth.items())
+    columns = sketch.columns(list(truth))
+    assert list(sketch.estimate_many(columns)) == [sketch.estimate(term) for term in truth]
+
+def test_top_k_keeps_heaviest_terms():
+    top = TopK(k=2)
+    for term, estimate in [('a', 1), ('b', 5), ('c', 3), ('d', 2)]:
+        top.offer(term, estimate)
+    assert top.counts == {'b': 5, 'c': 3}
+
+def test_trending_counts_documents_per_topic():
+    tracker = TrendTracker(window=60, windows=3, clock=FakeClock(10))
+    tracker.add('business', ['market', 'rupee', 'market'])
+    tracker.add('business', ['market', 'bank'])
+    tracker.add('sports', ['cricket', 'market'])
+
+    business = tracker.trending('business')
+    assert business['articles'] == 2
+    assert business['keywords'][0] == {'keyword': 'market', 'count': 2, 'lift': 1.0}
+    overall = tracker.trending(limit=1)
+    assert overall['articles'] == 3
+    assert overall['keywords'] == [{'keyword': 'market', 'count': 3, 'lift': 1.0}]
+
+def test_windows_roll_over_and_expire():
+    clock = FakeClock(0)
+    tracker = TrendTracker(window=60, windows=2, clock=clock)
+    tracker.add('politics', ['budget'])
+    clock.now = 70
+    tracker.add('politics', ['election'])
+    tracker.add('politics', ['election'])
+
+    latest = tracker.trending('politics')
+    assert [k['keyword'] for k in latest['keywords']] == ['election']
+    assert latest['keywords'][0]['lift'] > 1
+    both = tracker.trending('politics', windows=2)
+    assert both['articles'] == 3
+
+    clock.now = 130  # The first window is no longer kept
+    assert tracker.trending('politics', windows=5)['articles'] == 2
+    assert len(tracker.topics['politics']) == 1